@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+And-inverter graphs (AIGs) and binary AIGER files.
+
+A literal is 2 * <variable> (+1 when it is complemented): 0 is the constant false,
+1 the constant true. The variables are numbered like in the AIGER format:
+first the inputs, then the latches and finally the AND gates.
+"""
+
+from array import array
+from typing import BinaryIO, Dict, List, Optional, Sequence
+
+try:
+    from .genlib import gate_to_names
+    from .keywords.generic import Blif, Names
+    from .keywords.mapped import Gate
+except (ImportError, ModuleNotFoundError):
+    from genlib import gate_to_names          # type: ignore
+    from keywords.generic import Blif, Names  # type: ignore
+    from keywords.mapped import Gate          # type: ignore
+
+FALSE = 0
+TRUE = 1
+
+
+class Aig:
+    def __init__(self) -> None:
+        """
+        Defines an empty AIG.
+
+        Attributes:
+        * self.inputs: names of the inputs (variables 1, 2, ...)
+        * self.latches: names of the latches (the variables after the inputs)
+        * self.latch_next: literal of the next state of each latch
+        * self.latch_init: initial value of each latch (0, 1 or the literal of the latch when it is unknown)
+        * self.outputs: names of the outputs
+        * self.output_lits: literal of each output
+        * self.and_fanins: the two fanin literals of each AND gate (two consecutive values for each gate)
+        * self.strash: maps the fanins of the existing AND gates to their literal (structural hashing)
+        """
+        self.inputs: List[str] = []
+        self.latches: List[str] = []
+        self.latch_next = array("I")
+        self.latch_init = array("I")
+        self.outputs: List[str] = []
+        self.output_lits = array("I")
+        self.and_fanins = array("I")
+        self.strash: Dict[int, int] = {}
+
+    def num_ands(self) -> int:
+        """Returns the number of AND gates."""
+        return len(self.and_fanins) // 2
+
+    def max_var(self) -> int:
+        """Returns the highest variable index."""
+        return len(self.inputs) + len(self.latches) + self.num_ands()
+
+    def first_and_var(self) -> int:
+        """Returns the variable of the first AND gate."""
+        return len(self.inputs) + len(self.latches) + 1
+
+    def add_input(self, name: str) -> int:
+        """
+        Adds an input and returns its literal (inputs must be added before latches and AND gates).
+        """
+        if self.latches or self.num_ands():
+            raise ValueError("inputs must be added before latches and AND gates")
+
+        self.inputs.append(name)
+        return 2 * len(self.inputs)
+
+    def add_latch(self, name: str, init: Optional[int] = FALSE) -> int:
+        """
+        Adds a latch and returns its literal (latches must be added before AND gates).
+        The next state is set later with set_latch_next().
+
+        :param int init: initial value: 0, 1 or None when unknown
+        """
+        if self.num_ands():
+            raise ValueError("latches must be added before AND gates")
+
+        self.latches.append(name)
+        lit = 2 * (len(self.inputs) + len(self.latches))
+        self.latch_next.append(FALSE)
+        self.latch_init.append(lit if init is None else init)
+        return lit
+
+    def set_latch_next(self, position: int, lit: int) -> None:
+        """
+        Sets the literal of the next state of the <position>-th latch.
+        """
+        self.latch_next[position] = lit
+
+    def add_output(self, name: str, lit: int) -> None:
+        """
+        Adds an output driven by the <lit> literal.
+        """
+        self.outputs.append(name)
+        self.output_lits.append(lit)
+
+    def simulate(self, input_words: Sequence[int], latch_words: Sequence[int], width: int = 64) -> List[int]:
+        """
+        Simulates <width> input patterns at the same time (bit-parallel simulation).
+
+        :param list input_words: value of each input (bit i is the value in the i-th pattern)
+        :param list latch_words: current value of each latch
+        :param int width: number of patterns
+        :return list values: value of each variable (position 0 is the constant false)
+        """
+        mask = (1 << width) - 1
+        values = [0]
+        values.extend(word & mask for word in input_words)
+        values.extend(word & mask for word in latch_words)
+
+        fanins = self.and_fanins
+        for pos in range(0, len(fanins), 2):
+            a = fanins[pos]
+            b = fanins[pos + 1]
+            value_a = values[a >> 1] ^ (mask if a & 1 else 0)
+            value_b = values[b >> 1] ^ (mask if b & 1 else 0)
+            values.append(value_a & value_b)
+
+        return values
+
+    def get_lit_value(self, values: Sequence[int], lit: int, width: int = 64) -> int:
+        """
+        Returns the value of the <lit> literal given the variable <values> returned by simulate().
+        """
+        return values[lit >> 1] ^ (((1 << width) - 1) if lit & 1 else 0)
+
+    def apply_and(self, a: int, b: int) -> int:
+        """
+        Returns the literal of <a> AND <b> (an AND gate is created only if needed).
+        """
+        if a < b:
+            a, b = b, a
+
+        if b == FALSE or a == b ^ 1:
+            return FALSE
+        if b == TRUE or a == b:
+            return a
+
+        key = a << 32 | b
+        lit = self.strash.get(key)
+        if lit is None:
+            self.and_fanins.append(a)
+            self.and_fanins.append(b)
+            lit = 2 * self.max_var()
+            self.strash[key] = lit
+
+        return lit
+
+    def apply_or(self, a: int, b: int) -> int:
+        """Returns the literal of <a> OR <b>."""
+        return self.apply_and(a ^ 1, b ^ 1) ^ 1
+
+    def apply_and_all(self, lits: Sequence[int]) -> int:
+        """Returns the literal of the AND of all the <lits> literals (balanced tree)."""
+        lits = list(lits)
+        if len(lits) == 0:
+            return TRUE
+
+        while len(lits) > 1:
+            lits = [self.apply_and(lits[pos], lits[pos + 1]) if pos + 1 < len(lits) else lits[pos]
+                    for pos in range(0, len(lits), 2)]
+
+        return lits[0]
+
+    def apply_or_all(self, lits: Sequence[int]) -> int:
+        """Returns the literal of the OR of all the <lits> literals (balanced tree)."""
+        return self.apply_and_all([lit ^ 1 for lit in lits]) ^ 1
+
+    def from_cover(self, inputs: Sequence[int], truthtable: Sequence[Sequence[str]]) -> int:
+        """
+        Returns the literal of the function defined by a .names truth table.
+
+        :param list inputs: literals of the inputs (one for each column of the truth table)
+        :param list truthtable: rows of the truth table (the last element is the output)
+        """
+        cubes = []
+        for row in truthtable:
+            literals = []
+            for lit, char in zip(inputs, row[:-1]):
+                if char == "1":
+                    literals.append(lit)
+                elif char == "0":
+                    literals.append(lit ^ 1)
+
+            cubes.append(self.apply_and_all(literals))
+
+        result = self.apply_or_all(cubes)
+
+        # rows with "0" as output define when the function is false
+        if len(truthtable) > 0 and truthtable[0][-1] == "0":
+            result ^= 1
+
+        return result
+
+
+def from_blif(t_blif: Blif, net_lits: Optional[Dict[str, int]] = None) -> Aig:  # noqa: C901
+    """
+    Converts the boolean functions (.names), gates (.gate) and latches (.latch) of the <t_blif> object into an AIG.
+
+    The gates are converted with the cell library of the netlist (see genlib.gate_to_names()).
+    The .exdc functions are ignored, sub-circuits and .mlatch keywords are not supported.
+    Latches with an unknown initial value ("2", "3" or not set) are left uninitialized.
+    If the <net_lits> dictionary is given, it is filled with the literal of each net.
+    """
+    if t_blif.subcircuits or t_blif.mlatches:
+        raise ValueError("sub-circuits (.subckt) and .mlatch keywords can't be converted into an AIG")
+
+    library = t_blif.library
+    if t_blif.gates and library is None:
+        raise ValueError("the .gate keywords need a cell library")
+
+    index = t_blif.get_index()
+    if index.loops:
+        raise ValueError("the netlist contains combinational loops")
+
+    aig = Aig()
+    lits: Dict[str, int] = {} if net_lits is None else net_lits
+    for net in index.primary_inputs:
+        lits[net] = aig.add_input(net)
+
+    for latch in t_blif.latches:
+        init = {"0": FALSE, "1": TRUE}.get(latch.initval or "")
+        lits[latch.output] = aig.add_latch(latch.output, init)
+
+    def get_lit(net: str) -> int:
+        if net not in lits:
+            raise ValueError("'{}' net has no driver".format(net))
+
+        return lits[net]
+
+    for element_id in index.topological_order:
+        function = index.elements[element_id]
+        if isinstance(function, Gate) and library is not None:
+            function = gate_to_names(function, library)
+
+        if isinstance(function, Names):
+            lits[function.output] = aig.from_cover([get_lit(net) for net in function.inputs], function.truthtable)
+
+    for position, latch in enumerate(t_blif.latches):
+        aig.set_latch_next(position, get_lit(latch.input))
+
+    for net in index.primary_outputs:
+        aig.add_output(net, get_lit(net))
+
+    return aig
+
+
+def encode_number(number: int) -> bytes:
+    """
+    Returns the AIGER binary encoding of a number (7 bits for each byte, lowest bits first).
+    """
+    encoded = bytearray()
+    while number >= 0x80:
+        encoded.append((number & 0x7f) | 0x80)
+        number >>= 7
+
+    encoded.append(number)
+    return bytes(encoded)
+
+
+def write_aiger(aig: Aig, fout: BinaryIO) -> None:
+    """
+    Writes the <aig> AIG to the <fout> binary file object (binary AIGER format, with symbol table).
+    """
+    header = (aig.max_var(), len(aig.inputs), len(aig.latches), len(aig.outputs), aig.num_ands())
+    fout.write("aig {} {} {} {} {}\n".format(*header).encode())
+
+    for position, lit in enumerate(aig.latch_next):
+        init = aig.latch_init[position]
+        if init == FALSE:
+            fout.write("{}\n".format(lit).encode())
+        else:
+            fout.write("{} {}\n".format(lit, init).encode())
+
+    for lit in aig.output_lits:
+        fout.write("{}\n".format(lit).encode())
+
+    lhs = 2 * aig.first_and_var()
+    fanins = aig.and_fanins
+    for pos in range(0, len(fanins), 2):
+        fout.write(encode_number(lhs - fanins[pos]) + encode_number(fanins[pos] - fanins[pos + 1]))
+        lhs += 2
+
+    for prefix, names in (("i", aig.inputs), ("l", aig.latches), ("o", aig.outputs)):
+        for position, name in enumerate(names):
+            fout.write("{}{} {}\n".format(prefix, position, name).encode())
+
+
+def decode_number(fin: BinaryIO) -> int:
+    """
+    Reads a number encoded in the AIGER binary format.
+    """
+    number = 0
+    shift = 0
+    while True:
+        byte = fin.read(1)
+        if byte == b"":
+            raise ValueError("unexpected end of the AIGER file")
+
+        number |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            return number
+
+        shift += 7
+
+
+def read_aiger(fin: BinaryIO) -> Aig:  # noqa: C901
+    """
+    Reads an AIG from the <fin> binary file object (binary AIGER format).
+    """
+    header = fin.readline().decode().split()
+    if len(header) < 6 or header[0] != "aig":
+        raise ValueError("only binary AIGER files ('aig' header) are supported")
+
+    max_var, num_inputs, num_latches, num_outputs, num_ands = (int(value) for value in header[1:6])
+    if max_var != num_inputs + num_latches + num_ands:
+        raise ValueError("the AIGER header is not consistent (M != I + L + A)")
+
+    aig = Aig()
+    for position in range(num_inputs):
+        aig.add_input("i{}".format(position))
+
+    latch_lines = [fin.readline().decode().split() for _ in range(num_latches)]
+    for position, line in enumerate(latch_lines):
+        lit = aig.add_latch("l{}".format(position))
+        aig.latch_init[position] = int(line[1]) if len(line) > 1 else FALSE
+        if aig.latch_init[position] not in (FALSE, TRUE, lit):
+            raise ValueError("unexpected initial value for the latch {}".format(lit))
+
+    output_lits = [int(fin.readline()) for _ in range(num_outputs)]
+
+    lhs = 2 * aig.first_and_var()
+    for _ in range(num_ands):
+        rhs0 = lhs - decode_number(fin)
+        rhs1 = rhs0 - decode_number(fin)
+        aig.and_fanins.append(rhs0)
+        aig.and_fanins.append(rhs1)
+        aig.strash[rhs0 << 32 | rhs1] = lhs
+        lhs += 2
+
+    for position, line in enumerate(latch_lines):
+        aig.set_latch_next(position, int(line[0]))
+
+    output_names = ["o{}".format(position) for position in range(num_outputs)]
+    names: Dict[str, List[str]] = {"i": aig.inputs, "l": aig.latches, "o": output_names}
+    for raw_line in fin:
+        text = raw_line.decode().rstrip("\n")
+        if text.startswith("c"):
+            break
+
+        prefix, _, name = text.partition(" ")
+        if prefix[:1] in names and prefix[1:].isdigit() and name:
+            names[prefix[:1]][int(prefix[1:])] = name
+
+    for name, lit in zip(names["o"], output_lits):
+        aig.add_output(name, lit)
+
+    return aig
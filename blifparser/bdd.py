@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reduced ordered binary decision diagrams (BDDs) for .names covers and netlist cones.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    from .genlib import gate_to_names
+    from .keywords.generic import Blif, Names
+    from .keywords.mapped import Gate
+except (ImportError, ModuleNotFoundError):
+    from genlib import gate_to_names          # type: ignore
+    from keywords.generic import Blif, Names  # type: ignore
+    from keywords.mapped import Gate          # type: ignore
+
+FALSE = 0
+TRUE = 1
+
+
+class BDD:
+    def __init__(self, variables: Iterable[str] = ()) -> None:
+        """
+        Defines a BDD manager.
+
+        Each BDD node is identified by an integer: 0 and 1 are the FALSE and TRUE terminals.
+        Nodes are never duplicated (unique table), so two functions built
+        by the same manager are equal only if they are the same node.
+
+        Attributes:
+        * self.var_names: variable names (the position of a variable is its level in the order)
+        * self.var_levels: dictionary that maps a variable name to its level
+        * self.level: level of each node (the terminals don't have a variable)
+        * self.low: child of each node when its variable is 0
+        * self.high: child of each node when its variable is 1
+        * self.unique: dictionary (level, low, high) -> node
+        * self.computed: cache of the ite() results
+        * self.refs: number of external references of each node (see ref(), deref() and collect())
+        """
+        self.var_names: List[str] = []
+        self.var_levels: Dict[str, int] = {}
+        self.level: List[int] = [-1, -1]
+        self.low: List[int] = [FALSE, TRUE]
+        self.high: List[int] = [FALSE, TRUE]
+        self.unique: Dict[Tuple[int, int, int], int] = {}
+        self.computed: Dict[Tuple[int, int, int], int] = {}
+        self.refs: Dict[int, int] = {}
+        self.free: List[int] = []
+
+        for name in variables:
+            self.add_var(name)
+
+    def add_var(self, name: str) -> int:
+        """
+        Adds the <name> variable at the bottom of the order (if it doesn't exist)
+        and returns the node of the function that is true when the variable is 1.
+        """
+        if name not in self.var_levels:
+            self.var_levels[name] = len(self.var_names)
+            self.var_names.append(name)
+
+        return self.make_node(self.var_levels[name], FALSE, TRUE)
+
+    def var(self, name: str) -> int:
+        """
+        Returns the node of the <name> variable.
+        """
+        if name not in self.var_levels:
+            raise ValueError("'{}' is not a variable of the BDD".format(name))
+
+        return self.make_node(self.var_levels[name], FALSE, TRUE)
+
+    def get_level(self, node: int) -> int:
+        """
+        Returns the level of the <node> node (the terminals are below all the variables).
+        """
+        if node <= TRUE:
+            return len(self.var_names)
+
+        return self.level[node]
+
+    def make_node(self, level: int, low: int, high: int) -> int:
+        """
+        Returns the node with the <level> variable and the <low>/<high> children
+        (the node is created only if it doesn't exist).
+        """
+        if low == high:
+            return low
+
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is not None:
+            return node
+
+        if self.free:
+            node = self.free.pop()
+            self.level[node] = level
+            self.low[node] = low
+            self.high[node] = high
+        else:
+            node = len(self.level)
+            self.level.append(level)
+            self.low.append(low)
+            self.high.append(high)
+
+        self.unique[key] = node
+        return node
+
+    def ite(self, f: int, g: int, h: int) -> int:
+        """
+        Returns the node of "if <f> then <g> else <h>".
+
+        The cofactors are computed with an explicit stack (not with recursion),
+        so the depth of the BDDs is not limited by the recursion limit.
+        """
+        # each entry is (f, g, h, top level): the top level is -1 until the cofactors are computed
+        stack = [(f, g, h, -1)]
+        results: List[int] = []
+        while stack:
+            f, g, h, top = stack.pop()
+            if top >= 0:
+                # the results of the cofactors are on top of the results
+                high = results.pop()
+                low = results.pop()
+                result = self.make_node(top, low, high)
+                self.computed[(f, g, h)] = result
+                results.append(result)
+                continue
+
+            terminal = self.get_terminal_case(f, g, h)
+            if terminal is not None:
+                results.append(terminal)
+                continue
+
+            top = min(self.get_level(f), self.get_level(g), self.get_level(h))
+            f0, f1 = self.cofactors(f, top)
+            g0, g1 = self.cofactors(g, top)
+            h0, h1 = self.cofactors(h, top)
+            stack.append((f, g, h, top))
+            stack.append((f1, g1, h1, -1))
+            stack.append((f0, g0, h0, -1))
+
+        return results[0]
+
+    def get_terminal_case(self, f: int, g: int, h: int) -> Optional[int]:
+        """
+        Returns the node of "if <f> then <g> else <h>" if it doesn't need the cofactors
+        (terminal cases and results in the computed table), None otherwise.
+        """
+        if f == TRUE:
+            return g
+        if f == FALSE:
+            return h
+        if g == h:
+            return g
+        if g == TRUE and h == FALSE:
+            return f
+
+        return self.computed.get((f, g, h))
+
+    def cofactors(self, node: int, level: int) -> Tuple[int, int]:
+        """
+        Returns the cofactors of the <node> node with respect to the <level> variable.
+        """
+        if self.get_level(node) != level:
+            return node, node
+
+        return self.low[node], self.high[node]
+
+    def apply_not(self, f: int) -> int:
+        """Returns the node of NOT <f>."""
+        return self.ite(f, FALSE, TRUE)
+
+    def apply_and(self, f: int, g: int) -> int:
+        """Returns the node of <f> AND <g>."""
+        return self.ite(f, g, FALSE)
+
+    def apply_or(self, f: int, g: int) -> int:
+        """Returns the node of <f> OR <g>."""
+        return self.ite(f, TRUE, g)
+
+    def apply_xor(self, f: int, g: int) -> int:
+        """Returns the node of <f> XOR <g>."""
+        return self.ite(f, self.apply_not(g), g)
+
+    def is_satisfiable(self, f: int) -> bool:
+        """Returns True if at least one assignment makes <f> true."""
+        return f != FALSE
+
+    def sat_count(self, f: int) -> int:
+        """
+        Returns the number of assignments of all the variables of the manager that make <f> true.
+        """
+        counts: Dict[int, int] = {FALSE: 0, TRUE: 1}
+
+        # post-order visit with an explicit stack: a node is counted after its children
+        stack = [f]
+        while stack:
+            node = stack[-1]
+            if node in counts:
+                stack.pop()
+                continue
+
+            level = self.level[node]
+            low = self.low[node]
+            high = self.high[node]
+            if low not in counts or high not in counts:
+                stack.extend(child for child in (low, high) if child not in counts)
+                continue
+
+            result = counts[low] << (self.get_level(low) - level - 1)
+            result += counts[high] << (self.get_level(high) - level - 1)
+            counts[node] = result
+            stack.pop()
+
+        return counts[f] << self.get_level(f)
+
+    def pick_sat(self, f: int) -> Optional[Dict[str, bool]]:
+        """
+        Returns an assignment (variable name -> value) that makes <f> true,
+        None if <f> is not satisfiable. The variables that are not in the assignment can have any value.
+        """
+        if f == FALSE:
+            return None
+
+        assignment = {}
+        node = f
+        while node > TRUE:
+            name = self.var_names[self.level[node]]
+            if self.low[node] != FALSE:
+                assignment[name] = False
+                node = self.low[node]
+            else:
+                assignment[name] = True
+                node = self.high[node]
+
+        return assignment
+
+    def ref(self, f: int) -> int:
+        """
+        Adds an external reference to <f> (it will survive collect()) and returns it.
+        """
+        self.refs[f] = self.refs.get(f, 0) + 1
+        return f
+
+    def deref(self, f: int) -> None:
+        """
+        Removes an external reference from <f>.
+        """
+        count = self.refs.get(f, 0) - 1
+        if count <= 0:
+            self.refs.pop(f, None)
+        else:
+            self.refs[f] = count
+
+    def collect(self) -> int:
+        """
+        Frees the nodes that can't be reached from the referenced nodes (see ref())
+        and empties the computed table.
+
+        :return int freed: number of freed nodes
+        """
+        reachable = [False] * len(self.level)
+        reachable[FALSE] = reachable[TRUE] = True
+        stack = list(self.refs)
+        while stack:
+            node = stack.pop()
+            if not reachable[node]:
+                reachable[node] = True
+                stack.append(self.low[node])
+                stack.append(self.high[node])
+
+        freed = 0
+        for key, node in list(self.unique.items()):
+            if not reachable[node]:
+                del self.unique[key]
+                self.free.append(node)
+                freed += 1
+
+        self.computed.clear()
+        return freed
+
+    def num_nodes(self) -> int:
+        """
+        Returns the number of live nodes (terminals included).
+        """
+        return len(self.unique) + 2
+
+    def from_cover(self, inputs: Sequence[int], truthtable: Sequence[Sequence[str]]) -> int:
+        """
+        Returns the node of the function defined by a .names truth table.
+
+        :param list inputs: nodes of the inputs (one for each column of the truth table)
+        :param list truthtable: rows of the truth table (the last element is the output)
+        """
+        # the literals are added from the bottom of the order: with variables each AND adds a single node
+        order = sorted(range(len(inputs)), key=lambda position: self.get_level(inputs[position]), reverse=True)
+        result = FALSE
+        for row in truthtable:
+            cube = TRUE
+            for position in order:
+                if row[position] == "1":
+                    cube = self.apply_and(inputs[position], cube)
+                elif row[position] == "0":
+                    cube = self.apply_and(self.apply_not(inputs[position]), cube)
+
+            result = self.apply_or(result, cube)
+
+        # rows with "0" as output define when the function is false
+        if len(truthtable) > 0 and truthtable[0][-1] == "0":
+            result = self.apply_not(result)
+
+        return result
+
+    def from_names(self, function: Names) -> int:
+        """
+        Returns the node of the <function> boolean function
+        (its inputs are added as variables, if needed).
+        """
+        return self.from_cover([self.add_var(net) for net in function.inputs], function.truthtable)
+
+    def build_cones(self, t_blif: Blif, nets: Iterable[str]) -> Dict[str, int]:
+        """
+        Returns the nodes of the <nets> nets of the <t_blif> netlist.
+
+        The cones stop at the primary inputs, the latch and sub-circuit outputs
+        and the undriven nets: they become variables (if needed, in the order they are found).
+        The gates are converted with the cell library of the netlist (see genlib.gate_to_names()).
+
+        :return dict nodes: maps each net (of the cones) to its node
+        """
+        nets = list(nets)
+        index = t_blif.get_index()
+
+        cone_nets: Set[str] = set()
+        for net in nets:
+            cone_nets |= index.get_fanin_cone(net)
+
+        nodes: Dict[str, int] = {}
+        for element_id in index.topological_order:
+            function = index.elements[element_id]
+            if isinstance(function, Gate) and not cone_nets.isdisjoint(index.element_outputs[element_id]):
+                if t_blif.library is None:
+                    raise ValueError("the .gate keywords need a cell library")
+
+                function = gate_to_names(function, t_blif.library)
+
+            if not isinstance(function, Names) or function.output not in cone_nets:
+                continue
+
+            inputs = [nodes[net] if net in nodes else self.add_var(net) for net in function.inputs]
+            nodes[function.output] = self.from_cover(inputs, function.truthtable)
+
+        for net in cone_nets:
+            if net not in nodes:
+                driver = index.drivers.get(net)
+                if driver is not None and isinstance(index.elements[driver], (Names, Gate)):
+                    raise ValueError("'{}' is part of a combinational loop".format(net))
+
+                nodes[net] = self.add_var(net)
+
+        return nodes
@@ -10,31 +10,98 @@ import os
 import shutil
 import re
 import tempfile
+from contextlib import nullcontext
+from typing import ContextManager, List, Optional, Tuple, Union
 
 try:
     from . import keywords
     from . import utils
+    from . import genlib
     from . import graph
+    from .profiling import ParseStats, PhaseStats, count_lines
 
 except (ImportError, ModuleNotFoundError):
     import utils     # type: ignore
     import keywords  # type: ignore
+    import genlib    # type: ignore
     import graph     # type: ignore
+    from profiling import ParseStats, PhaseStats, count_lines  # type: ignore
+
+UNEXPECTED_FSM_KEYWORD = ("[ERROR][LINE ~ {line}] Unexpected {} keyword: "
+                          "needs to be between .start_kiss and .end_kiss keywords")
 
 
 class BlifParser:
 
-    def __init__(self, t_file: str) -> None:  # noqa: C901
+    def __init__(self, t_file: str, profile: bool = False,
+                 max_errors: Optional[int] = None, fail_fast: bool = False, trusted: bool = False,
+                 library: Optional[Union[str, genlib.Library]] = None) -> None:
         """
         Parses the <t_file> BLIF file.
 
         :param str t_file: input BLIF file
+        :param bool profile: if True, the wall time, number of lines and peak memory
+            of each phase are recorded in self.stats (see profiling.ParseStats())
+        :param int max_errors: if set, the parsing stops when this number of errors is found
+        :param bool fail_fast: if True, the parsing stops at the first error
+            > self.blif.problems.stopped tells if the parsing was stopped
+        :param bool trusted: if True, the file is assumed to be valid: the keyword objects
+            are created without checking their parameters and validate() is not called
+            > call validate() later to check the file
+        :param library: genlib library (or path of the library file, see genlib.load_library())
+            used to resolve and check the pins of the .gate and .mlatch keywords
+        """
+        self.trusted = trusted
+        self.stats: Optional[ParseStats] = None
+        if profile:
+            self.stats = ParseStats()
+            self.stats.start()
+
+        try:
+            # prepare the input file
+            prepared_file = self.prepare_file(t_file)
+
+            self.blif = keywords.generic.Blif()
+            if isinstance(library, str):
+                library = genlib.load_library(library)
+            self.blif.library = library
+            self.blif.problems.max_errors = max_errors
+            self.blif.problems.fail_fast = fail_fast
+
+            try:
+                with self.measure("tokenize") as phase:
+                    phase.lines = self.tokenize(prepared_file)
+            except keywords.diagnostics.TooManyErrors:
+                pass
+            finally:
+                # remove the temporary copies of the file (long-running processes parse many files)
+                shutil.rmtree(os.path.dirname(prepared_file), ignore_errors=True)
+
+            if not trusted and not self.blif.problems.stopped:
+                self.validate()
+        finally:
+            if self.stats is not None:
+                self.stats.stop()
+
+    def measure(self, name: str) -> ContextManager[PhaseStats]:
+        """
+        Returns a context manager that records the statistics of the <name> phase
+        (nothing is recorded if profiling is not enabled).
         """
-        # prepare the input file
-        prepared_file = self.prepare_file(t_file)
+        if self.stats is None:
+            return nullcontext(PhaseStats(name))
 
-        self.blif = keywords.generic.Blif()
+        return self.stats.phase(name)
 
+    def tokenize(self, prepared_file: str) -> int:  # noqa: C901
+        """
+        Reads the lines of the <prepared_file> file (see prepare_file())
+        and adds the keyword objects to self.blif.
+
+        :param str prepared_file: "ready to be parsed" file path
+        :return int num_lines: number of read lines
+        """
+        num_lines = 0
         is_boolfunc = False
         boolfunc_dontcare = False
         is_fsm = False
@@ -42,15 +109,17 @@ class BlifParser:
 
         with open(prepared_file) as fin:
             line = fin.readline()
-            i = "unknown"
+            i: Optional[int] = None
 
             while line != "":
+                num_lines += 1
                 linestrip = line.strip()
 
                 # get and remove the metadata from the current line
                 metadata = re.match("@!(.*?)!@", linestrip)
                 if metadata:
-                    i = metadata.groups()[0].lstrip("meta:")
+                    line_number = metadata.groups()[0].lstrip("meta:")
+                    i = int(line_number) if line_number.isdigit() else None
 
                 linestrip = re.sub("@!(.*?)!@", "", linestrip)
 
@@ -84,58 +153,69 @@ class BlifParser:
                             self.blif.imports.append(keywords.subfiles.Search(params))
                         elif keyword == ".names":
                             is_boolfunc = True
-                            self.blif.booleanfunctions.append(keywords.generic.Names(params, boolfunc_dontcare))
+                            self.blif.booleanfunctions.append(keywords.generic.Names(params, boolfunc_dontcare, self.trusted))
                         elif keyword == ".latch":
-                            self.blif.latches.append(keywords.generic.Latch(params))
+                            self.blif.latches.append(keywords.generic.Latch(params, self.trusted))
                         elif keyword == ".subckt":
-                            self.blif.subcircuits.append(keywords.subfiles.Subckt(params))
+                            self.blif.subcircuits.append(keywords.subfiles.Subckt(params, self.trusted))
+                        elif keyword == ".gate":
+                            self.blif.gates.append(keywords.mapped.Gate(params, self.trusted))
+                        elif keyword == ".mlatch":
+                            self.blif.mlatches.append(keywords.mapped.MLatch(params, self.trusted))
                         elif keyword == ".start_kiss":
                             self.blif.fsm.ispresent = True
                             is_fsm = True
                         elif keyword == ".i":
                             if not is_fsm:
-                                self.blif.problems.append("[ERROR][LINE ~ {}] Unexpected .i keyword: "
-                                                          "needs to be between .start_kiss and .end_kiss keywords".format(i))
+                                self.blif.problems.add("unexpected-fsm-keyword", UNEXPECTED_FSM_KEYWORD, keyword, line=i)
                             self.blif.fsm.i = keywords.fsm.I(params)
                         elif keyword == ".o":
                             if not is_fsm:
-                                self.blif.problems.append("[ERROR][LINE ~ {}] Unexpected .o keyword: "
-                                                          "needs to be between .start_kiss and .end_kiss keywords".format(i))
+                                self.blif.problems.add("unexpected-fsm-keyword", UNEXPECTED_FSM_KEYWORD, keyword, line=i)
                             self.blif.fsm.o = keywords.fsm.O(params)
                         elif keyword == ".s":
                             if not is_fsm:
-                                self.blif.problems.append("[ERROR][LINE ~ {}] Unexpected .s keyword: "
-                                                          "needs to be between .start_kiss and .end_kiss keywords".format(i))
+                                self.blif.problems.add("unexpected-fsm-keyword", UNEXPECTED_FSM_KEYWORD, keyword, line=i)
                             self.blif.fsm.s = keywords.fsm.S(params)
                         elif keyword == ".p":
                             if not is_fsm:
-                                self.blif.problems.append("[ERROR][LINE ~ {}] Unexpected .p keyword: "
-                                                          "needs to be between .start_kiss and .end_kiss keywords".format(i))
+                                self.blif.problems.add("unexpected-fsm-keyword", UNEXPECTED_FSM_KEYWORD, keyword, line=i)
                             self.blif.fsm.p = keywords.fsm.P(params)
                         elif keyword == ".r":
                             if not is_fsm:
-                                self.blif.problems.append("[ERROR][LINE ~ {}] Unexpected .r keyword: "
-                                                          "needs to be between .start_kiss and .end_kiss keywords".format(i))
+                                self.blif.problems.add("unexpected-fsm-keyword", UNEXPECTED_FSM_KEYWORD, keyword, line=i)
                             self.blif.fsm.r = keywords.fsm.R(params)
                         elif keyword == ".end_kiss":
                             if not is_fsm:
-                                self.blif.problems.append("[ERROR][LINE ~ {}] Unexpected end of fsm: "
-                                                          "there needs to be a .start_kiss keyword "
-                                                          "BEFORE the .end_kiss keyword".format(i))
+                                self.blif.problems.add("unexpected-end-kiss", "[ERROR][LINE ~ {line}] Unexpected end of fsm: "
+                                                       "there needs to be a .start_kiss keyword "
+                                                       "BEFORE the .end_kiss keyword", line=i)
                             is_fsm = False
+                        elif keyword == ".default_input_arrival":
+                            self.blif.default_input_arrival = keywords.timing.DefaultInputArrival(params)
+                        elif keyword == ".default_output_required":
+                            self.blif.default_output_required = keywords.timing.DefaultOutputRequired(params)
+                        elif keyword == ".default_input_drive":
+                            self.blif.default_input_drive = keywords.timing.DefaultInputDrive(params)
+                        elif keyword == ".default_output_load":
+                            self.blif.default_output_load = keywords.timing.DefaultOutputLoad(params)
+                        elif keyword == ".default_max_input_load":
+                            self.blif.default_max_input_load = keywords.timing.DefaultMaxInputLoad(params)
                         elif keyword == ".exdc":
                             boolfunc_dontcare = True
                         elif keyword == ".code":
                             self.blif.fsm.statecodes.append(keywords.fsm.Code(params))
                         elif keyword == ".end":
                             if not is_model:
-                                self.blif.problems.append("[ERROR][LINE ~ {}] Unexpected end of model on line {}".format(i, i))
+                                self.blif.problems.add("unexpected-end", "[ERROR][LINE ~ {line}] Unexpected end of model "
+                                                       "on line {line}", line=i)
                             is_model = False
 
                         try:
                             self.blif.nkeywords[keyword] += 1
                         except KeyError:
-                            self.blif.problems.append("[ERROR][LINE ~ {}] Invalid keyword: '{}'".format(i, keyword))
+                            self.blif.problems.add("invalid-keyword", "[ERROR][LINE ~ {line}] Invalid keyword: '{}'",
+                                                   keyword, line=i)
 
                     else:
                         # found transition/truth table
@@ -148,26 +228,140 @@ class BlifParser:
                             fsm.transtable.append([el for el in linestrip.split(" ") if el != " "])
 
                         elif linestrip != "":
-                            self.blif.problems.append("[ERROR][LINE ~ {}] Unexpected text: '{}'".format(i, linestrip))
+                            self.blif.problems.add("unexpected-text", "[ERROR][LINE ~ {line}] Unexpected text: '{}'",
+                                                   linestrip, line=i)
 
+                except keywords.diagnostics.TooManyErrors:
+                    raise
                 except Exception as e:
-                    self.blif.problems.append("[PARSING ERROR][LINE ~ {}] ".format(i) + str(e))
+                    self.blif.problems.add("parsing-error", "[PARSING ERROR][LINE ~ {line}] {}", str(e), line=i)
 
                 line = fin.readline()
 
-        # if an FSM is present in the file, check if it is valid
-        if self.blif.fsm.ispresent:
-            try:
-                self.blif.fsm.is_valid()
-            except Exception as e:
-                self.blif.problems.append("[FSM PROBLEM] " + str(e))
+        return num_lines
 
-        # check if each boolean function is valid
-        for boolfunc in self.blif.booleanfunctions:
-            try:
-                boolfunc.is_valid()
-            except Exception as e:
-                self.blif.problems.append("[BOOLEAN FUNCTION PROBLEM] " + str(e))
+    def validate(self) -> keywords.diagnostics.Diagnostics:  # noqa: C901
+        """
+        Validates the FSM, the boolean functions, the gates (if there is a library) and the netlist connections,
+        the problems are added to self.blif.problems.
+
+        It is called by the constructor, unless the file is trusted:
+        in that case it also checks the parameters of the latches, gates and sub-circuits
+        (calling it twice adds the same problems twice).
+
+        :return Diagnostics problems: self.blif.problems
+        """
+        try:
+            if self.trusted:
+                self.validate_keywords()
+
+            # if an FSM is present in the file, check if it is valid
+            if self.blif.fsm.ispresent:
+                with self.measure("fsm_validation") as phase:
+                    phase.lines = len(self.blif.fsm.transtable)
+                    try:
+                        self.blif.fsm.is_valid()
+                    except Exception as e:
+                        self.blif.problems.add("fsm-problem", "[FSM PROBLEM] {}", str(e), obj=self.blif.fsm)
+
+            # check if each boolean function is valid
+            with self.measure("names_validation") as phase:
+                for boolfunc in self.blif.booleanfunctions:
+                    phase.lines += len(boolfunc.truthtable)
+                    try:
+                        boolfunc.is_valid()
+                    except Exception as e:
+                        self.blif.problems.add("names-problem", "[BOOLEAN FUNCTION PROBLEM] {}", str(e), obj=boolfunc)
+
+            # check the pins of the gates against the library
+            if self.blif.library is not None and (self.blif.gates or self.blif.mlatches):
+                self.validate_gates()
+
+            # check if there are combinational loops
+            with self.measure("netlist") as phase:
+                index = self.blif.get_index()
+                phase.lines = len(index.elements)
+                for loop in index.loops:
+                    self.blif.problems.add("combinational-loop", "[NETLIST PROBLEM] Combinational loop: {}",
+                                           " -> ".join(loop), obj=loop)
+        except keywords.diagnostics.TooManyErrors:
+            pass
+
+        return self.blif.problems
+
+    def validate_keywords(self) -> None:  # noqa: C901
+        """
+        Checks the parameters of the latches, gates and sub-circuits
+        (the checks that the constructors skip when the file is trusted).
+        """
+        with self.measure("keywords_validation") as phase:
+            for latch in self.blif.latches:
+                phase.lines += 1
+                try:
+                    latch.is_valid()
+                except Exception as e:
+                    self.blif.problems.add("latch-problem", "[LATCH PROBLEM] {}", str(e), obj=latch)
+
+            for subckt in self.blif.subcircuits:
+                phase.lines += 1
+                try:
+                    subckt.is_valid()
+                except Exception as e:
+                    self.blif.problems.add("subckt-problem", "[SUBCKT PROBLEM] {}", str(e), obj=subckt)
+
+            for gate in self.blif.gates:
+                phase.lines += 1
+                try:
+                    gate.is_valid()
+                except Exception as e:
+                    self.blif.problems.add("gate-problem", "[GATE PROBLEM] {}", str(e), obj=gate)
+
+            for mlatch in self.blif.mlatches:
+                phase.lines += 1
+                try:
+                    mlatch.is_valid()
+                except Exception as e:
+                    self.blif.problems.add("mlatch-problem", "[MLATCH PROBLEM] {}", str(e), obj=mlatch)
+
+    def validate_gates(self) -> None:  # noqa: C901
+        """
+        Checks that the cells of the .gate and .mlatch keywords are in the library
+        and that their <formal>=<actual> parameters match the pins of the cells.
+        """
+        library = self.blif.library
+        if library is None:
+            return
+
+        with self.measure("gates_validation") as phase:
+            for gate in self.blif.gates:
+                phase.lines += 1
+                cell = library.get(gate.name)
+                if cell is None:
+                    self.blif.problems.add("unknown-cell", "[GATE PROBLEM] '{}' is not a cell of the library",
+                                           gate.name, obj=gate)
+                elif cell.is_latch:
+                    self.blif.problems.add("gate-problem", "[GATE PROBLEM] '{}' is a latch: use .mlatch",
+                                           gate.name, obj=gate)
+                else:
+                    try:
+                        cell.get_nets(gate)
+                    except ValueError as e:
+                        self.blif.problems.add("gate-problem", "[GATE PROBLEM] {}", str(e), obj=gate)
+
+            for mlatch in self.blif.mlatches:
+                phase.lines += 1
+                cell = library.get(mlatch.name)
+                if cell is None:
+                    self.blif.problems.add("unknown-cell", "[MLATCH PROBLEM] '{}' is not a cell of the library",
+                                           mlatch.name, obj=mlatch)
+                elif not cell.is_latch:
+                    self.blif.problems.add("mlatch-problem", "[MLATCH PROBLEM] '{}' is not a latch: use .gate",
+                                           mlatch.name, obj=mlatch)
+                else:
+                    try:
+                        cell.get_nets(mlatch)
+                    except ValueError as e:
+                        self.blif.problems.add("mlatch-problem", "[MLATCH PROBLEM] {}", str(e), obj=mlatch)
 
     def prepare_file(self, t_file: str) -> str:
         """
@@ -185,34 +379,158 @@ class BlifParser:
         # create a copy of the file inside a temporary folder
         tmp_dir = tempfile.mkdtemp()
         tmp_filepath = os.path.join(tmp_dir, "example.blif")
-        shutil.copyfile(filepath, tmp_filepath)
+        with self.measure("copy"):
+            shutil.copyfile(filepath, tmp_filepath)
 
         # adds metadata, removes comments and newlines on keywords' params
-        metadata = utils.add_metadata(tmp_filepath)
-        nocomments = utils.remove_comments(metadata)
-        nonewlines = utils.remove_params_newline(nocomments)
+        files = [tmp_filepath]
+        for step in (utils.add_metadata, utils.remove_comments, utils.remove_params_newline):
+            with self.measure(step.__name__):
+                files.append(step(files[-1]))
 
-        return nonewlines
+        if self.stats is not None:
+            # each phase reads the file written by the previous one (counted outside the measured phases)
+            for phase, read_file in zip(self.stats.phases[-4:], [tmp_filepath] + files[:-1]):
+                phase.lines = count_lines(read_file)
 
-    def get_graph(self) -> graph.Graph:
+        prepared_file = files[-1]
+        return prepared_file
+
+    def get_graph(self, cluster: Optional[str] = None) -> graph.Graph:
         """
         Returns an object with the following attributes:
-        - nx_graph: networkx graph
+        - nodes, offsets, targets, labels: the graph as compact adjacency arrays (CSR)
+        - nx_graph: networkx graph (created, and networkx imported, on first use)
         - longest_label: length of the longest label
           > the label is the text next to an edge
         - max_inputs: maximum number of inputs that a node can have inside the nx_graph graph
+
+        :param str cluster: if set, collapses groups of nodes to get a smaller graph
+            ("subckt", "ffr" or "level", see graph.cluster())
         """
-        return graph.parse_blif(self.blif)
+        blif_graph = graph.parse_blif(self.blif)
+
+        if cluster is not None:
+            blif_graph = graph.cluster(blif_graph, cluster)
+
+        return blif_graph
+
+
+def run_subcommand(args: List[str]) -> bool:  # noqa: C901
+    """
+    Runs the subcommand (serve, cec, diff or stats) at the start of the <args> command line arguments,
+    returns False if there isn't one.
+    """
+    # the server writes only the JSON responses on stdout
+    if args[:1] == ["serve"]:
+        try:
+            from . import daemon
+        except (ImportError, ModuleNotFoundError):
+            import daemon  # type: ignore
+
+        daemon.main(args[1:])
+        return True
+
+    if args[:1] == ["cec"]:
+        try:
+            from . import cec
+        except (ImportError, ModuleNotFoundError):
+            import cec  # type: ignore
+
+        cec.main(args[1:])
+        return True
+
+    if args[:1] == ["diff"]:
+        try:
+            from . import diff
+        except (ImportError, ModuleNotFoundError):
+            import diff  # type: ignore
+
+        diff.main(args[1:])
+        return True
+
+    # the statistics are computed without parsing the file into keyword objects
+    if args[:1] == ["stats"]:
+        try:
+            from . import stats
+        except (ImportError, ModuleNotFoundError):
+            import stats  # type: ignore
+
+        stats.main(args[1:])
+        return True
+
+    return False
+
+
+def get_options(args: List[str]) -> Tuple[List[str], bool, bool, Optional[str], Optional[int]]:
+    """
+    Removes the optional flags from the <args> command line arguments.
+
+    :return tuple result: (other arguments, --stats, --fail-fast, --library file, --max-errors number),
+        the other arguments are empty if a flag is not used correctly
+    """
+    show_stats = "--stats" in args
+    fail_fast = "--fail-fast" in args
+    args = [arg for arg in args if arg not in ("--stats", "--fail-fast")]
+
+    library = None
+    if "--library" in args:
+        pos = args.index("--library")
+        if pos + 1 < len(args):
+            library = os.path.abspath(args[pos + 1])
+            args = args[:pos] + args[pos + 2:]
+        else:
+            args = []
+
+    max_errors = None
+    if "--max-errors" in args:
+        pos = args.index("--max-errors")
+        if pos + 1 < len(args) and args[pos + 1].isdigit() and int(args[pos + 1]) > 0:
+            max_errors = int(args[pos + 1])
+            args = args[:pos] + args[pos + 2:]
+        else:
+            args = []
+
+    return args, show_stats, fail_fast, library, max_errors
+
+
+def print_usage() -> None:
+    """
+    Prints the usage of the command line interface.
+    """
+    print("blifparser expects only one parameter: the input BLIF file path")
+    print("Optional flags:")
+    print("* --stats: print the time, lines and peak memory of each parsing phase")
+    print("* --max-errors <num>: stop the parsing after <num> errors")
+    print("* --fail-fast: stop the parsing at the first error")
+    print("* --library <file>: genlib library of the cells used by .gate and .mlatch")
+    print("")
+    print("blifparser cec <golden BLIF file> <revised BLIF file>")
+    print("checks the combinational equivalence of the two files (see cec.py)")
+    print("")
+    print("blifparser diff <old BLIF file> <new BLIF file>")
+    print("prints the added, removed and changed elements, ignoring the names of the internal nets (see diff.py)")
+    print("")
+    print("blifparser stats <input BLIF file> [--json]")
+    print("prints gate, cube, literal and latch counts, fanin/fanout histograms and logic depth (see stats.py)")
+    print("")
+    print("blifparser serve [--root <dir>] [--socket <path>] [--library <file>] [--interval <seconds>]")
+    print("keeps the BLIF files of <dir> parsed in memory and answers JSON-RPC requests (see daemon.py)")
 
 
 def main() -> None:
     import sys
 
+    if run_subcommand(sys.argv[1:]):
+        return
+
     print("")
 
-    if len(sys.argv) == 2:
-        filepath = os.path.abspath(sys.argv[1])
-        blif = BlifParser(filepath).blif
+    args, show_stats, fail_fast, library, max_errors = get_options(sys.argv[1:])
+    if len(args) == 1:
+        filepath = os.path.abspath(args[0])
+        parser = BlifParser(filepath, profile=show_stats, max_errors=max_errors, fail_fast=fail_fast, library=library)
+        blif = parser.blif
 
         print("ISSUES LIST:\n")
 
@@ -223,8 +541,16 @@ def main() -> None:
         print("=" * 50)
         print("\nREPORT:\n")
         print("* {} issues found".format(len(blif.problems)))
+        if blif.problems.stopped:
+            print("* the parsing was stopped (too many errors): other issues may be present")
+
+        if parser.stats is not None:
+            print("")
+            print("=" * 50)
+            print("\nPHASES:\n")
+            print(parser.stats)
     else:
-        print("blifparser expects only one parameter: the input BLIF file path")
+        print_usage()
 
 
 if __name__ == "__main__":
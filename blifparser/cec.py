@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Combinational equivalence checking of two netlists (SAT based).
+
+The primary outputs are matched by name and the latches are cut:
+the latch outputs are inputs shared by name and the next state of each latch is compared
+like an output (named "latch <latch output>").
+
+    blifparser cec <golden BLIF file> <revised BLIF file>
+"""
+
+import random
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from . import sat
+    from .genlib import gate_to_names
+    from .keywords.generic import Blif, Names
+    from .keywords.mapped import Gate
+    from .strash import canonical_cover
+except (ImportError, ModuleNotFoundError):
+    import sat                                # type: ignore
+    from genlib import gate_to_names          # type: ignore
+    from keywords.generic import Blif, Names  # type: ignore
+    from keywords.mapped import Gate          # type: ignore
+    from strash import canonical_cover        # type: ignore
+
+
+class EquivalenceResult:
+    def __init__(self) -> None:
+        """
+        Result of check_equivalence().
+
+        Attributes:
+        * self.equivalent: True if the netlists are equivalent, False if they are not,
+          None if the solver reached the conflict limit before proving all the outputs
+        * self.outputs: compared outputs
+        * self.failing: outputs that are different
+        * self.undecided: outputs that are not proven within the conflict limit
+        * self.unmatched: outputs of only one of the netlists
+        * self.counterexample: value (0 or 1) of each input (primary inputs and latch outputs)
+          for which the first failing output is different
+        * self.merged: number of nets of the revised netlist replaced with an equivalent net
+        * self.sat_calls: number of calls to the SAT solver
+        """
+        self.equivalent: Optional[bool] = True
+        self.outputs: List[str] = []
+        self.failing: List[str] = []
+        self.undecided: List[str] = []
+        self.unmatched: List[str] = []
+        self.counterexample: Dict[str, int] = {}
+        self.merged = 0
+        self.sat_calls = 0
+
+    def __str__(self) -> str:
+        """Printed string."""
+        if self.equivalent:
+            text = "equivalent ({} outputs)\n".format(len(self.outputs))
+        elif self.equivalent is None:
+            text = "undecided: {}\n".format(" ".join(self.undecided))
+        else:
+            text = "not equivalent\n"
+
+        if self.unmatched:
+            text += "unmatched outputs: {}\n".format(" ".join(self.unmatched))
+
+        if self.failing:
+            text += "failing outputs: {}\n".format(" ".join(self.failing))
+            values = ["{}={}".format(net, value) for net, value in sorted(self.counterexample.items())]
+            text += "counterexample: {}\n".format(" ".join(values))
+
+        return text
+
+
+def get_functions(t_blif: Blif) -> List[Names]:
+    """
+    Returns the boolean functions of the <t_blif> netlist in topological order
+    (the .gate keywords are converted with the cell library of the netlist).
+    """
+    if t_blif.subcircuits or t_blif.mlatches:
+        raise ValueError("sub-circuits (.subckt) and .mlatch keywords are not supported")
+
+    index = t_blif.get_index()
+    if index.loops:
+        raise ValueError("the netlist contains combinational loops")
+
+    functions = []
+    for element_id in index.topological_order:
+        element = index.elements[element_id]
+        if isinstance(element, Names):
+            functions.append(element)
+        elif isinstance(element, Gate):
+            if t_blif.library is None:
+                raise ValueError("the .gate keywords need a cell library")
+
+            functions.append(gate_to_names(element, t_blif.library))
+
+    return functions
+
+
+def get_outputs(t_blif: Blif) -> Dict[str, str]:
+    """
+    Returns a dictionary that maps the name of each compared output to its net.
+    """
+    outputs = {net: net for net in (t_blif.outputs.outputs if t_blif.outputs else [])}
+    for latch in t_blif.latches:
+        outputs["latch " + latch.output] = latch.input
+
+    return outputs
+
+
+def simulate_cover(words: Sequence[int], truthtable: Sequence[Sequence[str]], mask: int) -> int:
+    """
+    Returns the value of a .names function given the values of its inputs
+    (bit-parallel simulation: bit i is the value in the i-th pattern, <mask> has a 1 for each pattern).
+    """
+    result = 0
+    for row in truthtable:
+        cube = mask
+        for word, char in zip(words, row[:-1]):
+            if char == "1":
+                cube &= word
+            elif char == "0":
+                cube &= ~word
+
+        result |= cube
+
+    if len(truthtable) > 0 and truthtable[0][-1] == "0":
+        result ^= mask
+
+    return result
+
+
+class Miter:
+    def __init__(self, num_patterns: int, seed: int) -> None:
+        """
+        CNF and simulation values of the nets of the two netlists.
+
+        Attributes:
+        * self.solver: SAT solver with the clauses of the boolean functions
+        * self.true_lit: literal that is always true
+        * self.inputs: literal of each input net (shared by the two netlists)
+        * self.words: simulation values of each input net
+        * self.covers: maps the canonical cover of a boolean function (with literals as inputs) to its literal
+        * self.candidates: maps the simulation value of the nets of the golden netlist to one of their literals
+          (the values are complemented when the first pattern is 1, see get_candidate())
+        """
+        self.mask = (1 << num_patterns) - 1
+        self.random = random.Random(seed)
+        self.solver = sat.Solver()
+        self.true_lit = self.solver.new_var()
+        self.solver.add_clause([self.true_lit])
+        self.inputs: Dict[str, int] = {}
+        self.words: Dict[str, int] = {}
+        self.covers: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], int] = {}
+        self.candidates: Dict[int, int] = {0: -self.true_lit}
+        self.sat_calls = 0
+
+    def get_input(self, net: str) -> Tuple[int, int]:
+        """
+        Returns the (literal, simulation value) tuple of the <net> input (created if it is new).
+        """
+        if net not in self.inputs:
+            self.inputs[net] = self.solver.new_var()
+            self.words[net] = self.random.getrandbits(self.mask.bit_length())
+            self.add_candidate(self.words[net], self.inputs[net])
+
+        return self.inputs[net], self.words[net]
+
+    def add_candidate(self, word: int, lit: int) -> None:
+        if word & 1:
+            self.candidates.setdefault(word ^ self.mask, -lit)
+        else:
+            self.candidates.setdefault(word, lit)
+
+    def get_candidate(self, word: int) -> Optional[int]:
+        """
+        Returns the literal of a golden net with the <word> simulation value (None if there isn't one).
+        """
+        if word & 1:
+            lit = self.candidates.get(word ^ self.mask)
+            return None if lit is None else -lit
+
+        return self.candidates.get(word)
+
+    def is_equal(self, a: int, b: int, conflict_limit: Optional[int]) -> Optional[bool]:
+        """
+        Returns True if the <a> and <b> literals are always equal, False if they are not
+        (the model of the solver is the counterexample), None if the conflict limit was reached.
+        """
+        undecided = False
+        for assumptions in ([a, -b], [-a, b]):
+            self.sat_calls += 1
+            result = self.solver.solve(assumptions, conflict_limit)
+            if result:
+                return False
+
+            undecided = undecided or result is None
+
+        return None if undecided else True
+
+    def add_netlist(self, functions: List[Names], golden: bool,
+                    conflict_limit: Optional[int]) -> Tuple[Dict[str, int], Dict[str, int], int]:
+        """
+        Adds the boolean functions of a netlist to the CNF.
+
+        The nets of the golden netlist become candidates, the nets of the revised netlist
+        are replaced with the equivalent candidates (the equivalence is proven with the solver,
+        the nets that are not proven within <conflict_limit> conflicts are kept).
+
+        :return tuple result: (literal of each net, simulation value of each net, number of replaced nets)
+        """
+        lits: Dict[str, int] = {}
+        words: Dict[str, int] = {}
+        merged = 0
+        for function in functions:
+            input_lits = []
+            input_words = []
+            for net in function.inputs:
+                if net not in lits:
+                    lits[net], words[net] = self.get_input(net)
+
+                input_lits.append(lits[net])
+                input_words.append(words[net])
+
+            word = simulate_cover(input_words, function.truthtable, self.mask)
+            key = canonical_cover([str(lit) for lit in input_lits], function.truthtable)
+            lit = self.covers.get(key)
+            if lit is None:
+                lit = self.solver.new_var()
+                for clause in sat.encode_cover(input_lits, function.truthtable, lit, self.solver.new_var):
+                    self.solver.add_clause(clause)
+
+                if golden:
+                    self.add_candidate(word, lit)
+                else:
+                    candidate = self.get_candidate(word)
+                    if candidate is not None and self.is_equal(lit, candidate, conflict_limit):
+                        lit = candidate
+                        merged += 1
+
+                self.covers[key] = lit
+
+            lits[function.output] = lit
+            words[function.output] = word
+
+        return lits, words, merged
+
+    def get_lit(self, lits: Dict[str, int], words: Dict[str, int], net: str) -> Tuple[int, int]:
+        """
+        Returns the (literal, simulation value) tuple of a net of a netlist (inputs and undriven nets are shared).
+        """
+        if net in lits:
+            return lits[net], words[net]
+
+        return self.get_input(net)
+
+
+def check_equivalence(golden: Blif, revised: Blif, num_patterns: int = 256, seed: int = 0,
+                      sweep_conflict_limit: Optional[int] = 1000,
+                      conflict_limit: Optional[int] = None) -> EquivalenceResult:
+    """
+    Checks if the combinational logic of the <golden> and <revised> netlists is equivalent.
+
+    The steps are:
+    * random simulation of both netlists: the outputs with a different value are failing (no SAT call needed)
+    * Tseitin encoding of the golden boolean functions, then of the revised ones in topological order:
+      a revised net with the same simulation value of a golden net is proven equivalent with the solver
+      and replaced with the golden net, so the CNF of the following functions is shared
+    * each pair of outputs with the same name (and different literals) is proven with the solver
+
+    :param Blif golden: reference netlist
+    :param Blif revised: netlist to check
+    :param int num_patterns: number of random patterns
+    :param int seed: seed of the random patterns
+    :param int sweep_conflict_limit: maximum number of conflicts to prove two internal nets equivalent
+    :param int conflict_limit: maximum number of conflicts to prove two outputs equivalent (None: no limit)
+    :return EquivalenceResult result: result of the check
+    """
+    miter = Miter(num_patterns, seed)
+    result = EquivalenceResult()
+
+    golden_lits, golden_words, _ = miter.add_netlist(get_functions(golden), True, sweep_conflict_limit)
+    revised_lits, revised_words, result.merged = miter.add_netlist(get_functions(revised), False, sweep_conflict_limit)
+
+    golden_outputs = get_outputs(golden)
+    revised_outputs = get_outputs(revised)
+    result.unmatched = [name for name in golden_outputs if name not in revised_outputs]
+    result.unmatched.extend(name for name in revised_outputs if name not in golden_outputs)
+
+    for name, golden_net in golden_outputs.items():
+        if name not in revised_outputs:
+            continue
+
+        result.outputs.append(name)
+        golden_lit, golden_word = miter.get_lit(golden_lits, golden_words, golden_net)
+        revised_lit, revised_word = miter.get_lit(revised_lits, revised_words, revised_outputs[name])
+        if golden_word != revised_word:
+            result.failing.append(name)
+            if not result.counterexample:
+                pattern = ((golden_word ^ revised_word) & -(golden_word ^ revised_word)).bit_length() - 1
+                result.counterexample = {net: (word >> pattern) & 1 for net, word in miter.words.items()}
+            continue
+
+        if golden_lit == revised_lit:
+            continue
+
+        equal = miter.is_equal(golden_lit, revised_lit, conflict_limit)
+        if equal is None:
+            result.undecided.append(name)
+        elif not equal:
+            result.failing.append(name)
+            if not result.counterexample:
+                result.counterexample = {net: int(miter.solver.get_value(lit)) for net, lit in miter.inputs.items()}
+
+    result.sat_calls = miter.sat_calls
+    if result.failing or result.unmatched:
+        result.equivalent = False
+    elif result.undecided:
+        result.equivalent = None
+
+    return result
+
+
+def main(args: List[str]) -> None:
+    """
+    Checks the equivalence of two files (args are the command line arguments after "cec"),
+    exits with 1 if the files are not equivalent (or the result is undecided).
+    """
+    try:
+        from . import blifparser
+    except (ImportError, ModuleNotFoundError):
+        import blifparser  # type: ignore
+
+    if len(args) != 2:
+        print("usage: blifparser cec <golden BLIF file> <revised BLIF file>", file=sys.stderr)
+        sys.exit(2)
+
+    result = check_equivalence(blifparser.BlifParser(args[0]).blif, blifparser.BlifParser(args[1]).blif)
+    print(result, end="")
+    sys.exit(0 if result.equivalent else 1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Long-running server that keeps the parsed BLIF files of a project in memory.
+
+The files are parsed again only when their modification time or size change (the server polls them),
+the queries are JSON-RPC 2.0 requests (one JSON object per line) read from stdin or from a Unix socket:
+
+    blifparser serve [--root <dir>] [--socket <path>] [--library <genlib file>] [--interval <seconds>]
+"""
+
+import inspect
+import json
+import os
+import socketserver
+import sys
+import threading
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple, Union
+
+try:
+    from . import blifparser
+    from . import genlib
+    from . import graph
+    from .keywords.generic import Blif
+except (ImportError, ModuleNotFoundError):
+    import blifparser                  # type: ignore
+    import genlib                      # type: ignore
+    import graph                       # type: ignore
+    from keywords.generic import Blif  # type: ignore
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class Workspace:
+    def __init__(self, root: str = ".", library: Optional[Union[str, genlib.Library]] = None,
+                 extensions: Tuple[str, ...] = (".blif",)) -> None:
+        """
+        Parsed BLIF files of the <root> folder.
+
+        Attributes:
+        * self.root: absolute path of the folder
+        * self.library: genlib library passed to the parser (see BlifParser())
+        * self.extensions: extensions of the files found by refresh()
+        * self.files: dictionary that maps the real path of each parsed file
+          to its ((modification time, size), BlifParser()) tuple
+        * self.num_parses: number of files parsed since the creation of the workspace
+        """
+        self.root = os.path.realpath(root)
+        self.library = library
+        self.extensions = extensions
+        self.files: Dict[str, Tuple[Tuple[int, int], blifparser.BlifParser]] = {}
+        self.num_parses = 0
+        self.lock = threading.RLock()
+
+    def get_path(self, path: str, base: Optional[str] = None) -> str:
+        """
+        Returns the real path of <path> (relative paths start from <base>, by default the root).
+        """
+        return os.path.realpath(os.path.join(base or self.root, path))
+
+    def get(self, path: str) -> blifparser.BlifParser:
+        """
+        Returns the parser of the <path> file: the file is parsed only if it is new or it changed.
+        """
+        path = self.get_path(path)
+        with self.lock:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.files.pop(path, None)
+                raise FileNotFoundError("'{}' doesn't exist".format(path))
+
+            key = (stat.st_mtime_ns, stat.st_size)
+            cached = self.files.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+            parser = blifparser.BlifParser(path, library=self.library)
+            self.files[path] = (key, parser)
+            self.num_parses += 1
+            return parser
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """
+        Polls the files of the root folder: parses the new and changed files and forgets the deleted ones.
+
+        :return dict changes: "parsed" and "removed" lists of paths
+        """
+        found = []
+        for folder, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith(self.extensions):
+                    found.append(os.path.realpath(os.path.join(folder, filename)))
+
+        changes: Dict[str, List[str]] = {"parsed": [], "removed": []}
+        with self.lock:
+            for path in list(self.files):
+                if not os.path.exists(path):
+                    del self.files[path]
+                    changes["removed"].append(path)
+
+            for path in found:
+                num_parses = self.num_parses
+                try:
+                    self.get(path)
+                except FileNotFoundError:
+                    continue
+
+                if self.num_parses != num_parses:
+                    changes["parsed"].append(path)
+
+        return changes
+
+    def load_imported(self, path: str) -> Callable[[str], Blif]:
+        """
+        Returns a function that returns the Blif object of a file .search-ed by the <path> file
+        (relative paths start from the folder of <path>).
+        """
+        def load_blif(filepath: str) -> Blif:
+            return self.get(self.get_path(filepath, os.path.dirname(path))).blif
+
+        return load_blif
+
+    def watch(self, interval: float, stop: threading.Event) -> threading.Thread:
+        """
+        Starts a thread that calls refresh() every <interval> seconds, until <stop> is set.
+        """
+        def poll() -> None:
+            while not stop.wait(interval):
+                self.refresh()
+
+        thread = threading.Thread(target=poll, daemon=True)
+        thread.start()
+        return thread
+
+
+class Server:
+    def __init__(self, workspace: Workspace) -> None:
+        """
+        Answers JSON-RPC 2.0 requests about the files of the <workspace> workspace.
+
+        Methods (the paths are relative to the root of the workspace):
+        * files(): paths of the parsed files
+        * refresh(): polls the files (see Workspace.refresh())
+        * lint(path): problems of the file
+        * lint_all(): problems of each file of the workspace
+        * graph(path, cluster=None): nodes and edges of the graph of the file (see graph.parse_blif())
+        * levels(path): logic level of the nets (see Blif.get_levels())
+        * fanin_cone(path, net, stop_at_latches=True, stop_at_io=False): nets of the fanin cone
+        * fanout_cone(path, net, stop_at_latches=True, stop_at_io=False): nets of the fanout cone
+        * shutdown(): stops the server
+        """
+        self.workspace = workspace
+        self.running = True
+        self.methods: Dict[str, Callable[..., Any]] = {
+            "files": self.files,
+            "refresh": self.workspace.refresh,
+            "lint": self.lint,
+            "lint_all": self.lint_all,
+            "graph": self.graph,
+            "levels": self.levels,
+            "fanin_cone": self.fanin_cone,
+            "fanout_cone": self.fanout_cone,
+            "shutdown": self.shutdown,
+        }
+
+    def files(self) -> List[str]:
+        with self.workspace.lock:
+            return sorted(self.workspace.files)
+
+    def lint(self, path: str) -> Dict[str, Any]:
+        problems = self.workspace.get(path).blif.problems
+        return {
+            "problems": [{"code": problem.code, "line": problem.line, "severity": problem.severity, "text": problem.text}
+                         for problem in problems],
+            "stopped": problems.stopped
+        }
+
+    def lint_all(self) -> Dict[str, Dict[str, Any]]:
+        self.workspace.refresh()
+        return {path: self.lint(path) for path in self.files()}
+
+    def graph(self, path: str, cluster: Optional[str] = None) -> Dict[str, Any]:
+        path = self.workspace.get_path(path)
+        blif_graph = graph.parse_blif(self.workspace.get(path).blif, self.workspace.load_imported(path))
+        if cluster is not None:
+            blif_graph = graph.cluster(blif_graph, cluster)
+
+        return {
+            "nodes": [{"id": node.id, "type": node.type, "key": node.key, "size": node.size,
+                       "inputs": node.inputs, "outputs": node.outputs} for node in blif_graph.nodes],
+            "edges": [[source.id, target.id, label] for source, target, label in blif_graph.edges()]
+        }
+
+    def levels(self, path: str) -> Dict[str, int]:
+        return self.workspace.get(path).blif.get_levels()
+
+    def fanin_cone(self, path: str, net: str, stop_at_latches: bool = True, stop_at_io: bool = False) -> List[str]:
+        return sorted(self.workspace.get(path).blif.get_fanin_cone(net, stop_at_latches, stop_at_io))
+
+    def fanout_cone(self, path: str, net: str, stop_at_latches: bool = True, stop_at_io: bool = False) -> List[str]:
+        return sorted(self.workspace.get(path).blif.get_fanout_cone(net, stop_at_latches, stop_at_io))
+
+    def shutdown(self) -> None:
+        self.running = False
+
+    def handle(self, request: Any) -> Optional[Dict[str, Any]]:
+        """
+        Executes a JSON-RPC request and returns the response (None for notifications, requests without id).
+        """
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+            return make_error(None, INVALID_REQUEST, "invalid request")
+
+        response = self.execute(request)
+        if "id" not in request:
+            return None
+
+        return response
+
+    def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Calls the method of a valid JSON-RPC request and returns the response.
+        """
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            return make_error(request_id, METHOD_NOT_FOUND, "'{}' method not found".format(request["method"]))
+
+        params = request.get("params", {})
+        try:
+            if isinstance(params, dict):
+                arguments = inspect.signature(method).bind(**params)
+            elif isinstance(params, list):
+                arguments = inspect.signature(method).bind(*params)
+            else:
+                raise TypeError("params needs to be an object or an array")
+        except TypeError as e:
+            return make_error(request_id, INVALID_PARAMS, str(e))
+
+        try:
+            result = method(*arguments.args, **arguments.kwargs)
+        except Exception as e:
+            return make_error(request_id, SERVER_ERROR, str(e))
+
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """
+        Executes the JSON-RPC request in the <line> line and returns the JSON response (None if there is no response).
+        """
+        if line.strip() == "":
+            return None
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return json.dumps(make_error(None, PARSE_ERROR, "parse error"))
+
+        response = self.handle(request)
+        return None if response is None else json.dumps(response)
+
+    def serve_stream(self, fin: IO[str], fout: IO[str]) -> None:
+        """
+        Answers the requests read from <fin> (one for each line) writing the responses to <fout>,
+        until the end of the stream or the shutdown request.
+        """
+        for line in fin:
+            response = self.handle_line(line)
+            if response is not None:
+                fout.write(response + "\n")
+                fout.flush()
+
+            if not self.running:
+                break
+
+    def serve_unix(self, socket_path: str) -> None:
+        """
+        Answers the requests of the clients connected to the <socket_path> Unix socket, until the shutdown request.
+        """
+        server = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for raw_line in self.rfile:
+                    response = server.handle_line(raw_line.decode())
+                    if response is not None:
+                        self.wfile.write((response + "\n").encode())
+                        self.wfile.flush()
+
+                    if not server.running:
+                        threading.Thread(target=self.server.shutdown).start()
+                        break
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+        with socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler) as unix_server:
+            try:
+                unix_server.serve_forever(poll_interval=0.1)
+            finally:
+                os.unlink(socket_path)
+
+
+def make_error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    """
+    Returns a JSON-RPC error response.
+    """
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def main(args: List[str]) -> None:
+    """
+    Starts the server (args are the command line arguments after "serve").
+    """
+    options = {"--root": ".", "--socket": None, "--library": None, "--interval": "1"}
+    while args:
+        if args[0] not in options or len(args) < 2:
+            print("usage: blifparser serve [--root <dir>] [--socket <path>] [--library <genlib file>] "
+                  "[--interval <seconds>]", file=sys.stderr)
+            sys.exit(1)
+
+        options[args[0]] = args[1]
+        args = args[2:]
+
+    workspace = Workspace(options["--root"] or ".", options["--library"])
+    workspace.refresh()
+
+    stop = threading.Event()
+    interval = float(options["--interval"] or 0)
+    if interval > 0:
+        workspace.watch(interval, stop)
+
+    server = Server(workspace)
+    try:
+        if options["--socket"]:
+            server.serve_unix(options["--socket"])
+        else:
+            server.serve_stream(sys.stdin, sys.stdout)
+    finally:
+        stop.set()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Structural diff between two parsed BLIF files.
+
+The internal nets are renamed after the logic that drives them (see get_signatures()),
+so two netlists that only differ in the names of the internal nets, in the order of the keywords
+or in the order of the rows/inputs of the covers are identical.
+The elements that are left are compared one by one (see get_local_signature()):
+a changed element is reported once, not with its whole fanout.
+
+    blifparser diff <old BLIF file> <new BLIF file>
+"""
+
+import sys
+from collections import defaultdict
+from typing import Callable, DefaultDict, Dict, Hashable, List, Tuple, Union
+
+try:
+    from .keywords.generic import Blif, Names, Latch
+    from .keywords.mapped import Gate, MLatch
+    from .keywords.subfiles import Subckt
+    from .strash import canonical_cover
+except (ImportError, ModuleNotFoundError):
+    from keywords.generic import Blif, Names, Latch  # type: ignore
+    from keywords.mapped import Gate, MLatch         # type: ignore
+    from keywords.subfiles import Subckt             # type: ignore
+    from strash import canonical_cover               # type: ignore
+
+Element = Union[Names, Latch, Subckt, Gate, MLatch]
+
+
+class Signatures:
+    def __init__(self) -> None:
+        """
+        Assigns an integer id to each signature (a tuple that describes a net or an element).
+
+        The same object is used for both netlists: equal signatures get the same id.
+        """
+        self.ids: Dict[Hashable, int] = {}
+
+    def get_id(self, signature: Hashable) -> int:
+        signature_id = self.ids.get(signature)
+        if signature_id is None:
+            signature_id = len(self.ids)
+            self.ids[signature] = signature_id
+
+        return signature_id
+
+
+def get_signatures(t_blif: Blif, signatures: Signatures) -> List[Tuple[int, Element]]:  # noqa: C901
+    """
+    Returns the (signature id, element) tuple of each element of the <t_blif> netlist.
+
+    The net ids are computed in topological order:
+    * primary inputs and the outputs of latches and sub-circuits are identified by their name
+      (like the nets of the boolean functions that are part of a combinational loop)
+    * the output of a boolean function (or gate) is identified by its function of the input ids
+      (the canonical cover, see strash.canonical_cover()) and, if it's a primary output, by its name
+
+    The nets read by latches, gates and sub-circuits are already part of the signatures of the readers
+    (as ids), only the primary outputs are compared by name: the logic of two swapped outputs is a difference.
+    """
+    index = t_blif.get_index()
+    primary_outputs = set(index.primary_outputs)
+    net_ids: Dict[str, int] = {}
+
+    def get_net_id(net: str) -> int:
+        net_id = net_ids.get(net)
+        if net_id is None:
+            net_id = signatures.get_id(("net", net))
+            net_ids[net] = net_id
+
+        return net_id
+
+    def get_signature(element_id: int) -> Hashable:
+        element = index.elements[element_id]
+        inputs = [str(get_net_id(net)) for net in index.element_inputs[element_id]]
+        named_outputs = tuple(net for net in index.element_outputs[element_id] if net in primary_outputs)
+        if isinstance(element, Names):
+            return ("names", named_outputs) + canonical_cover(inputs, element.truthtable)
+
+        if isinstance(element, Gate):
+            formals = sorted(formal for formal, actual in element.bindings.items()
+                             if actual in index.element_inputs[element_id])
+            return ("gate", element.name, named_outputs,
+                    tuple((formal, get_net_id(element.bindings[formal])) for formal in formals))
+
+        if isinstance(element, Latch):
+            return ("latch", inputs[0], element.output, element.type, element.control, element.initval)
+
+        if isinstance(element, MLatch):
+            bindings = tuple(sorted((formal, get_net_id(actual)) for formal, actual in element.bindings.items()))
+            return ("mlatch", element.name, bindings, get_net_id(element.control), element.initval)
+
+        bindings = tuple(sorted((formal, get_net_id(actual)) for formal, actual in
+                                (param.split("=", 1) for param in element.params if "=" in param)))
+        return ("subckt", element.modelname, bindings)
+
+    # combinational loops: the outputs are identified by their names
+    ordered = set(index.topological_order)
+    for element_id in range(len(index.elements)):
+        if element_id not in ordered:
+            for net in index.element_outputs[element_id]:
+                get_net_id(net)
+
+    # the outputs of the combinational elements are identified by their signature
+    element_signatures = [-1] * len(index.elements)
+    for element_id in index.topological_order:
+        if index.is_combinational(element_id):
+            element_signatures[element_id] = signatures.get_id(get_signature(element_id))
+            for net in index.element_outputs[element_id]:
+                net_ids.setdefault(net, element_signatures[element_id])
+
+    result = []
+    for element_id, element in enumerate(index.elements):
+        if element_signatures[element_id] < 0:
+            element_signatures[element_id] = signatures.get_id(get_signature(element_id))
+
+        result.append((element_signatures[element_id], element))
+
+    return result
+
+
+def get_local_signature(element: Element, nets: List[str], rename: Callable[[str], str]) -> Hashable:
+    """
+    Returns the signature of <element> that only depends on the element itself:
+    its nets (<nets>, renamed with <rename>) and its cover, cell or bindings.
+
+    :param list nets: output nets of the element (see NetlistIndex.element_outputs)
+    :param rename: maps a net of the netlist to the name of the corresponding net of the other netlist
+    """
+    outputs = tuple(rename(net) for net in nets)
+    if isinstance(element, Names):
+        return ("names", outputs) + canonical_cover([rename(net) for net in element.inputs], element.truthtable)
+
+    if isinstance(element, Latch):
+        control = rename(element.control) if element.control else None
+        return ("latch", rename(element.input), outputs, element.type, control, element.initval)
+
+    if isinstance(element, Gate):
+        return ("gate", element.name, tuple(sorted((formal, rename(actual)) for formal, actual in element.bindings.items())))
+
+    if isinstance(element, MLatch):
+        bindings = tuple(sorted((formal, rename(actual)) for formal, actual in element.bindings.items()))
+        return ("mlatch", element.name, bindings, rename(element.control), element.initval)
+
+    bindings = tuple(sorted((formal, rename(actual)) for formal, actual in
+                            (param.split("=", 1) for param in element.params if "=" in param)))
+    return ("subckt", element.modelname, bindings)
+
+
+def get_key(element: Element) -> Tuple[str, ...]:
+    """
+    Returns the key used to pair a removed element with an added one (a "changed" element):
+    the output net for boolean functions and latches, the model and the nets for sub-circuits.
+    """
+    if isinstance(element, Names):
+        return ("names", element.output)
+
+    if isinstance(element, Latch):
+        return ("latch", element.output)
+
+    if isinstance(element, (Gate, MLatch)):
+        nets = list(element.bindings.values())
+        return (type(element).__name__.lower(),) + tuple(nets[-1:])
+
+    return ("subckt", element.modelname) + tuple(sorted(element.params))
+
+
+class BlifDiff:
+    def __init__(self) -> None:
+        """
+        Differences between two netlists (see diff_blifs()).
+
+        Attributes:
+        * self.added: elements that are only in the new netlist
+        * self.removed: elements that are only in the old netlist
+        * self.changed: (old element, new element) tuples of the elements that drive the same net
+          (for sub-circuits: same model and nets) but have a different cover, cell or bindings
+        * self.added_inputs, self.removed_inputs: primary inputs only in the new/old netlist
+        * self.added_outputs, self.removed_outputs: primary outputs only in the new/old netlist
+        """
+        self.added: List[Element] = []
+        self.removed: List[Element] = []
+        self.changed: List[Tuple[Element, Element]] = []
+        self.added_inputs: List[str] = []
+        self.removed_inputs: List[str] = []
+        self.added_outputs: List[str] = []
+        self.removed_outputs: List[str] = []
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if the netlists are structurally identical.
+        """
+        return not (self.added or self.removed or self.changed or self.added_inputs or self.removed_inputs
+                    or self.added_outputs or self.removed_outputs)
+
+    def __str__(self) -> str:
+        """Printed string: "-" for removed lines, "+" for added lines."""
+        text = ""
+        for sign, keyword, nets in (("-", ".inputs", self.removed_inputs), ("+", ".inputs", self.added_inputs),
+                                    ("-", ".outputs", self.removed_outputs), ("+", ".outputs", self.added_outputs)):
+            if nets:
+                text += "{} {} {}\n".format(sign, keyword, " ".join(nets))
+
+        for old, new in self.changed:
+            text += "changed:\n" + prefix_lines("- ", old) + prefix_lines("+ ", new)
+
+        for element in self.removed:
+            text += "removed:\n" + prefix_lines("- ", element)
+
+        for element in self.added:
+            text += "added:\n" + prefix_lines("+ ", element)
+
+        return text
+
+
+def prefix_lines(prefix: str, element: Element) -> str:
+    """
+    Returns the printed string of <element> with <prefix> at the start of each line.
+    """
+    return "".join(prefix + line + "\n" for line in str(element).splitlines())
+
+
+def diff_blifs(old: Blif, new: Blif) -> BlifDiff:
+    """
+    Compares the <old> and <new> netlists.
+
+    Each element is hashed (see get_signatures()) and the elements with the same signature
+    in both netlists are equal, the other ones are paired by get_key() to find the changed ones.
+    The outputs of the equal and of the paired elements are corresponding nets:
+    a pair is changed only if the element is different after renaming its nets
+    (see get_local_signature()), so the fanout of a changed element is not reported.
+    The cost is linear in the size of the netlists (plus the sorting of the covers).
+
+    :param Blif old: old netlist
+    :param Blif new: new netlist
+    :return BlifDiff result: added, removed and changed elements
+    """
+    signatures = Signatures()
+    old_elements = get_signatures(old, signatures)
+    new_elements = get_signatures(new, signatures)
+    old_index = old.get_index()
+    new_index = new.get_index()
+
+    # elements with the same signature are equal (duplicates are matched one by one)
+    unmatched: DefaultDict[int, List[int]] = defaultdict(list)
+    for old_id, (signature_id, _) in enumerate(old_elements):
+        unmatched[signature_id].append(old_id)
+
+    pairs: List[Tuple[int, int]] = []
+    added = []
+    for new_id, (signature_id, _) in enumerate(new_elements):
+        if unmatched[signature_id]:
+            pairs.append((unmatched[signature_id].pop(), new_id))
+        else:
+            added.append(new_id)
+
+    remaining = set(old_id for old_ids in unmatched.values() for old_id in old_ids)
+    removed = [old_id for old_id in range(len(old_elements)) if old_id in remaining]
+
+    # a removed element and an added one with the same key are a candidate changed element
+    removed_by_key: Dict[Tuple[str, ...], int] = {}
+    for old_id in removed:
+        removed_by_key.setdefault(get_key(old_index.elements[old_id]), old_id)
+
+    result = BlifDiff()
+    candidates: List[Tuple[int, int]] = []
+    for new_id in added:
+        old_id = removed_by_key.pop(get_key(new_index.elements[new_id]), -1)
+        if old_id < 0:
+            result.added.append(new_index.elements[new_id])
+        else:
+            candidates.append((old_id, new_id))
+
+    paired = set(old_id for old_id, _ in candidates)
+    result.removed = [old_index.elements[old_id] for old_id in removed if old_id not in paired]
+
+    # the nets of the old netlist are renamed after the corresponding nets (the other ones keep their name)
+    net_map: Dict[str, str] = {}
+    for old_id, new_id in pairs + candidates:
+        net_map.update(zip(old_index.element_outputs[old_id], new_index.element_outputs[new_id]))
+
+    for old_id, new_id in candidates:
+        old_element = old_index.elements[old_id]
+        new_element = new_index.elements[new_id]
+        old_signature = get_local_signature(old_element, old_index.element_outputs[old_id],
+                                            lambda net: net_map.get(net, net))
+        if old_signature != get_local_signature(new_element, new_index.element_outputs[new_id], str):
+            result.changed.append((old_element, new_element))
+
+    for attribute, old_nets, new_nets in (("inputs", old.inputs.inputs if old.inputs else [],
+                                           new.inputs.inputs if new.inputs else []),
+                                          ("outputs", old.outputs.outputs if old.outputs else [],
+                                           new.outputs.outputs if new.outputs else [])):
+        old_set = set(old_nets)
+        new_set = set(new_nets)
+        setattr(result, "added_" + attribute, [net for net in new_nets if net not in old_set])
+        setattr(result, "removed_" + attribute, [net for net in old_nets if net not in new_set])
+
+    return result
+
+
+def main(args: List[str]) -> None:
+    """
+    Prints the differences between two files (args are the command line arguments after "diff"),
+    exits with 1 if the files are different.
+    """
+    try:
+        from . import blifparser
+    except (ImportError, ModuleNotFoundError):
+        import blifparser  # type: ignore
+
+    if len(args) != 2:
+        print("usage: blifparser diff <old BLIF file> <new BLIF file>", file=sys.stderr)
+        sys.exit(2)
+
+    result = diff_blifs(blifparser.BlifParser(args[0]).blif, blifparser.BlifParser(args[1]).blif)
+    print(result, end="")
+    sys.exit(0 if result.is_empty() else 1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming writers: DIMACS CNF and structural Verilog.
+
+The netlist is written one element at a time to a text file object,
+no intermediate string of the whole file is built.
+"""
+
+import re
+from typing import Dict, IO, Iterator, List, Sequence, Set, Tuple
+
+try:
+    from .genlib import gate_to_names
+    from .keywords.generic import Blif, Names
+    from .sat import encode_cover
+except (ImportError, ModuleNotFoundError):
+    from genlib import gate_to_names          # type: ignore
+    from keywords.generic import Blif, Names  # type: ignore
+    from sat import encode_cover              # type: ignore
+
+VERILOG_KEYWORDS = frozenset([
+    "always", "and", "assign", "begin", "buf", "case", "default", "else", "end", "endcase", "endmodule",
+    "for", "function", "if", "initial", "inout", "input", "integer", "module", "nand", "negedge", "nor",
+    "not", "or", "output", "parameter", "posedge", "reg", "supply0", "supply1", "tri", "wire", "xnor", "xor"
+])
+
+VERILOG_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_$]*\Z")
+
+
+def get_functions(t_blif: Blif) -> Iterator[Names]:
+    """
+    Yields the boolean functions of the <t_blif> netlist (the .gate keywords are converted
+    with the cell library of the netlist, one at a time).
+    """
+    if t_blif.subcircuits:
+        raise ValueError("sub-circuits (.subckt) can't be converted into CNF")
+
+    if t_blif.gates and t_blif.library is None:
+        raise ValueError("the .gate keywords need a cell library")
+
+    yield from t_blif.booleanfunctions
+    for gate in t_blif.gates:
+        yield gate_to_names(gate, t_blif.library)  # type: ignore
+
+
+def get_latch_nets(t_blif: Blif) -> Iterator[Sequence[str]]:
+    """
+    Yields the [output, input, ...] nets of each latch (.latch and .mlatch, the control is not included).
+    """
+    for latch in t_blif.latches:
+        yield [latch.output, latch.input]
+
+    for mlatch in t_blif.mlatches:
+        inputs, outputs = t_blif.get_mapped_nets(mlatch)
+        yield outputs + [net for net in inputs if net != mlatch.control]
+
+
+def get_dimacs_variables(t_blif: Blif) -> Tuple[Dict[str, int], int, int]:
+    """
+    Numbers the nets of the <t_blif> netlist for write_dimacs() (first pass).
+
+    :return tuple result: the variable of each net, the number of auxiliary variables
+                          and the number of clauses of the Tseitin encoding
+    """
+    variables: Dict[str, int] = {}
+
+    def get_var(net: str) -> int:
+        var = variables.get(net)
+        if var is None:
+            var = len(variables) + 1
+            variables[net] = var
+
+        return var
+
+    for net in t_blif.inputs.inputs if t_blif.inputs else []:
+        get_var(net)
+
+    for nets in get_latch_nets(t_blif):
+        get_var(nets[0])
+
+    num_aux = 0
+    num_clauses = 0
+
+    def count_var() -> int:
+        nonlocal num_aux
+        num_aux += 1
+        return num_aux
+
+    for function in get_functions(t_blif):
+        input_vars = [get_var(net) for net in function.inputs]
+        for _ in encode_cover(input_vars, function.truthtable, get_var(function.output), count_var):
+            num_clauses += 1
+
+    for nets in get_latch_nets(t_blif):
+        for net in nets[1:]:
+            get_var(net)
+
+    for net in t_blif.outputs.outputs if t_blif.outputs else []:
+        get_var(net)
+
+    return variables, num_aux, num_clauses
+
+
+def write_dimacs(t_blif: Blif, fout: IO[str]) -> None:
+    """
+    Writes the combinational logic of the <t_blif> netlist to the <fout> file object as DIMACS CNF
+    (Tseitin encoding of each boolean function, see sat.encode_cover()).
+
+    The latches are cut: their outputs are free variables (pseudo-inputs), their inputs are pseudo-outputs.
+    The variables of the nets are written as comments before the problem line:
+
+        c input <net> <variable>
+        c output <net> <variable>
+        c latch <output net> <output variable> <input variable> ...
+
+    The netlist is read twice: the first pass numbers the nets and counts the variables and clauses
+    of the problem line (see get_dimacs_variables()), the second pass writes the clauses.
+    """
+    variables, num_aux, num_clauses = get_dimacs_variables(t_blif)
+    if t_blif.model is not None:
+        fout.write("c model {}\n".format(t_blif.model.name))
+
+    for net in t_blif.inputs.inputs if t_blif.inputs else []:
+        fout.write("c input {} {}\n".format(net, variables[net]))
+
+    for net in t_blif.outputs.outputs if t_blif.outputs else []:
+        fout.write("c output {} {}\n".format(net, variables[net]))
+
+    for nets in get_latch_nets(t_blif):
+        fout.write("c latch {} {}\n".format(nets[0], " ".join(str(variables[net]) for net in nets)))
+
+    fout.write("p cnf {} {}\n".format(len(variables) + num_aux, num_clauses))
+
+    last_var = len(variables)
+
+    def new_var() -> int:
+        nonlocal last_var
+        last_var += 1
+        return last_var
+
+    for function in get_functions(t_blif):
+        input_vars = [variables[net] for net in function.inputs]
+        for clause in encode_cover(input_vars, function.truthtable, variables[function.output], new_var):
+            fout.write(" ".join(str(lit) for lit in clause) + " 0\n")
+
+
+def get_identifier(net: str) -> str:
+    """
+    Returns the Verilog identifier of the <net> net (escaped identifier if the name isn't a valid identifier).
+    """
+    if VERILOG_IDENTIFIER.match(net) and net not in VERILOG_KEYWORDS:
+        return net
+
+    return "\\" + net + " "
+
+
+def get_expression(inputs: Sequence[str], truthtable: Sequence[Sequence[str]]) -> str:
+    """
+    Returns the Verilog expression of a .names truth table (sum of products) given the identifiers of its inputs.
+    """
+    cubes = []
+    for row in truthtable:
+        terms = []
+        for identifier, char in zip(inputs, row[:-1]):
+            if char == "1":
+                terms.append(identifier)
+            elif char == "0":
+                terms.append("~" + identifier)
+
+        if len(terms) == 0:
+            cubes = ["1'b1"]
+            break
+
+        cubes.append(" & ".join(terms) if len(terms) == 1 or len(truthtable) == 1 else "(" + " & ".join(terms) + ")")
+
+    expression = " | ".join(cubes) if cubes else "1'b0"
+
+    # rows with "0" as output define when the function is false
+    if len(truthtable) > 0 and truthtable[0][-1] == "0":
+        return "~(" + expression + ")"
+
+    return expression
+
+
+def get_instance_name(prefix: str, position: int, nets: Set[str]) -> str:
+    """
+    Returns the name of an instance, different from the names of the <nets> nets.
+    """
+    name = "{}{}".format(prefix, position)
+    while name in nets:
+        name += "_"
+
+    return name
+
+
+def write_verilog(t_blif: Blif, fout: IO[str], clock: str = "clock") -> None:  # noqa: C901
+    """
+    Writes the <t_blif> netlist to the <fout> file object as a structural Verilog module.
+
+    * each boolean function (.names) is a continuous assignment (sum of products)
+    * the .gate, .mlatch and .subckt keywords are instances of the cell (or model) with named port connections
+      (the modules of the cells and of the sub-circuits are not written)
+    * the latches are always blocks: "re"/"fe" latches are edge triggered on their control,
+      "ah"/"al" latches are level sensitive, "as" latches follow their input,
+      the latches without a control use the <clock> input (added to the ports when needed)
+
+    :param Blif t_blif: netlist
+    :param file fout: text file object
+    :param str clock: name of the global clock input
+    """
+    inputs = list(t_blif.inputs.inputs) if t_blif.inputs else []
+    outputs = t_blif.outputs.outputs if t_blif.outputs else []
+    if clock not in inputs and any(latch.control in (None, "NIL") and latch.type != "as" for latch in t_blif.latches):
+        inputs.append(clock)
+
+    name = t_blif.model.name if t_blif.model is not None else "top"
+    ports = inputs + [net for net in outputs if net not in inputs]
+    fout.write("module {}(\n".format(get_identifier(name)))
+    for position, net in enumerate(ports):
+        fout.write("    {}{}\n".format(get_identifier(net), "," if position + 1 < len(ports) else ""))
+
+    fout.write(");\n")
+
+    declared = set(ports)
+    for net in inputs:
+        fout.write("    input {};\n".format(get_identifier(net)))
+
+    for net in outputs:
+        if net not in inputs:
+            fout.write("    output {};\n".format(get_identifier(net)))
+
+    for latch in t_blif.latches:
+        fout.write("    reg {};\n".format(get_identifier(latch.output)))
+        declared.add(latch.output)
+
+    def get_nets() -> Iterator[str]:
+        for function in t_blif.booleanfunctions:
+            yield from function.inputs
+            yield function.output
+
+        for latch in t_blif.latches:
+            yield latch.input
+            if latch.control not in (None, "NIL"):
+                yield latch.control
+
+        for element in t_blif.gates + t_blif.mlatches:
+            yield from element.bindings.values()
+
+        for mlatch in t_blif.mlatches:
+            yield mlatch.control
+
+        for subckt in t_blif.subcircuits:
+            yield from (param.split("=", 1)[1] for param in subckt.params if "=" in param)
+
+    for net in get_nets():
+        if net not in declared:
+            fout.write("    wire {};\n".format(get_identifier(net)))
+            declared.add(net)
+
+    fout.write("\n")
+    for function in t_blif.booleanfunctions:
+        expression = get_expression([get_identifier(net) for net in function.inputs], function.truthtable)
+        fout.write("    assign {} = {};\n".format(get_identifier(function.output), expression))
+
+    for latch in t_blif.latches:
+        output = get_identifier(latch.output)
+        data = get_identifier(latch.input)
+        control = get_identifier(clock if latch.control in (None, "NIL") else latch.control)
+        if latch.type == "fe":
+            fout.write("    always @(negedge {}) {} <= {};\n".format(control, output, data))
+        elif latch.type in ("ah", "al"):
+            condition = control if latch.type == "ah" else "!" + control
+            fout.write("    always @(*) if ({}) {} <= {};\n".format(condition, output, data))
+        elif latch.type == "as":
+            fout.write("    always @(*) {} <= {};\n".format(output, data))
+        else:
+            fout.write("    always @(posedge {}) {} <= {};\n".format(control, output, data))
+
+        if latch.initval in ("0", "1"):
+            fout.write("    initial {} = 1'b{};\n".format(output, latch.initval))
+
+    def write_instance(cell: str, instance: str, connections: List[str]) -> None:
+        fout.write("    {} {} ({});\n".format(get_identifier(cell), get_identifier(instance), ", ".join(connections)))
+
+    def get_connections(bindings: Dict[str, str]) -> List[str]:
+        return [".{}({})".format(get_identifier(formal), get_identifier(actual)) for formal, actual in bindings.items()]
+
+    for position, gate in enumerate(t_blif.gates):
+        write_instance(gate.name, get_instance_name("g", position, declared), get_connections(gate.bindings))
+
+    for position, mlatch in enumerate(t_blif.mlatches):
+        connections = get_connections(mlatch.bindings)
+        cell = t_blif.library.get(mlatch.name) if t_blif.library is not None else None
+        if cell is not None and cell.control is not None:
+            connections.append(".{}({})".format(get_identifier(cell.control.name), get_identifier(mlatch.control)))
+
+        write_instance(mlatch.name, get_instance_name("l", position, declared), connections)
+
+    for position, subckt in enumerate(t_blif.subcircuits):
+        bindings = dict(param.split("=", 1) for param in subckt.params if "=" in param)
+        write_instance(subckt.modelname, get_instance_name("s", position, declared), get_connections(bindings))
+
+    fout.write("endmodule\n")
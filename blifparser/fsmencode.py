@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+State encoding of the FSM described by the .start_kiss block:
+turns the transition table into latches (.latch) and boolean functions (.names).
+"""
+
+from typing import Dict, List, Optional, Sequence, Set
+
+try:
+    from .keywords.fsm import Fsm, TransitionTable
+    from .keywords.generic import Blif, Latch, Names
+except (ImportError, ModuleNotFoundError):
+    from keywords.fsm import Fsm, TransitionTable        # type: ignore
+    from keywords.generic import Blif, Latch, Names      # type: ignore
+
+ENCODINGS = ("auto", "code", "binary", "onehot")
+
+
+def get_state_order(t_fsm: Fsm, table: TransitionTable) -> List[str]:
+    """
+    Returns the states of the <t_fsm> FSM: the reset state first, then the others
+    in the order they appear in the transition table.
+    """
+    states = list(table.states)
+    if t_fsm.r and t_fsm.r.name in table.state_ids:
+        states.remove(t_fsm.r.name)
+        states.insert(0, t_fsm.r.name)
+
+    return states
+
+
+def get_encoding(t_fsm: Fsm, encoding: str = "auto") -> Dict[str, str]:
+    """
+    Returns the code of each state of the <t_fsm> FSM.
+
+    :param Fsm t_fsm: FSM to encode
+    :param str encoding: how to choose the codes
+        * "code": the codes of the .code keywords (all the states need one)
+        * "binary": the states are numbered (the reset state is all zeros)
+        * "onehot": one bit for each state (the reset state uses the first bit)
+        * "auto": "code" if the FSM has .code keywords, otherwise "binary"
+    :return dict codes: maps each state name to its code (like "01")
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError("'{}' is not a valid encoding (accepted values are {})".format(encoding, list(ENCODINGS)))
+
+    table = t_fsm.get_columns()
+    states = get_state_order(t_fsm, table)
+
+    if encoding == "auto":
+        encoding = "code" if t_fsm.statecodes else "binary"
+
+    codes: Dict[str, str] = {}
+    if encoding == "code":
+        codes = {code.state_name: code.state_encoding for code in t_fsm.statecodes}
+        for state in states:
+            if state not in codes:
+                raise ValueError("'{}' state has no .code state encoding".format(state))
+
+        if len({len(codes[state]) for state in states}) > 1:
+            raise ValueError("the .code state encodings don't have the same length")
+
+        if len({codes[state] for state in states}) != len(states):
+            raise ValueError("two states have the same .code state encoding")
+
+        codes = {state: codes[state] for state in states}
+
+    elif encoding == "binary":
+        num_bits = max(1, (len(states) - 1).bit_length())
+        codes = {state: "{:0{}b}".format(pos, num_bits) for pos, state in enumerate(states)}
+
+    else:
+        codes = {state: "0" * pos + "1" + "0" * (len(states) - pos - 1) for pos, state in enumerate(states)}
+
+    return codes
+
+
+def get_unique_name(name: str, used: Set[str]) -> str:
+    """
+    Returns <name> (adding underscores if needed) so that it is not in the <used> set, and adds it to the set.
+    """
+    while name in used:
+        name += "_"
+
+    used.add(name)
+    return name
+
+
+def get_covers(table: TransitionTable, state_cubes: Sequence[str], next_codes: Sequence[int],
+               num_bits: int, num_outputs: int) -> List[List[List[str]]]:
+    """
+    Returns the truth tables (ON-set rows) of the next state bits and of the outputs.
+
+    Each row of the transition table becomes the cube "<inputs><current state cube>".
+    For each function, the rows where it is "1" are collected as a bitset over the rows
+    (bit-parallel: a row is added to the bitsets of all its "1" bits at once),
+    then the cubes are read from the bitset.
+
+    :param list state_cubes: cube of the current state of each row (like "01" or "-1--")
+    :param list next_codes: code of the next state of each row (the first bit is the most significant one)
+    :return list covers: truth tables of the next state bits (first bit first) followed by the outputs
+    """
+    num_functions = num_bits + num_outputs
+    onsets = [0] * num_functions
+    for row_id in range(len(table)):
+        # all the functions that are "1" in this row, as a single integer
+        ones = next_codes[row_id] << num_outputs | (table.output_value[row_id] & table.output_care[row_id])
+        row_bit = 1 << row_id
+        while ones:
+            low = ones & -ones
+            ones ^= low
+            onsets[num_functions - low.bit_length()] |= row_bit
+
+    cubes = [table.inputs[row_id] + state_cubes[row_id] for row_id in range(len(table))]
+
+    covers: List[List[List[str]]] = []
+    for onset in onsets:
+        rows: Dict[str, None] = {}
+        while onset:
+            low = onset & -onset
+            onset ^= low
+            rows[cubes[low.bit_length() - 1]] = None
+
+        covers.append([list(cube) + ["1"] for cube in rows])
+
+    return covers
+
+
+def encode_fsm(t_blif: Blif, encoding: str = "auto", state_prefix: str = "state",
+               clock: Optional[str] = None) -> Dict[str, str]:
+    """
+    Replaces the FSM of the <t_blif> object with equivalent latches and boolean functions.
+
+    The inputs and outputs of the FSM are the first .i inputs and the first .o outputs of the model.
+    Each bit of the state code becomes a latch (its output is named "<state_prefix><bit>",
+    its input "<state_prefix><bit>_next"), initialized with the code of the reset state.
+    Don't care outputs and unspecified transitions become zeros.
+    > With the one-hot encoding the state bits only check the hot bit of the current state.
+
+    :param Blif t_blif: parsed BLIF file with an FSM (modified in place)
+    :param str encoding: how to choose the state codes (see get_encoding())
+    :param str state_prefix: prefix of the names of the state nets
+    :param str clock: clock of the latches (rising edge), if None the latches have no type and control
+    :return dict codes: the code of each state
+    """
+    t_fsm = t_blif.fsm
+    if not t_fsm.ispresent:
+        raise ValueError("the BLIF file doesn't contain an FSM")
+
+    t_fsm.is_valid()
+    table = t_fsm.get_columns()
+    if len(table) == 0:
+        raise ValueError("the FSM has no transitions: it can't be encoded")
+
+    num_inputs = int(t_fsm.i.num) if t_fsm.i else 0
+    num_outputs = int(t_fsm.o.num) if t_fsm.o else 0
+    inputs = t_blif.inputs.inputs if t_blif.inputs else []
+    outputs = t_blif.outputs.outputs if t_blif.outputs else []
+    if len(inputs) < num_inputs or len(outputs) < num_outputs:
+        raise ValueError("the model has less inputs or outputs than the FSM (.i and .o keywords)")
+
+    codes = get_encoding(t_fsm, encoding)
+    states = get_state_order(t_fsm, table)
+    num_bits = len(codes[states[0]])
+    onehot = encoding == "onehot"
+
+    # cube of each state when it is the current state
+    state_cubes = {}
+    for state, code in codes.items():
+        state_cubes[state] = "".join(char if char == "1" else "-" for char in code) if onehot else code
+
+    row_cubes = [state_cubes[table.states[state_id]] for state_id in table.current]
+    next_codes = [int(codes[table.states[state_id]], 2) for state_id in table.next]
+    covers = get_covers(table, row_cubes, next_codes, num_bits, num_outputs)
+
+    used = set(inputs) | set(outputs)
+    used.update(function.output for function in t_blif.booleanfunctions)
+    used.update(latch.output for latch in t_blif.latches)
+
+    reset_code = codes[states[0]]
+    state_nets = []
+    next_nets = []
+    for bit in range(num_bits):
+        state_nets.append(get_unique_name("{}{}".format(state_prefix, bit), used))
+        next_nets.append(get_unique_name("{}{}_next".format(state_prefix, bit), used))
+
+        params = [next_nets[bit], state_nets[bit]] + (["re", clock] if clock else []) + [reset_code[bit]]
+        t_blif.latches.append(Latch(" ".join(params)))
+
+    function_inputs = inputs[:num_inputs] + state_nets
+    for output, cover in zip(next_nets + outputs[:num_outputs], covers):
+        function = Names(" ".join(function_inputs + [output]), False)
+        function.truthtable = cover
+        t_blif.booleanfunctions.append(function)
+
+    t_blif.fsm = Fsm()
+    t_blif.invalidate_index()
+    return codes
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+State minimization of the FSM described by the .start_kiss block.
+
+The input cubes of the transition table are split into "letters": disjoint cubes
+such that each cube of the table either contains a letter or doesn't intersect it.
+The behavior of a state is then its next state and outputs for each letter.
+"""
+
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    from .keywords.fsm import Fsm, P, S, TransitionTable
+    from .minimize import Cube, contains, cube_to_string, intersects
+except (ImportError, ModuleNotFoundError):
+    from keywords.fsm import Fsm, P, S, TransitionTable              # type: ignore
+    from minimize import Cube, contains, cube_to_string, intersects  # type: ignore
+
+
+def get_letters(cubes: Sequence[Cube]) -> List[Cube]:
+    """
+    Splits the input space into disjoint cubes ("letters"): each of the <cubes> cubes
+    contains or doesn't intersect each letter. Letters that are not in any cube are dropped.
+    """
+    letters: List[Cube] = [(0, 0)]
+    for cube in set(cubes):
+        care, value = cube
+        split: List[Cube] = []
+        for letter in letters:
+            if not intersects(letter, cube) or contains(cube, letter):
+                split.append(letter)
+                continue
+
+            # disjoint sharp: the part of the letter outside the cube, one input at a time
+            letter_care, letter_value = letter
+            missing = care & ~letter_care
+            while missing:
+                bit = missing & -missing
+                missing ^= bit
+                split.append((letter_care | bit, letter_value | (~value & bit)))
+                letter_care |= bit
+                letter_value |= value & bit
+
+            split.append((letter_care, letter_value))
+
+        letters = split
+
+    return [letter for letter in letters if any(contains(cube, letter) for cube in cubes)]
+
+
+def merge_outputs(first: str, second: str) -> Optional[str]:
+    """
+    Returns the outputs that satisfy both <first> and <second> (like "1-" and "-0" -> "10"),
+    None if they conflict.
+    """
+    merged = []
+    for char1, char2 in zip(first, second):
+        if char1 == "-":
+            merged.append(char2)
+        elif char2 == "-" or char1 == char2:
+            merged.append(char1)
+        else:
+            return None
+
+    return "".join(merged)
+
+
+class Behavior:
+    def __init__(self, table: TransitionTable, letters: Sequence[Cube]) -> None:
+        """
+        Next state and outputs of each state for each letter.
+
+        Attributes:
+        * self.num_states: number of states
+        * self.num_letters: number of letters
+        * self.outputs: for each letter, list with the outputs of each state (None if the transition is not specified)
+            > when more rows of a state contain the letter, their outputs are merged
+        * self.next: for each letter, array with the next state of each state (-1 if not specified)
+        """
+        self.num_states = len(table.states)
+        self.num_letters = len(letters)
+        self.outputs: List[List[Optional[str]]] = []
+        self.next: List["array[int]"] = []
+
+        rows_by_state: List[List[int]] = [[] for _ in range(self.num_states)]
+        for row_id, state_id in enumerate(table.current):
+            rows_by_state[state_id].append(row_id)
+
+        for letter in letters:
+            letter_outputs: List[Optional[str]] = [None] * self.num_states
+            letter_next = array("i", [-1] * self.num_states)
+            for state_id, row_ids in enumerate(rows_by_state):
+                for row_id in row_ids:
+                    if not contains((table.input_care[row_id], table.input_value[row_id]), letter):
+                        continue
+
+                    # the FSM is deterministic: the rows have the same next state and compatible outputs
+                    known = letter_outputs[state_id]
+                    outputs = table.outputs[row_id]
+                    letter_outputs[state_id] = outputs if known is None else merge_outputs(known, outputs)
+                    letter_next[state_id] = table.next[row_id]
+
+            self.outputs.append(letter_outputs)
+            self.next.append(letter_next)
+
+    def is_complete(self, states: Sequence[int]) -> bool:
+        """
+        Returns True if the <states> states have a transition for every letter
+        and their outputs don't contain don't cares.
+        """
+        for letter_outputs in self.outputs:
+            for state_id in states:
+                outputs = letter_outputs[state_id]
+                if outputs is None or "-" in outputs:
+                    return False
+
+        return True
+
+    def get_reachable(self, start: int) -> List[int]:
+        """
+        Returns the states reachable from the <start> state (in breadth-first order).
+        """
+        seen = [False] * self.num_states
+        seen[start] = True
+        order = [start]
+        for state_id in order:
+            for letter_next in self.next:
+                next_id = letter_next[state_id]
+                if next_id != -1 and not seen[next_id]:
+                    seen[next_id] = True
+                    order.append(next_id)
+
+        return order
+
+
+def refine_partition(behavior: Behavior, block_of: List[int], states: Sequence[int]) -> List[int]:  # noqa: C901
+    """
+    Splits the blocks of the <block_of> partition (Hopcroft's algorithm) until the states
+    of each block go to the same block with every letter.
+    The machine needs to be completely specified.
+
+    :param list block_of: initial block of each state (-1 for the states to ignore)
+    :param list states: states to partition
+    :return list block_of: block of each state
+    """
+    members: List[List[int]] = []
+    for state_id in states:
+        block = block_of[state_id]
+        while len(members) <= block:
+            members.append([])
+
+        members[block].append(state_id)
+
+    # preimages[letter][state]: states that go to <state> with <letter>
+    preimages: List[List[List[int]]] = []
+    for letter_next in behavior.next:
+        letter_preimages: List[List[int]] = [[] for _ in range(behavior.num_states)]
+        for state_id in states:
+            letter_preimages[letter_next[state_id]].append(state_id)
+
+        preimages.append(letter_preimages)
+
+    pending: Deque[Tuple[int, int]] = deque()
+    for block in range(len(members)):
+        for letter in range(behavior.num_letters):
+            pending.append((block, letter))
+
+    while pending:
+        splitter, letter = pending.popleft()
+
+        marked: Dict[int, List[int]] = {}
+        for target in members[splitter]:
+            for state_id in preimages[letter][target]:
+                marked.setdefault(block_of[state_id], []).append(state_id)
+
+        for block, moved in marked.items():
+            if len(moved) == len(members[block]):
+                continue
+
+            moved_set = set(moved)
+            stay = [state_id for state_id in members[block] if state_id not in moved_set]
+
+            # the smaller part becomes the new block: only its splitters need to be processed
+            # (if the old block was still pending, both parts are pending)
+            small, large = (moved, stay) if len(moved) <= len(stay) else (stay, moved)
+            new_block = len(members)
+            members[block] = large
+            members.append(small)
+            for state_id in small:
+                block_of[state_id] = new_block
+
+            for next_letter in range(behavior.num_letters):
+                pending.append((new_block, next_letter))
+
+    return block_of
+
+
+def compatible_partition(behavior: Behavior, states: Sequence[int]) -> List[int]:  # noqa: C901
+    """
+    Groups the <states> states of an incompletely specified machine (heuristic).
+
+    The states are first added (in order) to the first group with compatible outputs
+    for every letter, then the groups are split until the specified next states
+    of each group are in the same group for every letter.
+
+    :return list block_of: block of each state (-1 for the states that are not in <states>)
+    """
+    block_of = [-1] * behavior.num_states
+    signatures: List[List[Optional[str]]] = []
+
+    for state_id in states:
+        outputs = [letter_outputs[state_id] for letter_outputs in behavior.outputs]
+
+        for block, signature in enumerate(signatures):
+            merged = []
+            for known, output in zip(signature, outputs):
+                if known is None or output is None:
+                    merged.append(known if output is None else output)
+                    continue
+
+                merged_output = merge_outputs(known, output)
+                if merged_output is None:
+                    break
+
+                merged.append(merged_output)
+            else:
+                signatures[block] = merged
+                block_of[state_id] = block
+                break
+        else:
+            block_of[state_id] = len(signatures)
+            signatures.append(outputs)
+
+    # closure: split the groups whose states go to different groups
+    num_blocks = len(signatures)
+    changed = True
+    while changed:
+        changed = False
+        members: Dict[int, List[int]] = {}
+        for state_id in states:
+            members.setdefault(block_of[state_id], []).append(state_id)
+
+        for block_members in members.values():
+            for letter_next in behavior.next:
+                groups: Dict[int, List[int]] = {}
+                for state_id in block_members:
+                    next_id = letter_next[state_id]
+                    if next_id != -1:
+                        groups.setdefault(block_of[next_id], []).append(state_id)
+
+                if len(groups) <= 1:
+                    continue
+
+                # the first group keeps the block (with the states without a transition)
+                for group in list(groups.values())[1:]:
+                    for state_id in group:
+                        block_of[state_id] = num_blocks
+
+                    num_blocks += 1
+
+                changed = True
+                break
+
+    return block_of
+
+
+def get_merged_rows(behavior: Behavior, letters: Sequence[Cube], num_inputs: int, states: Sequence[int],
+                    block_of: List[int], names: Sequence[str]) -> List[List[str]]:
+    """
+    Returns the transition table of the groups of merged states of an incompletely specified machine:
+    a row for each group and letter with a specified transition.
+
+    The outputs of the states of a group (already merged for each letter, see Behavior)
+    are merged again: a don't care takes the value required by any state of the group.
+
+    :param list block_of: group of each state (see compatible_partition())
+    :param list names: name of the group of each state
+    """
+    transitions: Dict[int, List[Tuple[int, Optional[str]]]] = {}
+    for state_id in states:
+        block_transitions = transitions.setdefault(block_of[state_id], [(-1, None)] * behavior.num_letters)
+        for letter in range(behavior.num_letters):
+            next_id = behavior.next[letter][state_id]
+            outputs = behavior.outputs[letter][state_id]
+            if next_id == -1 or outputs is None:
+                continue
+
+            known_next, known_outputs = block_transitions[letter]
+            if known_outputs is not None:
+                # the states of a group have compatible outputs and next states in the same group
+                outputs = merge_outputs(known_outputs, outputs) or known_outputs
+                next_id = known_next
+
+            block_transitions[letter] = (next_id, outputs)
+
+    rows: List[List[str]] = []
+    for state_id in states:
+        block_transitions = transitions.pop(block_of[state_id], [])
+        for letter, (next_id, outputs) in enumerate(block_transitions):
+            if outputs is not None:
+                rows.append([cube_to_string(letters[letter], num_inputs), names[state_id], names[next_id], outputs])
+
+    return rows
+
+
+def minimize_fsm(t_fsm: Fsm) -> Dict[str, str]:
+    """
+    Minimizes the number of states of the <t_fsm> FSM (modified in place).
+
+    The states that can't be reached from the reset state (.r keyword, the current state
+    of the first row if .r is not set) are removed.
+    Completely specified machines are minimized exactly with partition refinement,
+    machines with don't care outputs or unspecified transitions with a heuristic
+    that merges compatible states.
+
+    Each group of merged states keeps the name of one of its states (the reset state, if it is in the group).
+    The .s and .p keywords (if set) and the .code keywords are updated.
+
+    :param Fsm t_fsm: valid FSM (see Fsm.is_valid())
+    :return dict names: maps each (reachable) state to the name of the state that replaces it
+    """
+    t_fsm.is_valid()
+    if len(t_fsm.transtable) == 0:
+        return {}
+
+    table = t_fsm.get_columns()
+    letters = get_letters(list(zip(table.input_care, table.input_value)))
+    behavior = Behavior(table, letters)
+
+    reset_name = t_fsm.r.name if t_fsm.r else table.states[table.current[0]]
+    states = behavior.get_reachable(table.state_ids[reset_name])
+    # keep the order of the transition table (the reset state first)
+    reachable = set(states)
+    states = [table.state_ids[reset_name]] + [state_id for state_id in range(behavior.num_states)
+                                              if state_id in reachable and table.states[state_id] != reset_name]
+
+    complete = behavior.is_complete(states)
+    if complete:
+        # initial partition: same outputs for every letter
+        block_of = [-1] * behavior.num_states
+        blocks: Dict[Tuple[str, ...], int] = {}
+        for state_id in states:
+            signature = tuple(str(letter_outputs[state_id]) for letter_outputs in behavior.outputs)
+            block_of[state_id] = blocks.setdefault(signature, len(blocks))
+
+        block_of = refine_partition(behavior, block_of, states)
+    else:
+        block_of = compatible_partition(behavior, states)
+
+    # the first state of each block names the block
+    representatives: Dict[int, int] = {}
+    names: Dict[str, str] = {}
+    for state_id in states:
+        representative = representatives.setdefault(block_of[state_id], state_id)
+        names[table.states[state_id]] = table.states[representative]
+
+    kept: Set[str] = set(names.values())
+    transtable: List[List[str]] = []
+    if complete:
+        # equivalent states have the same transitions: only the ones of the representatives are needed
+        for row in t_fsm.transtable:
+            if row[1] in kept:
+                transtable.append([row[0], row[1], names[row[2]], row[3]])
+    else:
+        # the rows of the merged states can overlap: the groups get a row for each letter
+        group_names = [names.get(state, state) for state in table.states]
+        transtable = get_merged_rows(behavior, letters, len(t_fsm.transtable[0][0]), states, block_of, group_names)
+
+    t_fsm.transtable = transtable
+    t_fsm.statecodes = [code for code in t_fsm.statecodes if code.state_name in kept]
+    if t_fsm.s:
+        t_fsm.s = S(str(len(kept)))
+
+    if t_fsm.p:
+        t_fsm.p = P(str(len(transtable)))
+
+    return names
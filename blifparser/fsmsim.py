@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cycle-based simulation of the FSM described by the .start_kiss block.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+try:
+    from .keywords.fsm import Fsm
+except (ImportError, ModuleNotFoundError):
+    from keywords.fsm import Fsm  # type: ignore
+
+InputVector = Union[str, int, Sequence[int]]
+
+# maximum number of (state, inputs) combinations remembered by the simulator
+MAX_CACHE_SIZE = 1 << 20
+
+
+class FsmSimulator:
+    def __init__(self, t_fsm: Fsm) -> None:
+        """
+        Prepares the simulation of the <t_fsm> FSM (the FSM needs to be valid, see Fsm.is_valid()).
+
+        The simulation starts from the reset state (.r keyword, the current state
+        of the first row of the transition table if .r is not set).
+
+        Attributes:
+        * self.table: the transition table in columnar form (see Fsm.get_columns())
+        * self.num_inputs: number of inputs (.i keyword)
+        * self.reset_state: ID of the reset state
+        * self.state: ID of the current state
+        * self.rows_by_state: list with the rows of each state (the position is the state ID)
+            > each row is a (input care mask, input value mask, row ID) tuple
+        * self.cache: dictionary that maps (state ID, inputs) to the matching row (see find_row())
+        """
+        if len(t_fsm.transtable) == 0:
+            raise ValueError("the FSM has no transitions: it can't be simulated")
+
+        self.table = t_fsm.get_columns()
+        self.num_inputs = int(t_fsm.i.num) if t_fsm.i else len(t_fsm.transtable[0][0])
+
+        reset_name = t_fsm.r.name if t_fsm.r else t_fsm.transtable[0][1]
+        if reset_name not in self.table.state_ids:
+            raise ValueError("'{}' reset state is not in the transition table".format(reset_name))
+
+        self.reset_state = self.table.state_ids[reset_name]
+        self.state = self.reset_state
+
+        self.rows_by_state: List[List[Tuple[int, int, int]]] = [[] for _ in self.table.states]
+        for row_id, state_id in enumerate(self.table.current):
+            self.rows_by_state[state_id].append((self.table.input_care[row_id], self.table.input_value[row_id], row_id))
+
+        self.cache: Dict[int, int] = {}
+
+    def reset(self) -> None:
+        """
+        Goes back to the reset state.
+        """
+        self.state = self.reset_state
+
+    def get_state_name(self) -> str:
+        """
+        Returns the name of the current state.
+        """
+        return self.table.states[self.state]
+
+    def to_int(self, inputs: InputVector) -> int:
+        """
+        Returns the <inputs> input vector as an integer (the first input is the most significant bit).
+
+        :param inputs: string of "0" and "1" (like "011"), integer or sequence of 0/1 values (like a NumPy row)
+        """
+        if isinstance(inputs, int):
+            vector = inputs
+        elif isinstance(inputs, str):
+            if len(inputs) != self.num_inputs or inputs.strip("01") != "":
+                raise ValueError("'{}' is not a valid input vector "
+                                 "(expected {} '0' or '1' chars)".format(inputs, self.num_inputs))
+
+            vector = int(inputs or "0", 2)
+        else:
+            if len(inputs) != self.num_inputs:
+                raise ValueError("'{}' is not a valid input vector "
+                                 "(expected {} values)".format(list(inputs), self.num_inputs))
+
+            vector = 0
+            for value in inputs:
+                vector = vector << 1 | (1 if value else 0)
+
+        if vector < 0 or vector >> self.num_inputs:
+            raise ValueError("'{}' input vector has more than {} bits".format(vector, self.num_inputs))
+
+        return vector
+
+    def find_row(self, state: int, vector: int) -> int:
+        """
+        Returns the ID of the row of the <state> state that matches the <vector> inputs.
+
+        Only the rows of the current state are checked (with the care/value masks)
+        and the result is cached: the following cycles with the same state and inputs
+        need a single dictionary lookup.
+        """
+        key = state << self.num_inputs | vector
+        row_id = self.cache.get(key)
+        if row_id is not None:
+            return row_id
+
+        for care, value, candidate in self.rows_by_state[state]:
+            if vector & care == value:
+                if len(self.cache) < MAX_CACHE_SIZE:
+                    self.cache[key] = candidate
+
+                return candidate
+
+        raise ValueError("no transition of the '{}' state matches the '{:0{}b}' "
+                         "inputs".format(self.table.states[state], vector, self.num_inputs))
+
+    def step(self, inputs: InputVector) -> Tuple[str, str]:
+        """
+        Simulates one clock cycle.
+
+        :param inputs: input vector (see to_int())
+        :return tuple: (next state name, outputs of the transition like "01-")
+        """
+        row_id = self.find_row(self.state, self.to_int(inputs))
+        self.state = self.table.next[row_id]
+        return self.table.states[self.state], self.table.outputs[row_id]
+
+    def run(self, stream: Iterable[InputVector]) -> Iterator[Tuple[str, str]]:
+        """
+        Simulates one clock cycle for each input vector of the <stream> iterable
+        (from the current state).
+
+        :param stream: input vectors (see to_int()), like a generator or a 2D NumPy array
+        :return iterator: (next state name, outputs) for each cycle
+        """
+        states = self.table.states
+        next_states = self.table.next
+        outputs = self.table.outputs
+        find_row = self.find_row
+        to_int = self.to_int
+
+        state = self.state
+        try:
+            for inputs in stream:
+                row_id = find_row(state, to_int(inputs))
+                state = next_states[row_id]
+                yield states[state], outputs[row_id]
+        finally:
+            self.state = state
+
+
+def simulate(t_fsm: Fsm, stream: Iterable[InputVector]) -> Tuple[List[str], List[str]]:
+    """
+    Simulates the <t_fsm> FSM from its reset state.
+
+    :param Fsm t_fsm: FSM to simulate
+    :param stream: input vectors (see FsmSimulator.to_int())
+    :return tuple: (list of the states reached after each cycle, list of the outputs of each cycle)
+    """
+    states = []
+    outputs = []
+    for state, output in FsmSimulator(t_fsm).run(stream):
+        states.append(state)
+        outputs.append(output)
+
+    return states, outputs
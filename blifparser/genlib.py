@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Loader of genlib cell libraries, the libraries of the cells instantiated by .gate and .mlatch keywords.
+
+The cells are indexed by name and each library file is parsed once:
+load_library() returns the cached Library() object until the file changes.
+"""
+
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    from .keywords.generic import Names
+    from .keywords.mapped import Gate, MLatch
+except (ImportError, ModuleNotFoundError):
+    from keywords.generic import Names         # type: ignore
+    from keywords.mapped import Gate, MLatch   # type: ignore
+
+# ("var", position), ("const", value), ("not", operand), ("and", left, right) or ("or", left, right)
+Expression = Tuple[Union[str, int, "Expression"], ...]
+
+TOKEN_RE = re.compile(r"[()!*+&|']|[^\s()!*+&|'=;]+")
+WORD_RE = re.compile(r'"[^"]*"|;|[^\s;]+')
+
+
+class Pin:
+    def __init__(self, name: str, phase: str = "UNKNOWN", input_load: float = 0.0, max_load: float = 0.0,
+                 rise_block_delay: float = 0.0, rise_fanout_delay: float = 0.0,
+                 fall_block_delay: float = 0.0, fall_fanout_delay: float = 0.0) -> None:
+        """
+        Defines an input pin of a cell (PIN and CONTROL statements).
+
+        The delay from the pin to the output of the cell is <block delay> + <fanout delay> * load.
+        """
+        self.name = name
+        self.phase = phase
+        self.input_load = input_load
+        self.max_load = max_load
+        self.rise_block_delay = rise_block_delay
+        self.rise_fanout_delay = rise_fanout_delay
+        self.fall_block_delay = fall_block_delay
+        self.fall_fanout_delay = fall_fanout_delay
+
+    def get_delay(self, load: float = 0.0) -> float:
+        """
+        Returns the worst delay between rise and fall when the output drives the <load> load.
+        """
+        return max(self.rise_block_delay + self.rise_fanout_delay * load,
+                   self.fall_block_delay + self.fall_fanout_delay * load)
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return "Pin('{}', '{}')".format(self.name, self.phase)
+
+
+class Cell:
+    def __init__(self, name: str, area: float, function: str, is_latch: bool = False) -> None:
+        """
+        Defines a cell of the library (GATE and LATCH statements).
+
+        The function is an assignment like "O=!(a*b)": "!" and "'" (postfix) are the negation,
+        "*", "&" and juxtaposition are the AND, "+" and "|" are the OR, CONST0 and CONST1 are the constants.
+
+        Attributes:
+        * self.output: name of the output pin
+        * self.inputs: names of the input pins, in order of appearance in the function
+        * self.expression: parsed function of the inputs (see Expression)
+        * self.pins: dictionary that maps each input pin name to its Pin() object
+        * self.seq: (output, input, type) of the SEQ statement (only for latches)
+        * self.control: clock pin (CONTROL statement, only for latches)
+        * self.constraints: dictionary that maps each pin to its (setup, hold) times (CONSTRAINT statements)
+        """
+        self.name = name
+        self.area = area
+        self.function = function
+        self.is_latch = is_latch
+
+        if "=" not in function:
+            raise ValueError("the function of the '{}' cell needs to be an assignment (<output>=<expression>)".format(name))
+
+        output, expression = function.split("=", 1)
+        self.output = output.strip()
+        self.inputs: List[str] = []
+        self.expression = ExpressionParser(expression, self.inputs).parse()
+        self.pins = {pin: Pin(pin) for pin in self.inputs}
+        self.seq: Optional[Tuple[str, str, str]] = None
+        self.control: Optional[Pin] = None
+        self.constraints: Dict[str, Tuple[float, float]] = {}
+        self._truthtable: Optional[int] = None
+
+    def set_pin(self, pin: Pin) -> None:
+        """
+        Sets the timing of an input pin (the "*" pin sets all the input pins).
+        """
+        if pin.name == "*":
+            for name in self.inputs:
+                self.pins[name] = Pin(name, pin.phase, pin.input_load, pin.max_load,
+                                      pin.rise_block_delay, pin.rise_fanout_delay,
+                                      pin.fall_block_delay, pin.fall_fanout_delay)
+        elif pin.name in self.pins:
+            self.pins[pin.name] = pin
+        else:
+            raise ValueError("'{}' is not an input pin of the '{}' cell".format(pin.name, self.name))
+
+    def get_delay(self, load: float = 0.0) -> float:
+        """
+        Returns the worst delay from an input pin to the output when the output drives the <load> load.
+        """
+        return max((pin.get_delay(load) for pin in self.pins.values()), default=0.0)
+
+    def get_truthtable(self) -> int:
+        """
+        Returns the truth table of the function as an integer:
+        bit m is set if the function is true for the m-th input combination (first input = most significant bit).
+        """
+        if self._truthtable is None:
+            num_inputs = len(self.inputs)
+            patterns = []
+            for position in range(num_inputs):
+                shift = num_inputs - 1 - position
+                patterns.append(sum(1 << minterm for minterm in range(1 << num_inputs) if (minterm >> shift) & 1))
+
+            self._truthtable = evaluate(self.expression, patterns, (1 << (1 << num_inputs)) - 1)
+
+        return self._truthtable
+
+    def get_cover(self) -> List[List[str]]:
+        """
+        Returns the function as the truth table of a boolean function (one row for each true input combination).
+        """
+        num_inputs = len(self.inputs)
+        truthtable = self.get_truthtable()
+        cover = []
+        for minterm in range(1 << num_inputs):
+            if (truthtable >> minterm) & 1:
+                cover.append((list("{:0{}b}".format(minterm, num_inputs)) if num_inputs else []) + ["1"])
+
+        return cover
+
+    def get_nets(self, gate: Union[Gate, MLatch]) -> Tuple[List[str], List[str]]:
+        """
+        Resolves the <formal>=<actual> parameters of a .gate or .mlatch keyword that instantiates this cell.
+
+        :return tuple nets: (input nets in the order of self.inputs, output nets)
+            > the control of a .mlatch keyword is the last input net
+        """
+        for formal in gate.bindings:
+            if formal != self.output and formal not in self.pins:
+                raise ValueError("'{}' is not a pin of the '{}' cell".format(formal, self.name))
+
+        for formal in self.inputs + [self.output]:
+            if formal not in gate.bindings:
+                raise ValueError("the '{}' pin of the '{}' cell is not connected".format(formal, self.name))
+
+        inputs = [gate.bindings[formal] for formal in self.inputs]
+        if isinstance(gate, MLatch):
+            inputs.append(gate.control)
+
+        return inputs, [gate.bindings[self.output]]
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return "Cell('{}', {}, '{}')".format(self.name, self.area, self.function)
+
+
+class ExpressionParser:
+    def __init__(self, text: str, inputs: List[str]) -> None:
+        """
+        Recursive descent parser of the function of a cell.
+        The names of the variables are appended to <inputs> in order of appearance.
+        """
+        self.text = text
+        self.tokens = TOKEN_RE.findall(text)
+        self.position = 0
+        self.inputs = inputs
+
+    def peek(self) -> Optional[str]:
+        """Returns the next token (None at the end)."""
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse(self) -> Expression:
+        """Returns the parsed expression."""
+        expression = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError("unexpected '{}' in the '{}' function".format(self.peek(), self.text.strip()))
+
+        return expression
+
+    def parse_or(self) -> Expression:
+        expression = self.parse_and()
+        while self.peek() in ("+", "|"):
+            self.position += 1
+            expression = ("or", expression, self.parse_and())
+
+        return expression
+
+    def parse_and(self) -> Expression:
+        expression = self.parse_not()
+        while True:
+            token = self.peek()
+            if token in ("*", "&"):
+                self.position += 1
+            elif token is None or token in ("+", "|", ")", "'"):
+                return expression
+
+            expression = ("and", expression, self.parse_not())
+
+    def parse_not(self) -> Expression:
+        if self.peek() == "!":
+            self.position += 1
+            return ("not", self.parse_not())
+
+        expression = self.parse_operand()
+        while self.peek() == "'":
+            self.position += 1
+            expression = ("not", expression)
+
+        return expression
+
+    def parse_operand(self) -> Expression:
+        token = self.peek()
+        self.position += 1
+        if token is None or token in (")", "*", "&", "+", "|", "'"):
+            raise ValueError("incomplete or invalid '{}' function".format(self.text.strip()))
+
+        if token == "(":
+            expression = self.parse_or()
+            if self.peek() != ")":
+                raise ValueError("missing ')' in the '{}' function".format(self.text.strip()))
+            self.position += 1
+            return expression
+
+        if token in ("CONST0", "CONST1"):
+            return ("const", int(token == "CONST1"))
+
+        if token not in self.inputs:
+            self.inputs.append(token)
+
+        return ("var", self.inputs.index(token))
+
+
+def evaluate(expression: Expression, patterns: List[int], mask: int) -> int:
+    """
+    Evaluates the <expression> expression on all the input combinations at once:
+    each value is a bitset with a bit for each combination (<patterns> are the values of the variables).
+    """
+    operator = expression[0]
+    if operator == "var":
+        return patterns[expression[1]]  # type: ignore
+    if operator == "const":
+        return mask if expression[1] else 0
+    if operator == "not":
+        return mask & ~evaluate(expression[1], patterns, mask)  # type: ignore
+
+    left = evaluate(expression[1], patterns, mask)   # type: ignore
+    right = evaluate(expression[2], patterns, mask)  # type: ignore
+    return left & right if operator == "and" else left | right
+
+
+class Library:
+    def __init__(self, filepath: str = "") -> None:
+        """
+        Genlib library: the cells are indexed by name.
+
+        Attributes:
+        * self.filepath: path of the library file ("" if the library was not loaded from a file)
+        * self.cells: dictionary that maps each cell name to its Cell() object
+        """
+        self.filepath = filepath
+        self.cells: Dict[str, Cell] = {}
+
+    def add(self, cell: Cell) -> None:
+        """
+        Adds a cell to the library.
+        """
+        if cell.name in self.cells:
+            raise ValueError("the '{}' cell is defined more than once".format(cell.name))
+
+        self.cells[cell.name] = cell
+
+    def get(self, name: str) -> Optional[Cell]:
+        """
+        Returns the <name> cell (None if it is not in the library).
+        """
+        return self.cells.get(name)
+
+    def __getitem__(self, name: str) -> Cell:
+        return self.cells[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.cells
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[Cell]:
+        return iter(self.cells.values())
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return "Library('{}', {} cells)".format(self.filepath, len(self.cells))
+
+
+def parse_genlib(text: str, filepath: str = "") -> Library:  # noqa: C901
+    """
+    Parses the text of a genlib library.
+
+    :param str text: content of the library
+    :param str filepath: path of the library (stored in the Library() object)
+    :return Library library: the cells of the library
+    """
+    library = Library(filepath)
+    text = re.sub("#[^\n]*", "", text)
+    words = iter(word.strip('"') for word in WORD_RE.findall(text))
+    cell: Optional[Cell] = None
+
+    def get_fields(num_fields: int) -> List[str]:
+        fields = [next(words, None) for _ in range(num_fields)]
+        if None in fields:
+            raise ValueError("unexpected end of the library")
+        return fields  # type: ignore
+
+    def get_numbers(fields: List[str]) -> List[float]:
+        try:
+            return [float(field) for field in fields]
+        except ValueError:
+            raise ValueError("'{}' should be numbers".format(" ".join(fields)))
+
+    for word in words:
+        if word in ("GATE", "LATCH"):
+            name, area = get_fields(2)
+            function = []
+            for token in words:
+                if token == ";":
+                    break
+                function.append(token)
+            else:
+                raise ValueError("the function of the '{}' cell needs to end with ';'".format(name))
+
+            cell = Cell(name, get_numbers([area])[0], " ".join(function), word == "LATCH")
+            library.add(cell)
+            continue
+
+        if cell is None:
+            raise ValueError("'{}' needs to be after a GATE or LATCH statement".format(word))
+
+        if word == "PIN":
+            fields = get_fields(8)
+            cell.set_pin(Pin(fields[0], fields[1], *get_numbers(fields[2:])))
+        elif word == "CONTROL":
+            fields = get_fields(7)
+            cell.control = Pin(fields[0], "UNKNOWN", *get_numbers(fields[1:]))
+        elif word == "SEQ":
+            output, data, latch_type = get_fields(3)
+            cell.seq = (output, data, latch_type)
+        elif word == "CONSTRAINT":
+            fields = get_fields(3)
+            setup, hold = get_numbers(fields[1:])
+            cell.constraints[fields[0]] = (setup, hold)
+        else:
+            raise ValueError("unexpected '{}' in the library".format(word))
+
+    return library
+
+
+# maps the real path of each loaded library to ((modification time, size), library)
+_cache: Dict[str, Tuple[Tuple[int, int], Library]] = {}
+
+
+def load_library(filepath: str) -> Library:
+    """
+    Returns the library stored in the <filepath> genlib file.
+
+    The library is parsed only the first time and then cached:
+    it is parsed again only if the modification time or the size of the file change.
+    """
+    path = os.path.realpath(filepath)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with open(path) as fin:
+        library = parse_genlib(fin.read(), path)
+
+    _cache[path] = (key, library)
+    return library
+
+
+def clear_cache() -> None:
+    """
+    Forgets the libraries loaded by load_library().
+    """
+    _cache.clear()
+
+
+def gate_to_names(gate: Gate, library: Library) -> Names:
+    """
+    Returns a boolean function (.names) equivalent to the <gate> .gate keyword.
+    """
+    cell = library.get(gate.name)
+    if cell is None:
+        raise ValueError("the '{}' cell is not in the library".format(gate.name))
+
+    inputs, outputs = cell.get_nets(gate)
+    names = Names(" ".join(inputs + outputs), False)
+    names.truthtable = cell.get_cover()
+    return names
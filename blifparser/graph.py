@@ -1,37 +1,97 @@
-from typing import List, Optional
-
-import networkx as nx  # type: ignore
+from array import array
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, TextIO, Tuple
 
 try:
     from . import blifparser
     from .keywords.generic import Blif
+    from .netlist import get_topological_levels
 except (ImportError, ModuleNotFoundError):
-    import blifparser                  # type: ignore
-    from keywords.generic import Blif  # type: ignore
+    import blifparser                             # type: ignore
+    from keywords.generic import Blif             # type: ignore
+    from netlist import get_topological_levels    # type: ignore
 
 
 class Graph:
-    def __init__(self, nx_graph: nx.DiGraph, longest_label: int, max_inputs: int):
+    def __init__(self, nodes: List["Node"], offsets: "array[int]", targets: "array[int]",
+                 labels: List[str], longest_label: int, max_inputs: int):
         """
-        Memorizes the networkx graph, 
+        Memorizes the graph as compact adjacency arrays (CSR),
         the longest_label length, and the max_inputs number.
+
+        The edges that leave the self.nodes[i] node are the ones
+        between the self.offsets[i] and self.offsets[i + 1] positions of:
+        * self.targets: position (in self.nodes) of the node reached by the edge
+        * self.labels: name of the net that connects the two nodes
+
+        The networkx graph is only created (and networkx imported)
+        when the nx_graph attribute is used.
         """
-        self.nx_graph = nx_graph
+        self.nodes = nodes
+        self.offsets = offsets
+        self.targets = targets
+        self.labels = labels
         self.longest_label = longest_label
         self.max_inputs = max_inputs
+        self._nx_graph: Any = None
+
+    @property
+    def nx_graph(self) -> Any:
+        """
+        networkx.DiGraph version of the graph (created on first use).
+        """
+        if self._nx_graph is None:
+            self._nx_graph = self.to_networkx()
+
+        return self._nx_graph
+
+    def to_networkx(self) -> Any:
+        """
+        Returns the graph as a networkx.DiGraph object:
+        the nodes are the Node() objects and each edge has the net name as "label".
+        """
+        import networkx as nx  # type: ignore
+
+        G = nx.DiGraph()
+        G.add_nodes_from(self.nodes)
+        for n1, n2, label in self.edges():
+            G.add_edge(n1, n2, label=label)
+
+        return G
+
+    def successors(self, node_pos: int) -> "array[int]":
+        """
+        Returns the positions of the nodes reached by the edges that leave the <node_pos> node.
+        """
+        return self.targets[self.offsets[node_pos]:self.offsets[node_pos + 1]]
+
+    def edges(self) -> Iterator[Tuple["Node", "Node", str]]:
+        """
+        Yields the edges of the graph as (source node, destination node, net name) tuples.
+        """
+        for node_pos, node in enumerate(self.nodes):
+            for edge_pos in range(self.offsets[node_pos], self.offsets[node_pos + 1]):
+                yield node, self.nodes[self.targets[edge_pos]], self.labels[edge_pos]
+
+    def num_edges(self) -> int:
+        """
+        Returns the number of edges.
+        """
+        return len(self.targets)
 
 
 class Node:
-    progressive_id = 1  # makes sure that each id is unique
-    def __init__(self) -> None:
+    def __init__(self, node_id: int = -1) -> None:
         """
         Defines a node.
 
         A node has:
-        * a type: input, output, boolean_function, latch
-        * an id: identifies the node in a graph
-        > Note: the id is a progressive integer. 
-        > The variable that controls that progressive integer is shared between Node instances.
+        * a type: input, output, boolean_function, latch, subckt, gate, mlatch, cluster
+        * an id: identifies the node in a graph (-1 if it is not set)
+        > Note: the id is assigned by the function that builds the graph:
+        > it only depends on the position of the item in the netlist (see make_nodes())
+        * a key: identifies the item of the netlist represented by the node (like "latch:<output>")
+        > Note: unlike the id, the key doesn't change when other items are added to/removed from the netlist
+        * a size: number of nodes it represents (more than one for the "cluster" nodes)
 
         A node can have:
         * many inputs
@@ -41,12 +101,13 @@ class Node:
         self.inputs: List[str] = []
         self.outputs: List[str] = []
         self.type: Optional[str] = None
-        self.id = Node.progressive_id
+        self.id = node_id
+        self.key: Optional[str] = None
         self.node_color: str = "black"
-        self.name: Optional[str] = None
+        self.name: Optional[str] = str(node_id) if node_id != -1 else None
+        self.model: Optional[str] = None
+        self.size: int = 1
 
-        Node.progressive_id += 1  # makes sure that each id is unique
-    
     def __str__(self) -> str:
         """
         Returns the Node's id as a string
@@ -54,101 +115,370 @@ class Node:
         return str(self.id)
 
 
-def parse_blif(t_blif: Blif) -> Graph:
+def parse_blif(t_blif: Blif, load_blif: Optional[Callable[[str], Blif]] = None) -> Graph:
     """
     Parses a Blif obect to create a graph.
+
+    <load_blif> returns the Blif object of a .search-ed file (see make_subckt_nodes()).
     """
     # prepare nodes objects
-    nodes = make_nodes(t_blif)
+    nodes = make_nodes(t_blif, load_blif)
 
-    # add the nodes to a directed graph
-    G = nx.DiGraph()
-    G.add_nodes_from(nodes)
+    # index the nodes that read each net
+    sinks: Dict[str, List[int]] = {}
+    for node_pos, node in enumerate(nodes):
+        for node_input in dict.fromkeys(node.inputs):
+            sinks.setdefault(node_input, []).append(node_pos)
 
     # connect nodes together and keep some statistics
+    offsets = array("i", [0])
+    targets = array("i")
+    labels: List[str] = []
     longest_label = 1
     max_inputs = 1
-    for n1 in nodes:
-        for n2 in nodes:
-            for n1_output in n1.outputs:
-                for n2_input in n2.inputs:
-                    if n1_output == n2_input:
-                        # n1 --> n2
-                        G.add_edge(n1, n2, label=n1_output)
+    for node in nodes:
+        for node_output in node.outputs:
+            # node --> sink
+            for sink in sinks.get(node_output, []):
+                targets.append(sink)
+                labels.append(node_output)
+
+            # save stats to scale the image
+            if len(node.inputs) > max_inputs:
+                max_inputs = len(node.inputs)
+
+            if len(node_output) > longest_label:
+                longest_label = len(node_output)
+
+        offsets.append(len(targets))
+
+    return Graph(nodes, offsets, targets, labels, longest_label, max_inputs)
+
+
+def get_levels(t_graph: Graph) -> List[int]:
+    """
+    Returns the level of each node of the <t_graph> graph (in the same order of t_graph.nodes).
+
+    Inputs, latches (.latch and .mlatch) and sub-circuits are level 0 nodes,
+    the other nodes are one level above their deepest predecessor
+    (-1 for the nodes that are part of, or depend on, a combinational loop).
+    """
+    sources = [node.type in ("input", "latch", "mlatch", "subckt") for node in t_graph.nodes]
+    return get_topological_levels(sources, t_graph.successors)[1]
+
+
+def get_ffr_roots(t_graph: Graph) -> List[int]:
+    """
+    Returns the root of the fanout-free region of each node of the <t_graph> graph.
 
-                # save stats to scale the image
-                if len(n1.inputs) > max_inputs:
-                    max_inputs = len(n1.inputs)
+    A boolean function with exactly one successor, which is also a boolean function,
+    belongs to the region of its successor: every other node is the root of its own region.
+    """
+    num_nodes = len(t_graph.nodes)
+    roots = [-1] * num_nodes
+
+    for start in range(num_nodes):
+        # follow the chain of single successors until a known root is found
+        chain = []
+        in_chain = set()
+        node_pos = start
+        while roots[node_pos] == -1 and node_pos not in in_chain:
+            chain.append(node_pos)
+            in_chain.add(node_pos)
+            successors = set(t_graph.successors(node_pos))
+            if t_graph.nodes[node_pos].type != "boolean_function" or len(successors) != 1:
+                break
+
+            successor = successors.pop()
+            if t_graph.nodes[successor].type != "boolean_function":
+                break
+
+            node_pos = successor
+
+        root = roots[node_pos] if roots[node_pos] != -1 else chain[-1]
+        for chain_pos in chain:
+            roots[chain_pos] = root
+
+    return roots
+
+
+def cluster(t_graph: Graph, mode: str) -> Graph:  # noqa: C901
+    """
+    Returns a smaller graph where groups of nodes of the <t_graph> graph
+    are collapsed into "cluster" nodes.
+
+    Supported modes:
+    * "subckt": one node for all the instances of the same sub-circuit model
+    * "ffr": one node for each fanout-free region of boolean functions
+    * "level": one node for each level (see get_levels())
+
+    The edges between two clusters are merged into one edge, labeled with
+    the net name (or with the number of nets, if there is more than one).
+    """
+    keys: List[Hashable]
+    ffr_roots: List[int] = []
+    if mode == "subckt":
+        keys = [("subckt", node.model) if node.type == "subckt" else node_pos
+                for node_pos, node in enumerate(t_graph.nodes)]
+    elif mode == "ffr":
+        ffr_roots = get_ffr_roots(t_graph)
+        keys = list(ffr_roots)
+    elif mode == "level":
+        keys = list(get_levels(t_graph))
+    else:
+        raise ValueError("unknown cluster mode '{}' (accepted modes are 'subckt', 'ffr' and 'level')".format(mode))
+
+    # group the nodes
+    members: Dict[Hashable, List[int]] = {}
+    for node_pos, key in enumerate(keys):
+        members.setdefault(key, []).append(node_pos)
+
+    nodes: List[Node] = []
+    cluster_pos: Dict[Hashable, int] = {}
+    for key, positions in members.items():
+        cluster_pos[key] = len(nodes)
+        if len(positions) == 1:
+            nodes.append(t_graph.nodes[positions[0]])
+            continue
+
+        n = Node(len(t_graph.nodes) + len(nodes) + 1)
+        n.type = "cluster"
+        n.key = "cluster:" + str(t_graph.nodes[positions[0]].key)
+        n.size = sum(t_graph.nodes[node_pos].size for node_pos in positions)
+        if mode == "subckt":
+            n.name = "{} ({} instances)".format(t_graph.nodes[positions[0]].model, len(positions))
+        elif mode == "ffr":
+            n.name = "region of {} ({} nodes)".format(t_graph.nodes[ffr_roots[positions[0]]].name, len(positions))
+        else:
+            n.name = "level {} ({} nodes)".format(key, len(positions))
+
+        for node_pos in positions:
+            n.inputs.extend(t_graph.nodes[node_pos].inputs)
+            n.outputs.extend(t_graph.nodes[node_pos].outputs)
+
+        nodes.append(n)
+
+    # merge the edges between clusters
+    cluster_edges: List[Dict[int, List[str]]] = [{} for _ in nodes]
+    for node_pos in range(len(t_graph.nodes)):
+        source = cluster_pos[keys[node_pos]]
+        for edge_pos in range(t_graph.offsets[node_pos], t_graph.offsets[node_pos + 1]):
+            target = cluster_pos[keys[t_graph.targets[edge_pos]]]
+            if source != target:
+                cluster_edges[source].setdefault(target, []).append(t_graph.labels[edge_pos])
+
+    offsets = array("i", [0])
+    targets = array("i")
+    labels: List[str] = []
+    for edges in cluster_edges:
+        for target, nets in edges.items():
+            nets = list(dict.fromkeys(nets))
+            targets.append(target)
+            labels.append(nets[0] if len(nets) == 1 else "{} nets".format(len(nets)))
 
-                if len(n1_output) > longest_label:
-                    longest_label = len(n1_output)
+        offsets.append(len(targets))
 
-    return Graph(G, longest_label, max_inputs)
+    return Graph(nodes, offsets, targets, labels, t_graph.longest_label, t_graph.max_inputs)
 
 
-def make_nodes(t_blif: Blif) -> List[Node]:
+def write_dot(t_graph: Graph, fout: TextIO) -> None:
+    """
+    Writes the <t_graph> graph in the DOT format (Graphviz) to the <fout> file object.
+
+    Nodes and edges are written one at a time: the whole text is never kept in memory.
+    """
+    def quote(text: str) -> str:
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    fout.write("digraph blif {\n")
+    for node_pos, node in enumerate(t_graph.nodes):
+        attributes = (quote(str(node.name)), quote(str(node.type)), quote(node.node_color))
+        fout.write("  n{} [label={}, type={}, color={}];\n".format(node_pos, *attributes))
+
+    for node_pos in range(len(t_graph.nodes)):
+        for edge_pos in range(t_graph.offsets[node_pos], t_graph.offsets[node_pos + 1]):
+            label = quote(t_graph.labels[edge_pos])
+            fout.write("  n{} -> n{} [label={}];\n".format(node_pos, t_graph.targets[edge_pos], label))
+
+    fout.write("}\n")
+
+
+def write_graphml(t_graph: Graph, fout: TextIO) -> None:
+    """
+    Writes the <t_graph> graph in the GraphML format to the <fout> file object.
+
+    Nodes and edges are written one at a time: the whole text is never kept in memory.
+    """
+    # imported here: xml.sax imports urllib, which slows down "import graph"
+    from xml.sax.saxutils import escape
+
+    fout.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    fout.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    fout.write('  <key id="name" for="node" attr.name="name" attr.type="string"/>\n')
+    fout.write('  <key id="type" for="node" attr.name="type" attr.type="string"/>\n')
+    fout.write('  <key id="color" for="node" attr.name="color" attr.type="string"/>\n')
+    fout.write('  <key id="size" for="node" attr.name="size" attr.type="int"/>\n')
+    fout.write('  <key id="label" for="edge" attr.name="label" attr.type="string"/>\n')
+    fout.write('  <graph id="blif" edgedefault="directed">\n')
+
+    for node_pos, node in enumerate(t_graph.nodes):
+        fout.write('    <node id="n{}"><data key="name">{}</data><data key="type">{}</data>'
+                   '<data key="color">{}</data><data key="size">{}</data></node>\n'.format(
+                       node_pos, escape(str(node.name)), escape(str(node.type)), escape(node.node_color), node.size))
+
+    for node_pos in range(len(t_graph.nodes)):
+        for edge_pos in range(t_graph.offsets[node_pos], t_graph.offsets[node_pos + 1]):
+            fout.write('    <edge source="n{}" target="n{}"><data key="label">{}</data></edge>\n'.format(
+                node_pos, t_graph.targets[edge_pos], escape(t_graph.labels[edge_pos])))
+
+    fout.write("  </graph>\n")
+    fout.write("</graphml>\n")
+
+
+def make_nodes(t_blif: Blif, load_blif: Optional[Callable[[str], Blif]] = None) -> List[Node]:
     """
     Creates nodes that are not binded to each other
     but with the necessary information to bind them later.
 
-    TODO: maybe divide this into 5 functions? (one for each type of node)
+    The ids are assigned in this order (starting from 1): inputs, outputs,
+    boolean functions, latches, sub-circuits, gates and mapped latches, so each group of nodes can also be
+    created separately (even by another process) with the same ids using the
+    make_*_nodes() functions and get_first_ids().
     """
-    nodes = []
+    first_ids = get_first_ids(t_blif)
+
+    nodes = make_input_nodes(t_blif, first_ids["input"])
+    nodes += make_output_nodes(t_blif, first_ids["output"])
+    nodes += make_function_nodes(t_blif, first_ids["boolean_function"])
+    nodes += make_latch_nodes(t_blif, first_ids["latch"])
+    nodes += make_subckt_nodes(t_blif, first_ids["subckt"], load_blif)
+    nodes += make_gate_nodes(t_blif, first_ids["gate"])
+    nodes += make_mlatch_nodes(t_blif, first_ids["mlatch"])
 
-    # blif inputs (.inputs) are nodes that have one output: the input value
+    return nodes
+
+
+def get_first_ids(t_blif: Blif) -> Dict[str, int]:
+    """
+    Returns the id of the first node of each type (input, output, boolean_function, latch, subckt, gate, mlatch).
+    """
+    first_ids = {}
+    node_id = 1
+    for node_type, count in (("input", len(t_blif.inputs.inputs) if t_blif.inputs else 0),
+                             ("output", len(t_blif.outputs.outputs) if t_blif.outputs else 0),
+                             ("boolean_function", len(t_blif.booleanfunctions)),
+                             ("latch", len(t_blif.latches)),
+                             ("subckt", len(t_blif.subcircuits)),
+                             ("gate", len(t_blif.gates)),
+                             ("mlatch", len(t_blif.mlatches))):
+        first_ids[node_type] = node_id
+        node_id += count
+
+    return first_ids
+
+
+def make_input_nodes(t_blif: Blif, first_id: int) -> List[Node]:
+    """
+    Creates the nodes of the blif inputs (.inputs): they have one output, the input value.
+    """
+    nodes = []
     if t_blif.inputs:
-        for input in t_blif.inputs.inputs:
-            n = Node()
+        for node_id, input in enumerate(t_blif.inputs.inputs, first_id):
+            n = Node(node_id)
             n.outputs.append(input)
             n.type = "input"
-            n.name = str(n.id)
+            n.key = "input:" + input
             n.node_color = "red"
             nodes.append(n)
-    
-    # blif outputs (.outputs) are nodes that have one input: the output value
+
+    return nodes
+
+
+def make_output_nodes(t_blif: Blif, first_id: int) -> List[Node]:
+    """
+    Creates the nodes of the blif outputs (.outputs): they have one input, the output value.
+    """
+    nodes = []
     if t_blif.outputs:
-        for output in t_blif.outputs.outputs:
-            n = Node()
+        for node_id, output in enumerate(t_blif.outputs.outputs, first_id):
+            n = Node(node_id)
             n.inputs.append(output)
             n.type = "output"
-            n.name = str(n.id)
+            n.key = "output:" + output
             n.node_color = "blue"
             nodes.append(n)
 
-    # blif boolean functions, defined using .names arg1 arg2 ...
-    # have one output and might have multiple inputs
-    for function in t_blif.booleanfunctions:
-        n = Node()
+    return nodes
+
+
+def make_function_nodes(t_blif: Blif, first_id: int) -> List[Node]:
+    """
+    Creates the nodes of the blif boolean functions, defined using .names arg1 arg2 ...:
+    they have one output and might have multiple inputs.
+    """
+    nodes = []
+    for node_id, function in enumerate(t_blif.booleanfunctions, first_id):
+        n = Node(node_id)
 
         # collect the inputs
         for input in function.inputs:
             n.inputs.append(input)
-        
+
         n.outputs.append(function.output)
         n.type = "boolean_function"
-        n.name = str(n.id)
+        n.key = ("exdc:" if function.is_dontcare else "names:") + function.output
         nodes.append(n)
-    
-    # blif latches (.latch) have one input and one output
-    for latch in t_blif.latches:
-        n = Node()
+
+    return nodes
+
+
+def make_latch_nodes(t_blif: Blif, first_id: int) -> List[Node]:
+    """
+    Creates the nodes of the blif latches (.latch): they have one input and one output.
+    """
+    nodes = []
+    for node_id, latch in enumerate(t_blif.latches, first_id):
+        n = Node(node_id)
         n.inputs.append(latch.input)
         n.outputs.append(latch.output)
         n.type = "latch"
-        n.name = str(n.id)
+        n.key = "latch:" + latch.output
         nodes.append(n)
-    
-    # blif sub-circuits (.subckt) might have multiple inputs and/or multiple outputs.
-    # > to distinguish inputs from outputs it is necessary to parse imported (.search) modules
-    for subckt in t_blif.subcircuits:
-        n = Node()
-        
-        # loop for each imported file
+
+    return nodes
+
+
+def parse_file(filepath: str) -> Blif:
+    """
+    Parses the <filepath> BLIF file and returns its Blif object.
+    """
+    return blifparser.BlifParser(filepath).blif
+
+
+def make_subckt_nodes(t_blif: Blif, first_id: int,  # noqa: C901
+                      load_blif: Optional[Callable[[str], Blif]] = None) -> List[Node]:
+    """
+    Creates the nodes of the blif sub-circuits (.subckt): they might have multiple inputs and/or multiple outputs.
+    > to distinguish inputs from outputs it is necessary to parse imported (.search) modules
+
+    <load_blif> is called with the path of each .search-ed file and returns its Blif object
+    (by default the file is parsed with BlifParser(): a caller can pass a function that reuses parsed files).
+    """
+    if load_blif is None:
+        load_blif = parse_file
+
+    # parse each imported file once
+    imported_blifs = []
+    if t_blif.subcircuits:
         for imported_blif in t_blif.imports:
-            filepath = imported_blif.filepath
-            parser = blifparser.BlifParser(filepath)
-            subckt_data = parser.blif
+            imported_blifs.append(load_blif(imported_blif.filepath))
 
+    nodes = []
+    for node_id, subckt in enumerate(t_blif.subcircuits, first_id):
+        n = Node(node_id)
+
+        # loop for each imported file
+        for subckt_data in imported_blifs:
             # check if we have found the .model referenced by .subckt
             if subckt_data.model and subckt.modelname == subckt_data.model.name:
                 # loop for each input (.inputs) of the .model inside the .search-ed file
@@ -161,7 +491,7 @@ def make_nodes(t_blif: Blif) -> List[Node]:
                             # that means that the parameter is an input of the sub-circuit
                             if model_input == subckt_input:
                                 n.inputs.append(subckt_param.split("=")[1])
-                
+
                 # loop for each output (.outputs) of the .model inside the .search-ed file
                 if subckt_data.outputs:
                     for model_output in subckt_data.outputs.outputs:
@@ -172,23 +502,44 @@ def make_nodes(t_blif: Blif) -> List[Node]:
                             # that means that the parameter is an output of the sub-circuit
                             if model_output == subckt_output:
                                 n.outputs.append(subckt_param.split("=")[1])
-        
+
         n.type = "subckt"
-        n.name = str(n.id)
+        n.model = subckt.modelname
+        n.key = "subckt:" + subckt.modelname + ":" + " ".join(subckt.params)
         nodes.append(n)
 
     return nodes
 
 
-if __name__ == "__main__":
-    a = Node()
-    print("A: ", a.__dict__)
+def make_gate_nodes(t_blif: Blif, first_id: int) -> List[Node]:
+    """
+    Creates the nodes of the blif gates (.gate): they have one output and might have multiple inputs
+    (see Blif.get_mapped_nets()).
+    """
+    nodes = []
+    for node_id, gate in enumerate(t_blif.gates, first_id):
+        n = Node(node_id)
+        n.inputs, n.outputs = t_blif.get_mapped_nets(gate)
+        n.type = "gate"
+        n.model = gate.name
+        n.key = "gate:" + " ".join(n.outputs)
+        nodes.append(n)
+
+    return nodes
+
 
-    b = Node()
-    print("B: ", b.__dict__)
-    print("A: ", a.__dict__)
+def make_mlatch_nodes(t_blif: Blif, first_id: int) -> List[Node]:
+    """
+    Creates the nodes of the blif mapped latches (.mlatch): the inputs are the data pins and the control
+    (see Blif.get_mapped_nets()).
+    """
+    nodes = []
+    for node_id, mlatch in enumerate(t_blif.mlatches, first_id):
+        n = Node(node_id)
+        n.inputs, n.outputs = t_blif.get_mapped_nets(mlatch)
+        n.type = "mlatch"
+        n.model = mlatch.name
+        n.key = "mlatch:" + " ".join(n.outputs)
+        nodes.append(n)
 
-    c = Node()
-    print("C: ", c.__dict__)
-    print("B: ", b.__dict__)
-    print("A: ", a.__dict__)
+    return nodes
@@ -1,3 +1,6 @@
+from . import diagnostics
 from . import fsm
 from . import generic
+from . import mapped
 from . import subfiles
+from . import timing
@@ -0,0 +1,146 @@
+from typing import Any, Iterable, List, Optional, Sequence, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from typing import SupportsIndex
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class Diagnostic:
+    __slots__ = ("code", "template", "args", "line", "severity", "obj")
+
+    def __init__(self, code: str, template: str, args: Sequence[Any] = (), line: Optional[int] = None,
+                 severity: str = ERROR, obj: Any = None) -> None:
+        """
+        Defines a problem found in the BLIF file.
+
+        The text is formatted only when it is needed (see the text property):
+        <template> is formatted with the <args> arguments and the "line" keyword argument.
+
+        Attributes:
+        * self.code: identifier of the kind of problem (like "invalid-keyword")
+        * self.template: format string of the text
+        * self.args: arguments of the format string
+        * self.line: line of the file (None if it is not known)
+        * self.severity: ERROR or WARNING
+        * self.obj: object with the problem (like a Names() object), None if there is no object
+        """
+        self.code = code
+        self.template = template
+        self.args = tuple(args)
+        self.line = line
+        self.severity = severity
+        self.obj = obj
+
+    @property
+    def text(self) -> str:
+        """Formatted text of the problem."""
+        return self.template.format(*self.args, line="unknown" if self.line is None else self.line)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Diagnostics are equal to other diagnostics with the same code, line and text,
+        and to strings with the same text.
+        """
+        if isinstance(other, str):
+            return self.text == other
+
+        if isinstance(other, Diagnostic):
+            return (self.code, self.line, self.text) == (other.code, other.line, other.text)
+
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return "Diagnostic('{}', line={}, severity='{}')".format(self.code, self.line, self.severity)
+
+    def __str__(self) -> str:
+        """Printed string."""
+        return self.text
+
+
+class TooManyErrors(Exception):
+    def __init__(self, num_errors: int) -> None:
+        """
+        Raised by Diagnostics.add() when the maximum number of errors is reached.
+        """
+        super().__init__("parsing stopped after {} errors".format(num_errors))
+        self.num_errors = num_errors
+
+
+class Diagnostics(List[Diagnostic]):
+    def __init__(self, items: Iterable[Union[str, Diagnostic]] = (),
+                 max_errors: Optional[int] = None, fail_fast: bool = False) -> None:
+        """
+        List of the problems found in a BLIF file (Diagnostic() objects).
+
+        Attributes:
+        * self.max_errors: if set, add() raises TooManyErrors() when this number of errors is reached
+        * self.fail_fast: if True, add() raises TooManyErrors() at the first error
+        * self.num_errors: number of problems with the ERROR severity
+        * self.stopped: True if TooManyErrors() was raised
+        """
+        super().__init__()
+        self.max_errors = max_errors
+        self.fail_fast = fail_fast
+        self.num_errors = 0
+        self.stopped = False
+
+        for item in items:
+            self.append(item)
+
+    def add(self, code: str, template: str, *args: Any, line: Optional[int] = None,
+            severity: str = ERROR, obj: Any = None) -> Diagnostic:
+        """
+        Adds a problem (see Diagnostic()) and returns it.
+
+        If the maximum number of errors is reached (or at the first error, in fail fast mode)
+        TooManyErrors() is raised after the problem is added.
+        """
+        diagnostic = Diagnostic(code, template, args, line, severity, obj)
+        self.insert(len(self), diagnostic)
+        return diagnostic
+
+    def insert(self, index: "SupportsIndex", item: Union[str, Diagnostic]) -> None:
+        """
+        Inserts a Diagnostic() object or an already formatted string (as an error with the "custom" code)
+        at the <index> position.
+
+        The errors are counted (and TooManyErrors() is raised) like in add().
+        """
+        diagnostic = item if isinstance(item, Diagnostic) else Diagnostic("custom", "{}", (item,))
+        super().insert(index, diagnostic)
+
+        if diagnostic.severity == ERROR:
+            self.num_errors += 1
+            if self.fail_fast or (self.max_errors is not None and self.num_errors >= self.max_errors):
+                self.stopped = True
+                raise TooManyErrors(self.num_errors)
+
+    def append(self, item: Union[str, Diagnostic]) -> None:
+        """
+        Adds a Diagnostic() object or an already formatted string (see insert()).
+        """
+        self.insert(len(self), item)
+
+    def extend(self, items: Iterable[Union[str, Diagnostic]]) -> None:
+        """
+        Adds each Diagnostic() object or formatted string of <items> (see insert()).
+        """
+        for item in items:
+            self.append(item)
+
+    def get_errors(self) -> List[Diagnostic]:
+        """
+        Returns the problems with the ERROR severity.
+        """
+        return [diagnostic for diagnostic in self if diagnostic.severity == ERROR]
+
+    def get_texts(self) -> List[str]:
+        """
+        Returns the text of each problem.
+        """
+        return [diagnostic.text for diagnostic in self]
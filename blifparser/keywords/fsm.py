@@ -1,4 +1,11 @@
-from typing import List, Set, Optional
+import re
+from array import array
+from itertools import chain
+from typing import Dict, List, Set, Optional, Tuple
+
+# translation tables used to turn "0", "1", "-" strings into bitmasks
+_CARE_TABLE = str.maketrans("01-", "110")
+_VALUE_TABLE = str.maketrans("01-", "010")
 
 
 class Fsm:
@@ -40,6 +47,7 @@ class Fsm:
 
         # Check transition table
         self.validate_transtable()
+        self.validate_determinism()
 
         # Check .p, .s, .r keywords
         self.validate_p()
@@ -168,6 +176,14 @@ class Fsm:
         if not isinstance(self.transtable, list):
             raise TypeError("Something went wrong: transition table is not a list")
 
+        num_inputs = int(self.i.num) if self.i else None
+        num_outputs = int(self.o.num) if self.o else None
+
+        # fast path: check the whole table at once,
+        # the rows are only inspected one by one when something is wrong
+        if self.is_transtable_well_formed(num_inputs, num_outputs):
+            return
+
         for row in self.transtable:
             # be sure that it contains lists of strings
             if not isinstance(row, list):
@@ -190,10 +206,10 @@ class Fsm:
                                      "['0', '1', '-'])".format(row[0], " ".join(row)))
 
             # be sure that the inputs are the amount specified by the .i keyword
-            if self.i and len(row[0]) != int(self.i.num):
+            if num_inputs is not None and len(row[0]) != num_inputs:
                 raise ValueError("'{}' row (transition table) has an unexpected number "
                                  "of inputs (found {} elements in '{}' but expected {} "
-                                 "based on the .i parameter)".format(" ".join(row), len(row[0]), row[0], self.i.num))
+                                 "based on the .i parameter)".format(" ".join(row), len(row[0]), row[0], num_inputs))
 
             # be sure that the last element (outputs) is make of 0 1 -
             for el in row[3]:
@@ -203,10 +219,82 @@ class Fsm:
                                      "['0', '1', '-'])".format(row[3], " ".join(row)))
 
             # be sure that the outputs are the amount specified by the .o keyword
-            if self.o and len(row[3]) != int(self.o.num):
+            if num_outputs is not None and len(row[3]) != num_outputs:
                 raise ValueError("'{}' row (transition table) has an unexpected number "
                                  "of outputs (found {} elements in '{}' but expected {} "
-                                 "based on the .o parameter)".format(" ".join(row), len(row[3]), row[3], self.o.num))
+                                 "based on the .o parameter)".format(" ".join(row), len(row[3]), row[3], num_outputs))
+
+    def is_transtable_well_formed(self, num_inputs: Optional[int], num_outputs: Optional[int]) -> bool:
+        """
+        Checks the whole transition table in one step.
+
+        The input and output columns are packed into single strings
+        and matched against a regex, this only tells if the table is valid
+        (use validate_transtable() to know where the problem is).
+
+        :param int num_inputs: expected length of the inputs (None to skip the check)
+        :param int num_outputs: expected length of the outputs (None to skip the check)
+        :return bool: True if the transition table is valid
+        """
+        rows = self.transtable
+        if len(rows) == 0:
+            return True
+
+        if set(map(type, rows)) != {list} or set(map(len, rows)) != {4}:
+            return False
+
+        columns = list(zip(*rows))
+        if set(map(type, chain.from_iterable(columns))) != {str}:
+            return False
+
+        for column, expected_len in ((columns[0], num_inputs), (columns[3], num_outputs)):
+            if expected_len is not None and set(map(len, column)) != {expected_len}:
+                return False
+
+            if _CUBES_PATTERN.fullmatch("".join(column)) is None:
+                return False
+
+        return True
+
+    def validate_determinism(self) -> None:
+        """
+        Checks that the FSM is deterministic.
+
+        Two rows with the same current state and overlapping inputs
+        (a combination of inputs satisfies both) need to go to the same
+        next state and can't have conflicting outputs ("0" and "1" on the same output).
+
+        The transition table needs to be valid (check it with validate_transtable() first).
+        """
+        table = self.get_columns()
+
+        # group the rows by current state, then by input care mask:
+        # rows with the same care mask overlap only if their inputs are equal,
+        # so each pair of masks is checked with a dictionary instead of comparing each pair of rows
+        rows_by_state: Dict[int, Dict[int, List[int]]] = {}
+        for row_id, state_id in enumerate(table.current):
+            rows_by_state.setdefault(state_id, {}).setdefault(table.input_care[row_id], []).append(row_id)
+
+        for groups in rows_by_state.values():
+            masks = list(groups)
+            for pos, mask in enumerate(masks):
+                for other_mask in masks[pos:]:
+                    conflict = table.find_conflict(groups[mask], groups[other_mask], mask & other_mask)
+                    if conflict is None:
+                        continue
+
+                    rows = [" ".join(self.transtable[row_id]) for row_id in sorted(conflict)]
+                    raise ValueError("'{}' and '{}' rows (transition table) have the same current state "
+                                     "and overlapping inputs but different next states or "
+                                     "outputs: the FSM is not deterministic".format(*rows))
+
+    def get_columns(self) -> "TransitionTable":
+        """
+        Returns the transition table in columnar form (see TransitionTable()).
+
+        The transition table needs to be valid (check it with validate_transtable() first).
+        """
+        return TransitionTable(self.transtable)
 
     def __str__(self) -> str:
         """Printed string."""
@@ -246,6 +334,117 @@ class Fsm:
         return fsm
 
 
+_CUBES_PATTERN = re.compile("[01-]*")
+
+
+class TransitionTable:
+    def __init__(self, transtable: List[List[str]]) -> None:
+        """
+        Columnar view of a (valid) transition table.
+
+        The bitmasks use the first char of the inputs/outputs
+        as the most significant bit.
+
+        Attributes:
+        * self.states: list of state names (the position of a state is its ID)
+        * self.state_ids: dictionary that maps a state name to its ID
+        * self.current: array with the current state ID of each row
+        * self.next: array with the next state ID of each row
+        * self.inputs: list with the input cube of each row (like "0-1")
+        * self.input_care: list of bitmasks (bits set where the input is not a don't care)
+        * self.input_value: list of bitmasks (bits set where the input is "1")
+        * self.outputs: list with the outputs of each row (like "01-")
+        * self.output_care: list of bitmasks (bits set where the output is not a don't care)
+        * self.output_value: list of bitmasks (bits set where the output is "1")
+        """
+        self.states: List[str] = []
+        self.state_ids: Dict[str, int] = {}
+        self.current = array("i")
+        self.next = array("i")
+        self.inputs: List[str] = [row[0] for row in transtable]
+        self.outputs: List[str] = [row[3] for row in transtable]
+
+        for row in transtable:
+            self.current.append(self.get_state_id(row[1]))
+            self.next.append(self.get_state_id(row[2]))
+
+        self.input_care = [int(cube.translate(_CARE_TABLE) or "0", 2) for cube in self.inputs]
+        self.input_value = [int(cube.translate(_VALUE_TABLE) or "0", 2) for cube in self.inputs]
+        self.output_care = [int(out.translate(_CARE_TABLE) or "0", 2) for out in self.outputs]
+        self.output_value = [int(out.translate(_VALUE_TABLE) or "0", 2) for out in self.outputs]
+
+    def get_state_id(self, state: str) -> int:
+        """
+        Returns the ID of the <state> state (adds it to the known states if needed).
+        """
+        state_id = self.state_ids.get(state)
+        if state_id is None:
+            state_id = len(self.states)
+            self.state_ids[state] = state_id
+            self.states.append(state)
+
+        return state_id
+
+    def inputs_overlap(self, r1: int, r2: int) -> bool:
+        """
+        Returns True if a combination of inputs satisfies both the <r1> and <r2> rows.
+        """
+        care = self.input_care[r1] & self.input_care[r2]
+        return (self.input_value[r1] ^ self.input_value[r2]) & care == 0
+
+    def outputs_conflict(self, r1: int, r2: int) -> bool:
+        """
+        Returns True if an output is "0" in the <r1> row and "1" in the <r2> row (or vice versa).
+        """
+        care = self.output_care[r1] & self.output_care[r2]
+        return (self.output_value[r1] ^ self.output_value[r2]) & care != 0
+
+    def find_conflict(self, rows_a: List[int], rows_b: List[int], care: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns two rows, one of <rows_a> and one of <rows_b>, with overlapping inputs
+        but different next states or conflicting outputs (None if there aren't any).
+
+        The rows in each list have the same input care mask, <care> is the intersection of the two masks:
+        two rows overlap when their inputs are equal on the <care> bits.
+        """
+        # summary of the rows of <rows_b> with the same inputs on the <care> bits:
+        # (next state or -1 if they differ, outputs that are "1", outputs that are "0")
+        buckets: Dict[int, List[int]] = {}
+        summaries: Dict[int, Tuple[int, int, int]] = {}
+        for row_id in rows_b:
+            key = self.input_value[row_id] & care
+            buckets.setdefault(key, []).append(row_id)
+            ones = self.output_care[row_id] & self.output_value[row_id]
+            zeros = self.output_care[row_id] & ~self.output_value[row_id]
+            summary = summaries.get(key)
+            if summary is None:
+                summaries[key] = (self.next[row_id], ones, zeros)
+            else:
+                next_state = summary[0] if summary[0] == self.next[row_id] else -1
+                summaries[key] = (next_state, summary[1] | ones, summary[2] | zeros)
+
+        for row_id in rows_a:
+            key = self.input_value[row_id] & care
+            summary = summaries.get(key)
+            if summary is None:
+                continue
+
+            ones = self.output_care[row_id] & self.output_value[row_id]
+            zeros = self.output_care[row_id] & ~self.output_value[row_id]
+            if summary[0] == self.next[row_id] and ones & summary[2] == 0 and zeros & summary[1] == 0:
+                continue
+
+            for other_id in buckets[key]:
+                if self.next[row_id] != self.next[other_id] or self.outputs_conflict(row_id, other_id):
+                    return row_id, other_id
+
+        return None
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return len(self.inputs)
+
+
 class I:
     def __init__(self, params: str):
         """
@@ -1,11 +1,24 @@
-from typing import List, Optional
+import re
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple, Union, TYPE_CHECKING
 
 try:
+    from . import diagnostics
     from . import fsm
+    from . import mapped
     from . import subfiles
+    from . import timing
 except (ModuleNotFoundError, ImportError):
-    import fsm       # type: ignore
-    import subfiles  # type: ignore
+    import diagnostics  # type: ignore
+    import fsm          # type: ignore
+    import mapped       # type: ignore
+    import subfiles     # type: ignore
+    import timing       # type: ignore
+
+if TYPE_CHECKING:
+    from ..genlib import Library
+    from ..netlist import NetlistIndex
 
 
 class Model:
@@ -87,7 +100,7 @@ class Outputs:
 
 
 class Names:
-    def __init__(self, params: str, dontcare: bool):
+    def __init__(self, params: str, dontcare: bool, trusted: bool = False):
         """
         Defines a .names keyword object.
 
@@ -98,16 +111,19 @@ class Names:
 
         If dontcare is true, the output
         represents a don't care.
+
+        If trusted is true, the checks are skipped (params must contain at least one parameter).
         """
-        if not isinstance(params, str):
-            raise TypeError("'{}' is not a string".format(params))
+        if not trusted:
+            if not isinstance(params, str):
+                raise TypeError("'{}' is not a string".format(params))
 
-        if not isinstance(dontcare, bool):
-            raise TypeError("'{}' is not a boolean".format(dontcare))
+            if not isinstance(dontcare, bool):
+                raise TypeError("'{}' is not a boolean".format(dontcare))
 
         self.v_params = [param for param in params.split(" ") if param != ""]
 
-        if len(self.v_params) == 0:
+        if not trusted and len(self.v_params) == 0:
             raise ValueError("params should contain at least one parameter")
 
         self.truthtable: List[List[str]] = []
@@ -150,6 +166,11 @@ class Names:
         if not isinstance(self.truthtable, list):
             raise TypeError("Something went wrong: self.truthtable should be a list")
 
+        # fast path: check the whole cover at once,
+        # the rows are only inspected one by one when something is wrong
+        if self.is_cover_well_formed():
+            return True
+
         expected_el_num = len(self.inputs) + 1
 
         for row in self.truthtable:
@@ -188,6 +209,39 @@ class Names:
 
         return True
 
+    def is_cover_well_formed(self) -> bool:
+        """
+        Checks the whole truth table in one step.
+
+        The rows are packed into a single string and matched against
+        a compiled regex: this is a lot faster than checking each cell
+        but it only tells if the cover is valid, not where the problem is.
+
+        Returns True if:
+        - each row is a list with len(self.inputs) + 1 elements
+        - each element is a single char string
+        - the inputs are made of "0"s, "1"s and/or "-"s
+        - the output is a "0" or a "1"
+        """
+        rows = self.truthtable
+        if len(rows) == 0:
+            return True
+
+        try:
+            if set(map(type, rows)) != {list} or set(map(len, rows)) != {len(self.inputs) + 1}:
+                return False
+
+            cells = list(chain.from_iterable(rows))
+            if set(map(len, cells)) != {1}:
+                return False
+
+            packed = "".join(cells)
+        except TypeError:
+            # some elements are not strings
+            return False
+
+        return _cover_pattern(len(self.inputs)).fullmatch(packed) is not None
+
     def __repr__(self) -> str:
         """Object representation."""
         return "Names('" + " ".join(self.inputs) + " " + self.output + "', " + str(self.is_dontcare) + ")"
@@ -209,8 +263,17 @@ class Names:
         return names
 
 
+@lru_cache(maxsize=None)
+def _cover_pattern(num_inputs: int) -> Pattern[str]:
+    """
+    Returns the regex that matches a packed truth table
+    with <num_inputs> inputs (rows are concatenated without separators).
+    """
+    return re.compile("(?:[01-]{%d}[01])*" % num_inputs)
+
+
 class Latch:
-    def __init__(self, params: str):  # noqa: C901
+    def __init__(self, params: str, trusted: bool = False):  # noqa: C901
         """
         Defines a .latch keyword object.
 
@@ -223,8 +286,10 @@ class Latch:
         (when specified) the latch type must be one of the following values: ["fe", "re", "ah", "al", "as"]
         (when specified) the initial register value must be one of the following values: ['0', '1', '2', '3']
         > note: 2 and 3 are not the actual values stored inside the register. They represent don't care (2) and unknown (3).
+
+        If trusted is true, the values of the parameters are not checked (see is_valid()).
         """
-        if not isinstance(params, str):
+        if not trusted and not isinstance(params, str):
             raise TypeError("'{}' is not a string".format(params))
 
         self.v_params = [param for param in params.split(" ") if param != ""]
@@ -264,7 +329,13 @@ class Latch:
         self.output = self.v_params[1]
 
         # check if parameters have correct values
+        if not trusted:
+            self.is_valid()
 
+    def is_valid(self) -> bool:
+        """
+        Validates the latch type and the initial value (when they are specified).
+        """
         if self.type:
             if self.type not in ["fe", "re", "ah", "al", "as"]:
                 raise ValueError("<type> should be one of these values: ['fe', 're', 'ah', 'al', 'as']")
@@ -273,6 +344,8 @@ class Latch:
             if self.initval not in ["0", "1", "2", "3"]:
                 raise ValueError("<init-val> should be one of these values: ['0', '1', '2', '3']")
 
+        return True
+
     def __repr__(self) -> str:
         """Object representation."""
         latch = "Latch('" + self.input + " " + self.output
@@ -318,7 +391,16 @@ class Blif:
         self.subcircuits: List[subfiles.Subckt] = []
         self.latches: List[Latch] = []
         self.booleanfunctions: List[Names] = []
-        self.problems: List[str] = []
+        self.gates: List[mapped.Gate] = []
+        self.mlatches: List[mapped.MLatch] = []
+        self.library: Optional["Library"] = None
+        self.default_input_arrival: Optional[timing.DefaultInputArrival] = None
+        self.default_output_required: Optional[timing.DefaultOutputRequired] = None
+        self.default_input_drive: Optional[timing.DefaultInputDrive] = None
+        self.default_output_load: Optional[timing.DefaultOutputLoad] = None
+        self.default_max_input_load: Optional[timing.DefaultMaxInputLoad] = None
+        self.problems = diagnostics.Diagnostics()
+        self._index: Optional["NetlistIndex"] = None
 
         self.nkeywords = {
             ".model": 0,
@@ -328,6 +410,8 @@ class Blif:
             ".subckt": 0,
             ".latch": 0,
             ".names": 0,
+            ".gate": 0,
+            ".mlatch": 0,
             ".end": 0,
             ".start_kiss": 0,
             ".i": 0,
@@ -346,11 +430,108 @@ class Blif:
             ".exdc": 0
         }
 
+    def get_index(self) -> "NetlistIndex":
+        """
+        Returns the connectivity index of the netlist (see netlist.NetlistIndex()).
+
+        The index is built on the first call and then cached:
+        call invalidate_index() after changing the boolean functions, latches or sub-circuits.
+        """
+        if self._index is None:
+            try:
+                from .. import netlist
+            except (ImportError, ValueError):
+                import netlist  # type: ignore
+
+            self._index = netlist.NetlistIndex(self)
+
+        return self._index
+
+    def invalidate_index(self) -> None:
+        """
+        Drops the cached connectivity index (it will be rebuilt when needed).
+        """
+        self._index = None
+
+    def get_topological_order(self) -> List[Union[Names, Latch, subfiles.Subckt, mapped.Gate, mapped.MLatch]]:
+        """
+        Returns the latches, sub-circuits, boolean functions and gates in topological order:
+        each boolean function (or gate) comes after the elements that drive its inputs.
+
+        Boolean functions (and gates) that are part of (or depend on) a combinational loop are not returned.
+        """
+        index = self.get_index()
+        return [index.elements[element_id] for element_id in index.topological_order]
+
+    def get_levels(self) -> Dict[str, int]:
+        """
+        Returns a dictionary that maps the output of each boolean function and latch to its logic level.
+
+        Latch outputs are level 0, boolean functions and gates are one level above their deepest input
+        (-1 if they are part of, or depend on, a combinational loop).
+        """
+        index = self.get_index()
+        levels = {}
+        for element_id, element in enumerate(index.elements):
+            if not isinstance(element, subfiles.Subckt):
+                for net in index.element_outputs[element_id]:
+                    levels[net] = index.levels[element_id]
+
+        return levels
+
+    def get_fanin_cone(self, net: str, stop_at_latches: bool = True, stop_at_io: bool = False) -> FrozenSet[str]:
+        """
+        Returns the nets in the transitive fanin cone of the <net> net
+        (see netlist.NetlistIndex().get_fanin_cone()).
+        """
+        return self.get_index().get_fanin_cone(net, stop_at_latches, stop_at_io)
+
+    def get_fanout_cone(self, net: str, stop_at_latches: bool = True, stop_at_io: bool = False) -> FrozenSet[str]:
+        """
+        Returns the nets in the transitive fanout cone of the <net> net
+        (see netlist.NetlistIndex().get_fanout_cone()).
+        """
+        return self.get_index().get_fanout_cone(net, stop_at_latches, stop_at_io)
+
+    def get_mapped_nets(self, element: Union[mapped.Gate, mapped.MLatch]) -> Tuple[List[str], List[str]]:
+        """
+        Returns the (input nets, output nets) of a .gate or .mlatch keyword.
+
+        The pins are resolved with the cell of self.library (see genlib) when the library contains it,
+        otherwise the last <formal>=<actual> parameter is the output (like in the files written by SIS and ABC).
+        The control of a .mlatch keyword is the last input net.
+        """
+        cell = self.library.get(element.name) if self.library is not None else None
+        if cell is not None:
+            try:
+                return cell.get_nets(element)
+            except ValueError:
+                pass
+
+        nets = list(element.bindings.values())
+        inputs = nets[:-1]
+        if isinstance(element, mapped.MLatch):
+            inputs.append(element.control)
+
+        return inputs, nets[-1:]
+
+    def get_timing_keywords(self) -> List[Union[timing.RiseFall, timing.Load]]:
+        """
+        Returns the .default_* timing keywords found in the file (see keywords.timing).
+        """
+        timing_keywords = [self.default_input_arrival, self.default_output_required, self.default_input_drive,
+                           self.default_output_load, self.default_max_input_load]
+        return [timing_keyword for timing_keyword in timing_keywords if timing_keyword is not None]
+
     def __str__(self) -> str:
         """Printed string."""
         blif = self.model.__str__() + "\n"
         blif += self.inputs.__str__() + "\n"
         blif += self.outputs.__str__() + "\n"
+
+        for timing_keyword in self.get_timing_keywords():
+            blif += timing_keyword.__str__() + "\n"
+
         blif += "\n"
 
         if self.fsm.ispresent:
@@ -365,6 +546,12 @@ class Blif:
             for latch in self.latches:
                 blif += latch.__str__() + "\n"
 
+            for mlatch in self.mlatches:
+                blif += mlatch.__str__() + "\n"
+
+            for gate in self.gates:
+                blif += gate.__str__() + "\n"
+
             for function in self.booleanfunctions:
                 blif += function.__str__() + "\n"
 
@@ -0,0 +1,116 @@
+from typing import Dict, List, Optional
+
+
+def get_bindings(params: List[str]) -> Dict[str, str]:
+    """
+    Returns a dictionary that maps each formal parameter to its actual net
+    (the <formal>=<actual> parameters of .gate and .mlatch keywords).
+    """
+    bindings = {}
+    for param in params:
+        if "=" in param:
+            formal, actual = param.split("=", 1)
+            bindings[formal] = actual
+
+    return bindings
+
+
+class Gate:
+    def __init__(self, params: str, trusted: bool = False):
+        """
+        Defines a .gate keyword object (.gate <gate-name> <formal>=<actual> ...),
+        an instance of a cell of the library (see genlib).
+
+        If trusted is true, the parameters are not checked (see is_valid()).
+        """
+        if not trusted and not isinstance(params, str):
+            raise TypeError("'{}' is not a string".format(params))
+
+        v_params = [param for param in params.split(" ") if param != ""]
+
+        if len(v_params) < 2:
+            raise ValueError(".gate expects at least two parameters")
+
+        self.name = v_params[0]
+        self.params = v_params[1:]
+        self.bindings = get_bindings(self.params)
+
+        if not trusted:
+            self.is_valid()
+
+    def is_valid(self) -> bool:
+        """
+        Validates the parameters: each one needs to be a <formal>=<actual> assignment.
+        """
+        for param in self.params:
+            if "=" not in param:
+                raise ValueError("'{}' parameter is incorrect (there needs to be an equal sign '=')".format(param))
+
+        return True
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return "Gate('" + self.name + " " + " ".join(self.params) + "')"
+
+    def __str__(self) -> str:
+        """Printed string."""
+        return ".gate " + self.name + " " + " ".join(self.params)
+
+
+class MLatch:
+    def __init__(self, params: str, trusted: bool = False):
+        """
+        Defines a .mlatch keyword object (.mlatch <latch-name> <formal>=<actual> ... <control> [<init-val>]),
+        an instance of a latch of the library (see genlib).
+
+        (when specified) the initial register value must be one of the following values: ['0', '1', '2', '3']
+
+        If trusted is true, the values of the parameters are not checked (see is_valid()).
+        """
+        if not trusted and not isinstance(params, str):
+            raise TypeError("'{}' is not a string".format(params))
+
+        v_params = [param for param in params.split(" ") if param != ""]
+
+        # the parameters after the assignments are the control and the initial value
+        num_assignments = 1
+        while num_assignments < len(v_params) and "=" in v_params[num_assignments]:
+            num_assignments += 1
+
+        others = v_params[num_assignments:]
+        if num_assignments < 2 or len(others) < 1:
+            raise ValueError(".mlatch expects a name, at least one assignment and the control")
+
+        if len(others) > 2:
+            raise ValueError("Too many parameters (correct usage is: "
+                             ".mlatch <latch-name> <formal>=<actual> ... <control> [<init-val>])")
+
+        self.name = v_params[0]
+        self.params = v_params[1:num_assignments]
+        self.bindings = get_bindings(self.params)
+        self.control = others[0]
+        self.initval: Optional[str] = others[1] if len(others) == 2 else None
+
+        if not trusted:
+            self.is_valid()
+
+    def is_valid(self) -> bool:
+        """
+        Validates the initial value (when it is specified).
+        """
+        if self.initval is not None and self.initval not in ["0", "1", "2", "3"]:
+            raise ValueError("<init-val> should be one of these values: ['0', '1', '2', '3']")
+
+        return True
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return "MLatch('" + self.__str__()[len(".mlatch "):] + "')"
+
+    def __str__(self) -> str:
+        """Printed string."""
+        mlatch = ".mlatch " + self.name + " " + " ".join(self.params) + " " + self.control
+        if self.initval is not None:
+            mlatch += " " + self.initval
+
+        return mlatch
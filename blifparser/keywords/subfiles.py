@@ -21,8 +21,13 @@ class Search:
 
 
 class Subckt:
-    def __init__(self, params: str):
-        if not isinstance(params, str):
+    def __init__(self, params: str, trusted: bool = False):
+        """
+        Defines a .subckt keyword object.
+
+        If trusted is true, the parameters are not checked (see is_valid()).
+        """
+        if not trusted and not isinstance(params, str):
             raise TypeError("'{}' is not a string".format(params))
 
         v_params = [param for param in params.split(" ") if param != ""]
@@ -33,10 +38,19 @@ class Subckt:
         self.modelname = v_params[0]
         self.params = v_params[1:]
 
+        if not trusted:
+            self.is_valid()
+
+    def is_valid(self) -> bool:
+        """
+        Validates the parameters: each one needs to be a <formal>=<actual> assignment.
+        """
         for param in self.params:
             if "=" not in param:
                 raise ValueError("'{}' parameter is incorrect (there needs to be an equal sign '=')".format(param))
 
+        return True
+
     def __repr__(self) -> str:
         """Object representation."""
         return "Subckt('" + self.modelname + " " + " ".join(self.params) + "')"
@@ -0,0 +1,101 @@
+from typing import List
+
+
+class RiseFall:
+    keyword = ""
+
+    def __init__(self, params: str):
+        """
+        Defines a timing keyword object with a rise and a fall value.
+
+        Validation steps:
+        * params needs to be a string
+        * params needs to contain two numbers separated by space(s)
+        """
+        if not isinstance(params, str):
+            raise TypeError("'{}' is not a string".format(params))
+
+        self.v_params: List[str] = [param for param in params.split(" ") if param != ""]
+
+        if len(self.v_params) != 2:
+            raise ValueError("{} expects two parameters (<rise> <fall>)".format(self.keyword))
+
+        try:
+            self.rise = float(self.v_params[0])
+            self.fall = float(self.v_params[1])
+        except ValueError:
+            raise ValueError("{} parameters need to be numbers".format(self.keyword))
+
+    def get_max(self) -> float:
+        """Returns the worst value between rise and fall."""
+        return max(self.rise, self.fall)
+
+    def get_min(self) -> float:
+        """Returns the lowest value between rise and fall."""
+        return min(self.rise, self.fall)
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return type(self).__name__ + "('" + " ".join(self.v_params) + "')"
+
+    def __str__(self) -> str:
+        """Printed string."""
+        return self.keyword + " " + " ".join(self.v_params)
+
+
+class Load:
+    keyword = ""
+
+    def __init__(self, params: str):
+        """
+        Defines a timing keyword object with a single (load) value.
+
+        Validation steps:
+        * params needs to be a string
+        * params needs to contain one non negative number
+        """
+        if not isinstance(params, str):
+            raise TypeError("'{}' is not a string".format(params))
+
+        self.param = params.strip()
+
+        try:
+            self.load = float(self.param)
+        except ValueError:
+            raise ValueError("{} expects one numeric parameter (<load>)".format(self.keyword))
+
+        if self.load < 0:
+            raise ValueError("{} <load> can't be negative".format(self.keyword))
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return type(self).__name__ + "('" + self.param + "')"
+
+    def __str__(self) -> str:
+        """Printed string."""
+        return self.keyword + " " + self.param
+
+
+class DefaultInputArrival(RiseFall):
+    """Represents the .default_input_arrival <rise> <fall> keyword (arrival time of the inputs)."""
+    keyword = ".default_input_arrival"
+
+
+class DefaultOutputRequired(RiseFall):
+    """Represents the .default_output_required <rise> <fall> keyword (required time of the outputs)."""
+    keyword = ".default_output_required"
+
+
+class DefaultInputDrive(RiseFall):
+    """Represents the .default_input_drive <rise> <fall> keyword (drive of the inputs, delay per unit of load)."""
+    keyword = ".default_input_drive"
+
+
+class DefaultOutputLoad(Load):
+    """Represents the .default_output_load <load> keyword (load on the outputs)."""
+    keyword = ".default_output_load"
+
+
+class DefaultMaxInputLoad(Load):
+    """Represents the .default_max_input_load <load> keyword (maximum load that the inputs can drive)."""
+    keyword = ".default_max_input_load"
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Technology mapping of the combinational logic into k-input lookup tables (LUTs) with priority cuts.
+
+The netlist is converted into an AIG (see aig.from_blif()) and the cuts of each AND gate
+are enumerated in topological order, keeping only the best ones of each gate (priority cuts).
+The best cuts of the gates needed by the outputs and by the latches become the LUTs of the new netlist.
+
+A cut is a sorted tuple of AIG variables (its leaves) with a 64-bit signature
+(bit <leaf> % 64 is set for each leaf) used to discard quickly the merges with too many leaves.
+"""
+
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+try:
+    from . import aig
+    from .keywords.generic import Blif, Inputs, Latch, Model, Names, Outputs
+except (ImportError, ModuleNotFoundError):
+    import aig                                                            # type: ignore
+    from keywords.generic import Blif, Inputs, Latch, Model, Names, Outputs  # type: ignore
+
+Cut = Tuple[int, ...]
+Cube = Tuple[int, int]
+
+
+def get_signature(cut: Cut) -> int:
+    """
+    Returns the signature of the <cut> cut.
+    """
+    signature = 0
+    for leaf in cut:
+        signature |= 1 << (leaf & 63)
+
+    return signature
+
+
+def get_best_cuts(t_aig: aig.Aig, k: int, num_cuts: int) -> List[Cut]:  # noqa: C901
+    """
+    Returns the best cut of each variable of the <t_aig> AIG (the trivial cut for the inputs and latches).
+
+    The cuts of an AND gate are the merges of the cuts of its fanins with at most <k> leaves,
+    sorted by depth (number of LUTs from the inputs), area flow and number of leaves.
+    Only the best <num_cuts> cuts of each gate (and its trivial cut) are merged again by its fanouts,
+    the cuts of a gate are dropped after the last fanout is visited.
+    """
+    num_vars = t_aig.max_var() + 1
+    first_and = t_aig.first_and_var()
+    fanins = t_aig.and_fanins
+
+    # number of AND gates that read each variable and fanout used by the area flow (outputs included)
+    pending = array("I", [0]) * num_vars
+    for lit in fanins:
+        pending[lit >> 1] += 1
+
+    fanouts = array("I", pending)
+    for lit in list(t_aig.output_lits) + list(t_aig.latch_next):
+        fanouts[lit >> 1] += 1
+
+    # depth of the best cut of each variable and its area flow divided by the fanout
+    depth = array("I", [0]) * num_vars
+    area_share = array("d", [0.0]) * num_vars
+    best: List[Cut] = [(var,) for var in range(num_vars)]
+    cuts: List[Optional[List[Tuple[Cut, int]]]] = [None] * num_vars
+    for var in range(1, first_and):
+        cuts[var] = [((var,), get_signature((var,)))]
+
+    def get_cost(cut: Cut) -> Tuple[int, float, int]:
+        return 1 + max(map(depth.__getitem__, cut)), 1 + sum(map(area_share.__getitem__, cut)), len(cut)
+
+    for var in range(first_and, num_vars):
+        pos = 2 * (var - first_and)
+        fanin_vars = (fanins[pos] >> 1, fanins[pos + 1] >> 1)
+
+        candidates: Dict[Cut, int] = {}
+        for cut_a, signature_a in cuts[fanin_vars[0]] or []:
+            for cut_b, signature_b in cuts[fanin_vars[1]] or []:
+                signature = signature_a | signature_b
+                if bin(signature).count("1") > k:
+                    continue
+
+                merged = tuple(sorted(set(cut_a).union(cut_b)))
+                if len(merged) <= k:
+                    candidates[merged] = signature
+
+        # the subsets of a cut come first: the cuts that contain a selected cut are dominated
+        selected: List[Tuple[Cut, int]] = []
+        for cut in sorted(candidates, key=get_cost):
+            signature = candidates[cut]
+            if any(other_signature & signature == other_signature and set(other).issubset(cut)
+                   for other, other_signature in selected):
+                continue
+
+            selected.append((cut, signature))
+            if len(selected) == num_cuts:
+                break
+
+        best[var] = selected[0][0]
+        depth[var], area_flow, _ = get_cost(best[var])
+        area_share[var] = area_flow / max(fanouts[var], 1)
+        cuts[var] = selected + [((var,), get_signature((var,)))]
+
+        for fanin_var in fanin_vars:
+            pending[fanin_var] -= 1
+            if pending[fanin_var] == 0:
+                cuts[fanin_var] = None
+
+    return best
+
+
+def get_truthtable(t_aig: aig.Aig, root: int, cut: Cut) -> int:
+    """
+    Returns the truth table of the <root> variable as a function of the <cut> leaves:
+    bit m is the value when each leaf i has the value of bit i of m.
+    """
+    num_leaves = len(cut)
+    mask = (1 << (1 << num_leaves)) - 1
+    values: Dict[int, int] = {leaf: get_pattern(position, num_leaves) for position, leaf in enumerate(cut)}
+
+    first_and = t_aig.first_and_var()
+    fanins = t_aig.and_fanins
+    stack = [root]
+    while stack:
+        var = stack[-1]
+        if var in values:
+            stack.pop()
+            continue
+
+        pos = 2 * (var - first_and)
+        missing = [fanins[pos + side] >> 1 for side in (0, 1) if fanins[pos + side] >> 1 not in values]
+        if missing:
+            stack.extend(missing)
+            continue
+
+        stack.pop()
+        value = mask
+        for lit in (fanins[pos], fanins[pos + 1]):
+            value &= values[lit >> 1] ^ (mask if lit & 1 else 0)
+
+        values[var] = value
+
+    return values[root]
+
+
+@lru_cache(maxsize=None)
+def get_pattern(position: int, num_vars: int) -> int:
+    """
+    Returns the truth table of the <position>-th variable of a function of <num_vars> variables.
+    """
+    pattern = 0
+    for minterm in range(1 << num_vars):
+        if minterm >> position & 1:
+            pattern |= 1 << minterm
+
+    return pattern
+
+
+def get_isop(lower: int, upper: int, num_vars: int, top: Optional[int] = None) -> Tuple[List[Cube], int]:
+    """
+    Returns an irredundant sum of products of a function between the <lower> and <upper> truth tables
+    (Minato-Morreale) and the truth table of the sum of products.
+    Only the variables below <top> are used (all the variables if None).
+
+    A cube is a (care, value) tuple: bit i of care is set when the i-th variable is in the cube,
+    bit i of value is set when the variable is not complemented.
+    """
+    mask = (1 << (1 << num_vars)) - 1
+    if lower == 0:
+        return [], 0
+
+    if upper == mask:
+        return [(0, 0)], mask
+
+    # top variable the functions depend on
+    var = num_vars if top is None else top
+    while True:
+        var -= 1
+        pattern = get_pattern(var, num_vars)
+        shift = 1 << var
+        lower0 = (lower & ~pattern) | ((lower & ~pattern) << shift)
+        lower1 = (lower & pattern) | ((lower & pattern) >> shift)
+        upper0 = (upper & ~pattern) | ((upper & ~pattern) << shift)
+        upper1 = (upper & pattern) | ((upper & pattern) >> shift)
+        if lower0 != lower1 or upper0 != upper1:
+            break
+
+    cubes0, result0 = get_isop(lower0 & ~upper1, upper0, num_vars, var)
+    cubes1, result1 = get_isop(lower1 & ~upper0, upper1, num_vars, var)
+    cubes2, result2 = get_isop((lower0 & ~result0) | (lower1 & ~result1), upper0 & upper1, num_vars, var)
+
+    bit = 1 << var
+    cubes = [(care | bit, value) for care, value in cubes0]
+    cubes.extend((care | bit, value | bit) for care, value in cubes1)
+    cubes.extend(cubes2)
+    return cubes, (result0 & ~pattern) | (result1 & pattern) | result2
+
+
+def get_cover(truthtable: int, num_vars: int) -> List[List[str]]:
+    """
+    Returns the rows of a .names truth table of the <truthtable> function:
+    the smallest sum of products of the function (rows with "1" as output) or of its complement ("0" as output).
+    """
+    mask = (1 << (1 << num_vars)) - 1
+    on_cubes, _ = get_isop(truthtable, truthtable, num_vars)
+    off_cubes, _ = get_isop(truthtable ^ mask, truthtable ^ mask, num_vars)
+    output = "1"
+    cubes = on_cubes
+    if 0 < len(off_cubes) < len(on_cubes):
+        output = "0"
+        cubes = off_cubes
+
+    rows = []
+    for care, value in cubes:
+        row = ["-"] * num_vars
+        for position in range(num_vars):
+            if care >> position & 1:
+                row[position] = "1" if value >> position & 1 else "0"
+
+        rows.append(row + [output])
+
+    return rows
+
+
+def make_names(inputs: Sequence[str], output: str, truthtable: List[List[str]]) -> Names:
+    names = Names(" ".join(list(inputs) + [output]), False)
+    names.truthtable = truthtable
+    return names
+
+
+def get_selected(best: List[Cut], roots: List[int], first_and: int) -> Set[int]:
+    """
+    Returns the AND gates (variables from <first_and>) that are LUTs: the <roots> and the leaves
+    of the <best> cuts of the other LUTs.
+    """
+    selected: Set[int] = set()
+    stack = list(roots)
+    while stack:
+        var = stack.pop()
+        if var >= first_and and var not in selected:
+            selected.add(var)
+            stack.extend(best[var])
+
+    return selected
+
+
+def get_lut_names(t_aig: aig.Aig, selected: Set[int], required: List[Tuple[str, int]],
+                  net_lits: Dict[str, int]) -> Tuple[Dict[int, str], Set[int]]:
+    """
+    Returns the names of the inputs, latch outputs and <selected> AND gates of the <t_aig> graph
+    and the AND gates whose LUT computes the complement (their net is a complemented literal).
+
+    The <required> nets are used first, then the other nets of the original netlist (<net_lits>),
+    the remaining LUTs are named "lut<variable>".
+    """
+    names: Dict[int, str] = {position + 1: net for position, net in enumerate(t_aig.inputs + t_aig.latches)}
+    complemented: Set[int] = set()
+    for net, lit in required + list(net_lits.items()):
+        if lit >> 1 in selected and lit >> 1 not in names:
+            names[lit >> 1] = net
+            if lit & 1:
+                complemented.add(lit >> 1)
+
+    used = set(net_lits) | set(net for net, _ in required)
+    for var in sorted(selected):
+        if var not in names:
+            name = "lut{}".format(var)
+            while name in used:
+                name += "_"
+
+            names[var] = name
+            used.add(name)
+
+    return names, complemented
+
+
+def get_lut_rows(t_aig: aig.Aig, var: int, cut: Cut, complemented: Set[int]) -> List[List[str]]:
+    """
+    Returns the truth table of the LUT of the <var> AND gate with the <cut> leaves as inputs
+    (the output and the leaves in <complemented> are inverted).
+    """
+    truthtable = get_truthtable(t_aig, var, cut)
+    if var in complemented:
+        truthtable ^= (1 << (1 << len(cut))) - 1
+
+    rows = get_cover(truthtable, len(cut))
+    for position, leaf in enumerate(cut):
+        if leaf in complemented:
+            for row in rows:
+                row[position] = {"0": "1", "1": "0"}.get(row[position], "-")
+
+    return rows
+
+
+def map_luts(t_blif: Blif, k: int = 6, num_cuts: int = 8) -> Blif:
+    """
+    Maps the combinational logic of the <t_blif> netlist into LUTs with at most <k> inputs.
+
+    The LUTs are the best cuts (see get_best_cuts()) of the AND gates needed by the outputs and by the latches,
+    their outputs keep the name of a net of the original netlist when possible (see get_lut_names()).
+    Buffers and inverters (.names with one input) are added when two outputs share a LUT.
+
+    :param Blif t_blif: netlist (.subckt, .gate and .mlatch keywords are not supported)
+    :param int k: maximum number of inputs of each LUT (at least 2)
+    :param int num_cuts: number of cuts kept for each AND gate
+    :return Blif result: new netlist with the same inputs, outputs and latches
+    """
+    if k < 2 or num_cuts < 1:
+        raise ValueError("k needs to be at least 2 and num_cuts at least 1")
+
+    if t_blif.gates or t_blif.mlatches:
+        raise ValueError("the .gate and .mlatch keywords can't be mapped")
+
+    net_lits: Dict[str, int] = {}
+    t_aig = aig.from_blif(t_blif, net_lits)
+    best = get_best_cuts(t_aig, k, num_cuts)
+    first_and = t_aig.first_and_var()
+
+    # nets that need to be driven: outputs and latch inputs
+    required = list(zip(t_aig.outputs, t_aig.output_lits))
+    required.extend((latch.input, t_aig.latch_next[position]) for position, latch in enumerate(t_blif.latches))
+
+    selected = get_selected(best, [lit >> 1 for _, lit in required], first_and)
+    names, complemented = get_lut_names(t_aig, selected, required, net_lits)
+
+    result = Blif()
+    if t_blif.model is not None:
+        result.model = Model(t_blif.model.name)
+    if t_blif.inputs is not None:
+        result.inputs = Inputs(" ".join(t_blif.inputs.inputs))
+    if t_blif.outputs is not None:
+        result.outputs = Outputs(" ".join(t_blif.outputs.outputs))
+    # the latches are copied from their attributes (v_params isn't updated when a net is renamed)
+    result.latches = [Latch(str(latch)[len(".latch "):]) for latch in t_blif.latches]
+
+    for var in sorted(selected):
+        cut = best[var]
+        rows = get_lut_rows(t_aig, var, cut, complemented)
+        result.booleanfunctions.append(make_names([names[leaf] for leaf in cut], names[var], rows))
+
+    written = set(names.values())
+    for net, lit in required:
+        if net in written:
+            continue
+
+        written.add(net)
+        if lit >> 1 == 0:
+            result.booleanfunctions.append(make_names([], net, [["1"]] if lit == aig.TRUE else []))
+        else:
+            inverted = (lit & 1) != (lit >> 1 in complemented)
+            result.booleanfunctions.append(make_names([names[lit >> 1]], net, [["0" if inverted else "1", "1"]]))
+
+    return result
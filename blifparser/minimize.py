@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Two-level minimization of the .names covers (Espresso-style heuristic).
+
+A cube is a (care, value) tuple of integers: the bit of an input is set in care
+when the input is not a don't care ("-") and it is set in value when the input is "1".
+The first input of a row is the most significant bit.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .keywords.generic import Blif, Names
+except (ImportError, ModuleNotFoundError):
+    from keywords.generic import Blif, Names  # type: ignore
+
+Cube = Tuple[int, int]
+Job = Tuple[int, List[str], List[str]]
+
+_CARE_TABLE = str.maketrans("01-", "110")
+_VALUE_TABLE = str.maketrans("01-", "010")
+
+
+def cube_from_string(text: str) -> Cube:
+    """
+    Returns the cube of the <text> inputs (like "1-0").
+    """
+    return int(text.translate(_CARE_TABLE) or "0", 2), int(text.translate(_VALUE_TABLE) or "0", 2)
+
+
+def cube_to_string(cube: Cube, num_inputs: int) -> str:
+    """
+    Returns the <cube> cube as a string of "0", "1" and "-" with <num_inputs> chars.
+    """
+    care, value = cube
+    chars = []
+    for pos in range(num_inputs - 1, -1, -1):
+        bit = 1 << pos
+        if care & bit:
+            chars.append("1" if value & bit else "0")
+        else:
+            chars.append("-")
+
+    return "".join(chars)
+
+
+def intersects(a: Cube, b: Cube) -> bool:
+    """
+    Returns True if the <a> and <b> cubes have at least one minterm in common.
+    """
+    return (a[1] ^ b[1]) & a[0] & b[0] == 0
+
+
+def contains(a: Cube, b: Cube) -> bool:
+    """
+    Returns True if the <a> cube contains the <b> cube.
+    """
+    return a[0] & ~b[0] == 0 and (a[1] ^ b[1]) & a[0] == 0
+
+
+def cofactor(cover: Sequence[Cube], p: Cube) -> List[Cube]:
+    """
+    Returns the cofactor of the <cover> cover with respect to the <p> cube.
+    """
+    care_p, value_p = p
+    result = []
+    for care, value in cover:
+        if (value ^ value_p) & care & care_p == 0:
+            result.append((care & ~care_p, value & ~care_p))
+
+    return result
+
+
+def get_split_bit(cover: Sequence[Cube]) -> int:
+    """
+    Returns the bit of the input to use to split the <cover> cover:
+    the most binate input (the one that appears most often in both polarities), 0 if the cover is unate.
+    """
+    ones: Dict[int, int] = {}
+    zeros: Dict[int, int] = {}
+    for care, value in cover:
+        while care:
+            bit = care & -care
+            care ^= bit
+            if value & bit:
+                ones[bit] = ones.get(bit, 0) + 1
+            else:
+                zeros[bit] = zeros.get(bit, 0) + 1
+
+    best_bit = 0
+    best_score = 0
+    for bit, count in ones.items():
+        if bit in zeros and count + zeros[bit] > best_score:
+            best_bit = bit
+            best_score = count + zeros[bit]
+
+    return best_bit
+
+
+def is_tautology(cover: Sequence[Cube]) -> bool:
+    """
+    Returns True if the <cover> cover is always true.
+    """
+    if len(cover) == 0:
+        return False
+
+    for care, _ in cover:
+        if care == 0:
+            return True
+
+    bit = get_split_bit(cover)
+    if bit == 0:
+        # a unate cover is a tautology only if it contains the universal cube
+        return False
+
+    return is_tautology(cofactor(cover, (bit, 0))) and is_tautology(cofactor(cover, (bit, bit)))
+
+
+def complement(cover: Sequence[Cube]) -> List[Cube]:  # noqa: C901
+    """
+    Returns a cover of the complement of the <cover> cover.
+    """
+    if len(cover) == 0:
+        return [(0, 0)]
+
+    for care, _ in cover:
+        if care == 0:
+            return []
+
+    if len(cover) == 1:
+        # De Morgan: one cube for each literal
+        care, value = cover[0]
+        result = []
+        while care:
+            bit = care & -care
+            care ^= bit
+            result.append((bit, ~value & bit))
+
+        return result
+
+    bit = get_split_bit(cover)
+    if bit == 0:
+        # unate cover: split on any input
+        for care, _ in cover:
+            if care:
+                bit = care & -care
+                break
+
+    comp0 = complement(cofactor(cover, (bit, 0)))
+    comp1 = set(complement(cofactor(cover, (bit, bit))))
+
+    # the cubes found in both halves don't need the split input
+    result = []
+    for care, value in comp0:
+        if (care, value) in comp1:
+            comp1.discard((care, value))
+            result.append((care, value))
+        else:
+            result.append((care | bit, value))
+
+    for care, value in comp1:
+        result.append((care | bit, value | bit))
+
+    return result
+
+
+def expand(cover: Sequence[Cube], offset: Sequence[Cube]) -> List[Cube]:
+    """
+    Makes each cube of the <cover> cover as big as possible (removing inputs) without
+    intersecting the <offset> cover, then drops the cubes contained in the expanded ones.
+    """
+    # the biggest cubes first: they are more likely to contain the others
+    remaining = sorted(cover, key=lambda cube: bin(cube[0]).count("1"))
+    result: List[Cube] = []
+    for cube in remaining:
+        if any(contains(big, cube) for big in result):
+            continue
+
+        care, value = cube
+        literals = care
+        while literals:
+            bit = literals & -literals
+            literals ^= bit
+
+            candidate = (care & ~bit, value & ~bit)
+            if not any(intersects(candidate, off) for off in offset):
+                care, value = candidate
+
+        result = [other for other in result if not contains((care, value), other)]
+        result.append((care, value))
+
+    return result
+
+
+def irredundant(cover: Sequence[Cube], dontcare: Sequence[Cube]) -> List[Cube]:
+    """
+    Removes the cubes of the <cover> cover that are covered by the other cubes (and the <dontcare> cover).
+    """
+    result = list(cover)
+    # the smallest cubes are the first candidates for removal
+    for cube in sorted(cover, key=lambda cube: -bin(cube[0]).count("1")):
+        others = [other for other in result if other != cube]
+        if is_tautology(cofactor(others + list(dontcare), cube)):
+            result = others
+
+    return result
+
+
+def reduce(cover: Sequence[Cube], dontcare: Sequence[Cube]) -> List[Cube]:
+    """
+    Makes each cube of the <cover> cover as small as possible
+    while keeping the minterms that are not covered by the other cubes (or by the <dontcare> cover).
+    """
+    result = list(cover)
+    for pos in range(len(result)):
+        cube = result[pos]
+        others = result[:pos] + result[pos + 1:] + list(dontcare)
+        uncovered = complement(cofactor(others, cube))
+        if len(uncovered) == 0:
+            continue
+
+        # smallest cube that contains the uncovered minterms
+        care_all = -1
+        value_and = -1
+        value_or = 0
+        for care, value in uncovered:
+            care_all &= care
+            value_and &= value
+            value_or |= value
+
+        agree = care_all & ~(value_and ^ value_or)
+        result[pos] = (cube[0] | agree, cube[1] | (value_and & agree))
+
+    return result
+
+
+def get_cost(cover: Sequence[Cube]) -> Tuple[int, int]:
+    """
+    Returns the cost of the <cover> cover: (number of cubes, number of literals).
+    """
+    return len(cover), sum(bin(care).count("1") for care, _ in cover)
+
+
+def espresso(cover: Sequence[Cube], dontcare: Sequence[Cube]) -> List[Cube]:
+    """
+    Minimizes the <cover> cover using the <dontcare> cover as don't care set.
+
+    Runs the expand and irredundant steps and then repeats reduce, expand
+    and irredundant while the cost (cubes, literals) keeps decreasing.
+    """
+    offset = complement(list(cover) + list(dontcare))
+
+    best = irredundant(expand(cover, offset), dontcare)
+    best_cost = get_cost(best)
+    while True:
+        candidate = irredundant(expand(reduce(best, dontcare), offset), dontcare)
+        candidate_cost = get_cost(candidate)
+        if candidate_cost >= best_cost:
+            return best
+
+        best = candidate
+        best_cost = candidate_cost
+
+
+def get_dontcare_cubes(function: Names, dontcare: Optional[Names]) -> List[Cube]:
+    """
+    Returns the don't care set of the <function> boolean function
+    defined by the <dontcare> .exdc function (as cubes on the inputs of <function>).
+
+    The .exdc function is ignored if it reads inputs that <function> doesn't have.
+    """
+    if dontcare is None or not set(dontcare.inputs) <= set(function.inputs):
+        return []
+
+    rows = [row for row in dontcare.truthtable if len(row) == len(dontcare.inputs) + 1]
+    outputs = {row[-1] for row in rows}
+    if len(outputs) > 1:
+        return []
+
+    # move the .exdc columns to the positions of the same inputs of the function
+    positions = [function.inputs.index(net) for net in dontcare.inputs]
+    cubes = []
+    for row in rows:
+        chars = ["-"] * len(function.inputs)
+        for col, pos in enumerate(positions):
+            chars[pos] = row[col]
+
+        cubes.append(cube_from_string("".join(chars)))
+
+    if outputs == {"0"}:
+        # the rows define when the don't care set is off
+        return complement(cubes)
+
+    return cubes
+
+
+def make_job(function: Names, dontcare: Optional[Names]) -> Optional[Job]:
+    """
+    Returns the data needed to minimize the <function> cover in another process:
+    (number of inputs, rows, don't care cubes as strings).
+    None if the cover can't be minimized (no inputs, empty or with mixed output values).
+    """
+    num_inputs = len(function.inputs)
+    if num_inputs == 0 or len(function.truthtable) == 0 or not function.is_cover_well_formed():
+        return None
+
+    if len({row[-1] for row in function.truthtable}) != 1:
+        return None
+
+    rows = ["".join(row) for row in function.truthtable]
+    dontcare_rows = [cube_to_string(cube, num_inputs) for cube in get_dontcare_cubes(function, dontcare)]
+    return num_inputs, rows, dontcare_rows
+
+
+def run_job(job: Job) -> List[str]:
+    """
+    Minimizes the cover described by <job> (see make_job()) and returns its rows.
+    """
+    num_inputs, rows, dontcare_rows = job
+    output = rows[0][-1]
+    cover = [cube_from_string(row[:-1]) for row in rows]
+    dontcare = [cube_from_string(row) for row in dontcare_rows]
+
+    result = espresso(cover, dontcare)
+    if not result and output == "0":
+        # the OFF-set is in the don't care set: the function can be 1 everywhere
+        # (an empty cover would be the constant 0)
+        return ["-" * num_inputs + "1"]
+
+    if get_cost(result) >= get_cost(list(set(cover))):
+        return rows
+
+    return sorted(cube_to_string(cube, num_inputs) + output for cube in result)
+
+
+def minimize_names(function: Names, dontcare: Optional[Names] = None) -> List[List[str]]:
+    """
+    Returns a minimized truth table for the <function> boolean function
+    (the current truth table if it can't be improved).
+
+    :param Names function: boolean function to minimize
+    :param Names dontcare: .exdc boolean function with the same output (optional)
+    :return list truthtable: rows of the minimized truth table
+    """
+    job = make_job(function, dontcare)
+    if job is None:
+        return function.truthtable
+
+    return [list(row) for row in run_job(job)]
+
+
+def minimize_blif(t_blif: Blif, processes: Optional[int] = None) -> int:
+    """
+    Minimizes the covers of all the (non .exdc) boolean functions of the <t_blif> object,
+    using the .exdc functions as don't care sets.
+
+    :param Blif t_blif: parsed BLIF file (modified in place)
+    :param int processes: number of worker processes (default: number of CPUs, 1 to work in this process)
+    :return int changed: number of boolean functions with a smaller truth table
+    """
+    dontcares = {function.output: function for function in t_blif.booleanfunctions if function.is_dontcare}
+
+    functions = []
+    jobs = []
+    for function in t_blif.booleanfunctions:
+        if function.is_dontcare:
+            continue
+
+        job = make_job(function, dontcares.get(function.output))
+        if job is not None:
+            functions.append(function)
+            jobs.append(job)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    if processes == 1 or len(jobs) < 2:
+        results = [run_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(run_job, jobs, chunksize=max(1, len(jobs) // (processes * 4))))
+
+    changed = 0
+    for function, job, rows in zip(functions, jobs, results):
+        if rows != job[1]:
+            function.truthtable = [list(row) for row in rows]
+            changed += 1
+
+    return changed
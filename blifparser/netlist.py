@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Connectivity index of a parsed BLIF file.
+"""
+
+from collections import deque
+from typing import Callable, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    from .keywords.generic import Blif, Names, Latch
+    from .keywords.mapped import Gate, MLatch
+    from .keywords.subfiles import Subckt
+except (ImportError, ModuleNotFoundError):
+    from keywords.generic import Blif, Names, Latch  # type: ignore
+    from keywords.mapped import Gate, MLatch         # type: ignore
+    from keywords.subfiles import Subckt             # type: ignore
+
+Element = Union[Names, Latch, Subckt, Gate, MLatch]
+
+
+def get_topological_levels(sources: Sequence[bool], successors: Callable[[int], Iterable[int]],
+                           min_levels: Optional[Sequence[int]] = None) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Sorts the nodes of a directed graph in topological order and computes their levels
+    in linear time (Kahn's algorithm).
+
+    The <sources> nodes come first and are level 0 (the edges that reach them are ignored),
+    the other nodes are one level above their deepest predecessor (and at least at their <min_levels> level).
+
+    :param list sources: tells if each node is a source
+    :param function successors: returns the successors of a node (once for each edge)
+    :param list min_levels: minimum level of each node (0 if None)
+    :return tuple result: (topological order, level of each node, number of edges of each node from nodes
+        that were not ordered: the nodes that are part of, or depend on, a loop are not ordered and are level -1)
+    """
+    num_nodes = len(sources)
+    pending = [0] * num_nodes
+    for node in range(num_nodes):
+        for target in successors(node):
+            if not sources[target]:
+                pending[target] += 1
+
+    levels = list(min_levels) if min_levels is not None else [0] * num_nodes
+    queue: Deque[int] = deque(node for node in range(num_nodes) if sources[node])
+    queue.extend(node for node in range(num_nodes) if not sources[node] and pending[node] == 0)
+    order: List[int] = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        if sources[node]:
+            levels[node] = 0
+
+        for target in successors(node):
+            if sources[target]:
+                continue
+
+            levels[target] = max(levels[target], levels[node] + 1)
+            pending[target] -= 1
+            if pending[target] == 0:
+                queue.append(target)
+
+    for node in range(num_nodes):
+        if pending[node] > 0:
+            levels[node] = -1
+
+    return order, levels, pending
+
+
+class NetlistIndex:
+    def __init__(self, t_blif: Blif) -> None:  # noqa: C901
+        """
+        Indexes the connections between the elements of the <t_blif> object.
+
+        The indexed elements are the boolean functions (.names, the .exdc ones are skipped),
+        the latches (.latch), the sub-circuits (.subckt) and the library cells (.gate and .mlatch,
+        see Blif.get_mapped_nets()). Gates are combinational elements, like the boolean functions.
+        Each element is identified by its position in the self.elements list.
+
+        Latches (.latch and .mlatch) and sub-circuits are boundaries: their outputs are level 0 nets
+        (like the primary inputs) and they come first in the topological order.
+        > The direction of the .subckt parameters is not known without parsing the .search-ed files:
+        > the nets that are not driven by anything else are considered outputs of the sub-circuit.
+
+        Attributes:
+        * self.elements: list of indexed elements
+        * self.element_inputs: list with the input nets of each element
+        * self.element_outputs: list with the output nets of each element
+        * self.drivers: dictionary that maps a net to the ID of the element that drives it
+        * self.sinks: dictionary that maps a net to the IDs of the elements that read it
+        * self.multiple_drivers: list of nets driven by more than one element
+        * self.combinational: list that tells if each element is a boolean function or a gate
+        * self.topological_order: list of element IDs, each .names comes after the elements that drive its inputs
+        * self.levels: list with the logic level of each element
+            > -1 for the boolean functions that are part of (or depend on) a combinational loop
+        * self.loops: list of combinational loops (each loop is the list of nets that form it)
+        * self.cones: cache of the cones already computed by get_fanin_cone() and get_fanout_cone()
+        """
+        self.elements: List[Element] = []
+        self.element_inputs: List[List[str]] = []
+        self.element_outputs: List[List[str]] = []
+        self.drivers: Dict[str, int] = {}
+        self.sinks: Dict[str, List[int]] = {}
+        self.multiple_drivers: List[str] = []
+        self.combinational: List[bool] = []
+        self.primary_inputs: List[str] = t_blif.inputs.inputs if t_blif.inputs else []
+        self.primary_outputs: List[str] = t_blif.outputs.outputs if t_blif.outputs else []
+
+        for function in t_blif.booleanfunctions:
+            if not function.is_dontcare:
+                self.add_element(function, function.inputs, [function.output], True)
+
+        for gate in t_blif.gates:
+            inputs, outputs = t_blif.get_mapped_nets(gate)
+            self.add_element(gate, inputs, outputs, True)
+
+        for latch in t_blif.latches:
+            self.add_element(latch, [latch.input], [latch.output])
+
+        for mlatch in t_blif.mlatches:
+            inputs, outputs = t_blif.get_mapped_nets(mlatch)
+            self.add_element(mlatch, inputs, outputs)
+
+        # the sub-circuits are added last: their outputs are the nets without another driver
+        primary_inputs = set(self.primary_inputs)
+        for subckt in t_blif.subcircuits:
+            nets = [param.split("=", 1)[1] for param in subckt.params if "=" in param]
+            outputs = [net for net in nets if net not in self.drivers and net not in primary_inputs]
+            inputs = [net for net in nets if net not in outputs]
+            self.add_element(subckt, inputs, outputs)
+
+        self.topological_order: List[int] = []
+        self.levels: List[int] = [-1] * len(self.elements)
+        self.loops: List[List[str]] = []
+        self.levelize()
+
+        self.boundary_nets = set(self.primary_inputs) | set(self.primary_outputs)
+        self.cones: Dict[Tuple[str, str, bool, bool], FrozenSet[str]] = {}
+
+    def add_element(self, element: Element, inputs: List[str], outputs: List[str], combinational: bool = False) -> None:
+        """
+        Adds an element to the index.
+        """
+        element_id = len(self.elements)
+        self.elements.append(element)
+        self.combinational.append(combinational)
+        self.element_inputs.append(inputs)
+        self.element_outputs.append(outputs)
+
+        for net in inputs:
+            self.sinks.setdefault(net, []).append(element_id)
+
+        for net in outputs:
+            if net in self.drivers:
+                self.multiple_drivers.append(net)
+            else:
+                self.drivers[net] = element_id
+
+    def is_combinational(self, element_id: int) -> bool:
+        """
+        Returns True if the <element_id> element is a boolean function or a gate.
+        """
+        return self.combinational[element_id]
+
+    def levelize(self) -> None:
+        """
+        Computes the topological order and the levels of the elements
+        (see get_topological_levels()) and collects the combinational loops.
+        """
+        # latches and sub-circuits are sources, the primary inputs are level 0 nets:
+        # an element with inputs is at least level 1
+        sources = [not combinational for combinational in self.combinational]
+        min_levels = [1 if inputs else 0 for inputs in self.element_inputs]
+        self.topological_order, self.levels, pending = get_topological_levels(sources, self.get_successors, min_levels)
+
+        if len(self.topological_order) != len(self.elements):
+            self.find_loops(pending)
+
+    def get_successors(self, element_id: int) -> Iterator[int]:
+        """
+        Returns the elements that read the outputs of the <element_id> element (once for each input).
+        """
+        for net in self.element_outputs[element_id]:
+            if self.drivers.get(net) == element_id:
+                yield from self.sinks.get(net, [])
+
+    def find_loops(self, pending: List[int]) -> None:
+        """
+        Collects the combinational loops among the elements that were not ordered.
+
+        Each element that was not ordered has at least one input driven by another element
+        that was not ordered: following those inputs backwards always ends up in a loop.
+        """
+        visited = [False] * len(self.elements)
+        for start in range(len(self.elements)):
+            if pending[start] == 0 or visited[start]:
+                continue
+
+            # walk backwards until an element is found twice
+            path: List[int] = []
+            position: Dict[int, int] = {}
+            element_id = start
+            while element_id not in position and not visited[element_id]:
+                position[element_id] = len(path)
+                path.append(element_id)
+                visited[element_id] = True
+
+                for net in self.element_inputs[element_id]:
+                    driver = self.drivers.get(net)
+                    if driver is not None and pending[driver] > 0:
+                        element_id = driver
+                        break
+
+            if element_id in position:
+                # the walk went backwards: reverse it to follow the signals
+                cycle = path[position[element_id]:]
+                cycle.reverse()
+                nets = [self.element_outputs[cycle_id][0] for cycle_id in cycle]
+                nets.append(nets[0])
+                self.loops.append(nets)
+
+    def get_level(self, net: str) -> int:
+        """
+        Returns the logic level of the <net> net.
+
+        Primary inputs, undriven nets and outputs of latches and sub-circuits are level 0 nets.
+        """
+        driver = self.drivers.get(net)
+        if driver is None:
+            return 0
+
+        return self.levels[driver]
+
+    def get_driver(self, net: str) -> Union[Element, None]:
+        """
+        Returns the element that drives the <net> net (None if it is not driven by an element).
+        """
+        driver = self.drivers.get(net)
+        if driver is None:
+            return None
+
+        return self.elements[driver]
+
+    def get_fanin_cone(self, net: str, stop_at_latches: bool = True, stop_at_io: bool = False) -> FrozenSet[str]:
+        """
+        Returns the nets in the transitive fanin cone of the <net> net (<net> included).
+
+        :param str net: root of the cone
+        :param bool stop_at_latches: if True the cone doesn't go through latches (it stops at their outputs)
+        :param bool stop_at_io: if True the cone stops at the primary inputs/outputs (other than <net>)
+        :return frozenset cone: nets in the cone
+        > Sub-circuits are always boundaries: their internal connections are not known.
+        """
+        return self.get_cone(net, "fanin", stop_at_latches, stop_at_io)
+
+    def get_fanout_cone(self, net: str, stop_at_latches: bool = True, stop_at_io: bool = False) -> FrozenSet[str]:
+        """
+        Returns the nets in the transitive fanout cone of the <net> net (<net> included).
+
+        :param str net: root of the cone
+        :param bool stop_at_latches: if True the cone doesn't go through latches (it stops at their inputs)
+        :param bool stop_at_io: if True the cone stops at the primary inputs/outputs (other than <net>)
+        :return frozenset cone: nets in the cone
+        > Sub-circuits are always boundaries: their internal connections are not known.
+        """
+        return self.get_cone(net, "fanout", stop_at_latches, stop_at_io)
+
+    def get_cone(self, net: str, direction: str, stop_at_latches: bool, stop_at_io: bool) -> FrozenSet[str]:
+        """
+        Returns (and caches) the fanin or fanout cone of the <net> net.
+
+        :param str direction: "fanin" or "fanout"
+        """
+        key = (net, direction, stop_at_latches, stop_at_io)
+        cone = self.cones.get(key)
+        if cone is not None:
+            return cone
+
+        if net not in self.drivers and net not in self.sinks and net not in self.boundary_nets:
+            raise ValueError("'{}' is not a net of the netlist".format(net))
+
+        seen: Set[str] = {net}
+        stack = [net]
+        while stack:
+            curr_net = stack.pop()
+            if stop_at_io and curr_net != net and curr_net in self.boundary_nets:
+                continue
+
+            if direction == "fanin":
+                driver = self.drivers.get(curr_net)
+                next_ids = [] if driver is None else [driver]
+                next_nets = self.element_inputs
+            else:
+                next_ids = self.sinks.get(curr_net, [])
+                next_nets = self.element_outputs
+
+            for element_id in next_ids:
+                element = self.elements[element_id]
+                if isinstance(element, Subckt) or (stop_at_latches and isinstance(element, (Latch, MLatch))):
+                    continue
+
+                for next_net in next_nets[element_id]:
+                    if next_net not in seen:
+                        seen.add(next_net)
+                        stack.append(next_net)
+
+        cone = frozenset(seen)
+        self.cones[key] = cone
+        return cone
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wall time, number of lines and peak memory of each phase of the parsing.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+
+class PhaseStats:
+    def __init__(self, name: str) -> None:
+        """
+        Statistics of a single phase.
+
+        Attributes:
+        * self.name: name of the phase
+        * self.seconds: wall time
+        * self.lines: number of processed lines (or rows, for the validation phases)
+        * self.peak_memory: peak of the memory allocated by Python during the phase (bytes)
+            > on Python < 3.9 the peak can't be reset: it is the peak since the start of the parsing
+        """
+        self.name = name
+        self.seconds = 0.0
+        self.lines = 0
+        self.peak_memory = 0
+
+    def __repr__(self) -> str:
+        """Object representation."""
+        return "PhaseStats('{}', seconds={:.6f}, lines={}, peak_memory={})".format(self.name, self.seconds,
+                                                                                   self.lines, self.peak_memory)
+
+
+class ParseStats:
+    def __init__(self) -> None:
+        """
+        Statistics of the phases of the parsing, in execution order.
+
+        The phases recorded by BlifParser are:
+        * "copy": copy of the file in a temporary folder
+        * "add_metadata", "remove_comments", "remove_params_newline": preparation of the file (see utils)
+        * "tokenize": reading of the lines and creation of the keyword objects
+        * "keywords_validation": latches, gates and sub-circuits checks (only for trusted files)
+        * "fsm_validation": Fsm.is_valid() (only if the file contains an FSM)
+        * "names_validation": Names.is_valid() for each boolean function
+        * "gates_validation": pins of the gates (only if a library is used)
+        * "netlist": combinational loops detection
+
+        Attributes:
+        * self.phases: list of PhaseStats() objects
+        """
+        self.phases: List[PhaseStats] = []
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """
+        Starts tracing the memory allocations (if they are not already traced).
+        """
+        # imported here: tracemalloc is only needed when the parser is profiled
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """
+        Stops tracing the memory allocations (only if start() started it).
+        """
+        if self._started_tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        """
+        Measures the code executed inside the with statement as the <name> phase.
+
+        The yielded PhaseStats() object can be used to set the number of lines.
+        """
+        import tracemalloc
+
+        stats = PhaseStats(name)
+        tracing = tracemalloc.is_tracing()
+        if tracing and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds = time.perf_counter() - start
+            if tracing:
+                stats.peak_memory = tracemalloc.get_traced_memory()[1]
+
+            self.phases.append(stats)
+
+    def get(self, name: str) -> Optional[PhaseStats]:
+        """
+        Returns the statistics of the <name> phase (None if the phase wasn't executed).
+        """
+        for stats in self.phases:
+            if stats.name == name:
+                return stats
+
+        return None
+
+    def get_total_seconds(self) -> float:
+        """
+        Returns the wall time of all the phases.
+        """
+        return sum(stats.seconds for stats in self.phases)
+
+    def __str__(self) -> str:
+        """Printed string (a table with a row for each phase)."""
+        text = "{:<22} {:>12} {:>10} {:>14}\n".format("PHASE", "TIME (ms)", "LINES", "PEAK MEM (KiB)")
+        for stats in self.phases:
+            text += "{:<22} {:>12.3f} {:>10} {:>14.1f}\n".format(stats.name, stats.seconds * 1000,
+                                                                 stats.lines, stats.peak_memory / 1024)
+
+        text += "{:<22} {:>12.3f}\n".format("TOTAL", self.get_total_seconds() * 1000)
+        return text
+
+
+def count_lines(t_file: str) -> int:
+    """
+    Returns the number of lines of the <t_file> file.
+    """
+    with open(t_file, "rb") as fin:
+        return sum(1 for _ in fin)
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CDCL SAT solver and Tseitin encoding of the .names covers.
+
+The literals of the public methods use the DIMACS convention: the variables are numbered from 1,
+a negative number is the complemented variable.
+Inside the solver a literal is 2 * (<variable> - 1) (+1 when it is complemented).
+"""
+
+import heapq
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+UNDEF = -1
+RESTART_BASE = 100
+VAR_DECAY = 0.95
+
+
+def luby(position: int) -> int:
+    """
+    Returns the <position>-th element (from 0) of the Luby sequence: 1, 1, 2, 1, 1, 2, 4, 1, ...
+    """
+    size = 1
+    seq = 0
+    while size < position + 1:
+        seq += 1
+        size = 2 * size + 1
+
+    while size - 1 != position:
+        size = (size - 1) >> 1
+        seq -= 1
+        position = position % size
+
+    return 1 << seq
+
+
+class Solver:
+    def __init__(self) -> None:
+        """
+        Defines an incremental CDCL SAT solver (two watched literals, first UIP learning,
+        VSIDS decisions, phase saving, Luby restarts and assumptions).
+
+        Attributes:
+        * self.num_vars: number of variables
+        * self.ok: False if the clauses are unsatisfiable (without assumptions)
+        * self.clauses: problem clauses with at least two literals
+        * self.learnts: learnt clauses
+        * self.model: value of each variable (position 0 is unused) found by the last satisfiable solve()
+        * self.num_conflicts, self.num_decisions: counters since the creation of the solver
+        """
+        self.num_vars = 0
+        self.ok = True
+        self.clauses: List[List[int]] = []
+        self.learnts: List[List[int]] = []
+        self.model: List[bool] = []
+        self.num_conflicts = 0
+        self.num_decisions = 0
+
+        # state of each literal (values) and of each variable
+        self.values: List[int] = []
+        self.watches: List[List[List[int]]] = []
+        self.level: List[int] = []
+        self.reason: List[Optional[List[int]]] = []
+        self.seen: List[int] = []
+        self.phase: List[int] = []
+        self.activity: List[float] = []
+        self.var_inc = 1.0
+        self.heap: List[Tuple[float, int]] = []
+
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.max_learnts = 1000.0
+
+    def new_var(self) -> int:
+        """
+        Adds a variable and returns it.
+        """
+        var = self.num_vars
+        self.num_vars += 1
+        self.values.extend((UNDEF, UNDEF))
+        self.watches.extend(([], []))
+        self.level.append(0)
+        self.reason.append(None)
+        self.seen.append(0)
+        self.phase.append(1)
+        self.activity.append(0.0)
+        heapq.heappush(self.heap, (0.0, var))
+        return self.num_vars
+
+    def get_lit(self, lit: int) -> int:
+        """
+        Returns the internal literal of a DIMACS literal (missing variables are added).
+        """
+        if lit == 0:
+            raise ValueError("0 is not a literal")
+
+        while abs(lit) > self.num_vars:
+            self.new_var()
+
+        return 2 * lit - 2 if lit > 0 else -2 * lit - 1
+
+    def add_clause(self, lits: Iterable[int]) -> bool:
+        """
+        Adds a clause (DIMACS literals), returns False if the clauses became unsatisfiable.
+        """
+        if not self.ok:
+            return False
+
+        values = self.values
+        clause = []
+        previous = UNDEF
+        for lit in sorted(set(self.get_lit(lit) for lit in lits)):
+            if values[lit] == 1 or lit == previous ^ 1:
+                # satisfied at level 0 or tautology
+                return True
+
+            if values[lit] == UNDEF:
+                clause.append(lit)
+
+            previous = lit
+
+        if len(clause) == 0:
+            self.ok = False
+        elif len(clause) == 1:
+            self.assign(clause[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self.clauses.append(clause)
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+
+        return self.ok
+
+    def assign(self, lit: int, reason: Optional[List[int]]) -> None:
+        self.values[lit] = 1
+        self.values[lit ^ 1] = 0
+        self.level[lit >> 1] = len(self.trail_lim)
+        self.reason[lit >> 1] = reason
+        self.trail.append(lit)
+
+    def propagate(self) -> Optional[List[int]]:
+        """
+        Propagates the assignments of the trail, returns the conflicting clause (None if there is no conflict).
+
+        The implied literal of a clause is always its first literal.
+        """
+        values = self.values
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            watchers = watches[false_lit]
+            kept = []
+            position = 0
+            while position < len(watchers):
+                clause = watchers[position]
+                position += 1
+                if clause[0] == false_lit:
+                    clause[0] = clause[1]
+                    clause[1] = false_lit
+
+                first = clause[0]
+                if values[first] == 1:
+                    kept.append(clause)
+                    continue
+
+                for other in range(2, len(clause)):
+                    lit = clause[other]
+                    if values[lit] != 0:
+                        clause[1] = lit
+                        clause[other] = false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if values[first] == 0:
+                        kept.extend(watchers[position:])
+                        watches[false_lit] = kept
+                        self.qhead = len(trail)
+                        return clause
+
+                    self.assign(first, clause)
+
+            watches[false_lit] = kept
+
+        return None
+
+    def bump(self, var: int) -> None:
+        activity = self.activity
+        activity[var] += self.var_inc
+        if activity[var] > 1e100:
+            for other in range(self.num_vars):
+                activity[other] *= 1e-100
+
+            self.var_inc *= 1e-100
+            self.heap = [(-activity[other], other) for other in range(self.num_vars)]
+            heapq.heapify(self.heap)
+        else:
+            heapq.heappush(self.heap, (-activity[var], var))
+
+    def analyze(self, conflict: List[int]) -> Tuple[List[int], int]:
+        """
+        Returns the learnt clause (first UIP) of the <conflict> clause and the level to backtrack to.
+        """
+        seen = self.seen
+        level = self.level
+        trail = self.trail
+        current = len(self.trail_lim)
+
+        learnt = [UNDEF]
+        pending = 0
+        lit = UNDEF
+        position = len(trail) - 1
+        clause = conflict
+        while True:
+            for other in range(0 if lit == UNDEF else 1, len(clause)):
+                var = clause[other] >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = 1
+                    self.bump(var)
+                    if level[var] >= current:
+                        pending += 1
+                    else:
+                        learnt.append(clause[other])
+
+            while not seen[trail[position] >> 1]:
+                position -= 1
+
+            lit = trail[position]
+            position -= 1
+            seen[lit >> 1] = 0
+            pending -= 1
+            if pending == 0:
+                break
+
+            clause = self.reason[lit >> 1]  # type: ignore
+
+        learnt[0] = lit ^ 1
+
+        # removes the literals implied by the other literals of the clause
+        minimized = [learnt[0]]
+        for lit in learnt[1:]:
+            reason = self.reason[lit >> 1]
+            if reason is None or any(not seen[other >> 1] and level[other >> 1] > 0 for other in reason[1:]):
+                minimized.append(lit)
+
+        for lit in learnt[1:]:
+            seen[lit >> 1] = 0
+
+        backtrack_level = 0
+        if len(minimized) > 1:
+            highest = max(range(1, len(minimized)), key=lambda other: level[minimized[other] >> 1])
+            minimized[1], minimized[highest] = minimized[highest], minimized[1]
+            backtrack_level = level[minimized[1] >> 1]
+
+        return minimized, backtrack_level
+
+    def cancel_until(self, target: int) -> None:
+        """
+        Undoes the assignments of the levels above <target>.
+        """
+        if len(self.trail_lim) <= target:
+            return
+
+        values = self.values
+        start = self.trail_lim[target]
+        for lit in self.trail[start:]:
+            var = lit >> 1
+            values[lit] = values[lit ^ 1] = UNDEF
+            self.reason[var] = None
+            self.phase[var] = lit & 1
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+        del self.trail[start:]
+        del self.trail_lim[target:]
+        self.qhead = len(self.trail)
+
+        if len(self.heap) > 4 * self.num_vars + 100:
+            self.heap = [(-self.activity[var], var) for var in range(self.num_vars) if values[2 * var] == UNDEF]
+            heapq.heapify(self.heap)
+
+    def pick_branch(self) -> int:
+        """
+        Returns the unassigned variable with the highest activity (-1 if all the variables are assigned).
+        """
+        heap = self.heap
+        while heap:
+            activity, var = heapq.heappop(heap)
+            if self.values[2 * var] == UNDEF and -activity == self.activity[var]:
+                return var
+
+        for var in range(self.num_vars):
+            if self.values[2 * var] == UNDEF:
+                return var
+
+        return -1
+
+    def reduce_learnts(self) -> None:
+        """
+        Removes the longest half of the learnt clauses (the binary ones and the reasons of assignments are kept).
+        """
+        def is_locked(clause: List[int]) -> bool:
+            return self.reason[clause[0] >> 1] is clause and self.values[clause[0]] == 1
+
+        self.learnts.sort(key=len)
+        half = len(self.learnts) // 2
+        kept = [clause for clause in self.learnts[half:] if len(clause) == 2 or is_locked(clause)]
+        self.learnts = self.learnts[:half] + kept
+
+        self.watches = [[] for _ in range(2 * self.num_vars)]
+        for clauses in (self.clauses, self.learnts):
+            for clause in clauses:
+                self.watches[clause[0]].append(clause)
+                self.watches[clause[1]].append(clause)
+
+    def solve(self, assumptions: Sequence[int] = (), conflict_limit: Optional[int] = None) -> Optional[bool]:  # noqa: C901
+        """
+        Searches an assignment that satisfies the clauses and the <assumptions> literals.
+
+        :param list assumptions: DIMACS literals that are true only during this call
+        :param int conflict_limit: maximum number of conflicts (None: no limit)
+        :return bool result: True if satisfiable (see self.model and get_value()), False if unsatisfiable,
+                             None if the conflict limit was reached
+        """
+        self.model = []
+        if not self.ok:
+            return False
+
+        assumption_lits = [self.get_lit(lit) for lit in assumptions]
+        values = self.values
+        conflicts = 0
+        restarts = 0
+        restart_limit = luby(restarts) * RESTART_BASE
+        self.max_learnts = max(self.max_learnts, len(self.clauses) / 3)
+
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.num_conflicts += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+
+                learnt, backtrack_level = self.analyze(conflict)
+                self.cancel_until(backtrack_level)
+                if len(learnt) == 1:
+                    self.assign(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self.watches[learnt[0]].append(learnt)
+                    self.watches[learnt[1]].append(learnt)
+                    self.assign(learnt[0], learnt)
+
+                self.var_inc /= VAR_DECAY
+                continue
+
+            if conflict_limit is not None and conflicts >= conflict_limit:
+                self.cancel_until(0)
+                return None
+
+            if conflicts >= restart_limit:
+                restarts += 1
+                restart_limit = conflicts + luby(restarts) * RESTART_BASE
+                self.cancel_until(0)
+                continue
+
+            if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                self.reduce_learnts()
+                self.max_learnts *= 1.1
+
+            level = len(self.trail_lim)
+            if level < len(assumption_lits):
+                lit = assumption_lits[level]
+                if values[lit] == 0:
+                    self.cancel_until(0)
+                    return False
+
+                self.trail_lim.append(len(self.trail))
+                if values[lit] == UNDEF:
+                    self.assign(lit, None)
+
+                continue
+
+            var = self.pick_branch()
+            if var < 0:
+                self.model = [False] + [values[2 * other] == 1 for other in range(self.num_vars)]
+                self.cancel_until(0)
+                return True
+
+            self.num_decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self.assign(2 * var + self.phase[var], None)
+
+    def get_value(self, lit: int) -> bool:
+        """
+        Returns the value of the <lit> DIMACS literal in the model found by the last solve().
+        """
+        return self.model[abs(lit)] == (lit > 0)
+
+
+def encode_cover(input_lits: Sequence[int], truthtable: Sequence[Sequence[str]], output_lit: int,
+                 new_var: Callable[[], int]) -> Iterator[List[int]]:
+    """
+    Yields the clauses (Tseitin encoding) that make the <output_lit> literal
+    equal to the function defined by a .names truth table.
+
+    Each row with two or more literals gets an auxiliary variable (created with <new_var>),
+    the rows with one literal use the literal directly.
+
+    :param list input_lits: DIMACS literals of the inputs (one for each column of the truth table)
+    :param list truthtable: rows of the truth table (the last element is the output)
+    :param int output_lit: DIMACS literal of the output
+    :param function new_var: returns a new variable
+    """
+    # rows with "0" as output define when the function is false
+    if len(truthtable) > 0 and truthtable[0][-1] == "0":
+        output_lit = -output_lit
+
+    cube_lits = []
+    for row in truthtable:
+        literals = []
+        for lit, char in zip(input_lits, row[:-1]):
+            if char == "1":
+                literals.append(lit)
+            elif char == "0":
+                literals.append(-lit)
+
+        if len(literals) == 0:
+            # the row covers every input combination
+            yield [output_lit]
+            return
+
+        if len(literals) == 1:
+            cube_lits.append(literals[0])
+        else:
+            cube = new_var()
+            for lit in literals:
+                yield [-cube, lit]
+            yield [cube] + [-lit for lit in literals]
+            cube_lits.append(cube)
+
+    for cube in cube_lits:
+        yield [output_lit, -cube]
+
+    yield [-output_lit] + cube_lits
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Static timing analysis of a parsed BLIF file:
+arrival times, required times, slack and critical paths.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .keywords.generic import Blif
+except (ImportError, ModuleNotFoundError):
+    from keywords.generic import Blif  # type: ignore
+
+DELAY_MODELS = ("unit", "fanout")
+
+
+class TimingReport:
+    def __init__(self) -> None:
+        """
+        Result of analyze_timing().
+
+        Attributes:
+        * self.arrival: dictionary that maps each net to its arrival time
+        * self.required: dictionary that maps each net to its required time
+            > nets that don't reach a timing endpoint are not in the dictionary
+        * self.delays: dictionary that maps the output of each boolean function (or gate) to its delay
+        * self.predecessor: dictionary that maps the output of each boolean function (or gate)
+          to its latest arriving input (None for constant functions)
+        * self.endpoints: nets where the paths end (primary outputs and inputs of latches and sub-circuits)
+        * self.required_time: required time of the endpoints
+        * self.input_load_violations: primary inputs with a load over the .default_max_input_load value
+        """
+        self.arrival: Dict[str, float] = {}
+        self.required: Dict[str, float] = {}
+        self.delays: Dict[str, float] = {}
+        self.predecessor: Dict[str, Optional[str]] = {}
+        self.endpoints: List[str] = []
+        self.required_time = 0.0
+        self.input_load_violations: List[str] = []
+
+    def get_slack(self, net: str) -> float:
+        """
+        Returns the slack of the <net> net (required time - arrival time).
+
+        Nets that don't reach a timing endpoint have infinite slack.
+        """
+        if net not in self.required:
+            return math.inf
+
+        return self.required[net] - self.arrival[net]
+
+    def get_worst_slack(self) -> float:
+        """
+        Returns the worst slack among the endpoints (infinite if there are no endpoints).
+        """
+        return min((self.get_slack(net) for net in self.endpoints), default=math.inf)
+
+    def get_critical_delay(self) -> float:
+        """
+        Returns the latest arrival time among the endpoints.
+        """
+        return max((self.arrival[net] for net in self.endpoints), default=0.0)
+
+    def get_path(self, endpoint: str) -> List[str]:
+        """
+        Returns the latest arriving path that ends in the <endpoint> net
+        (list of nets, from the start point to the endpoint).
+        """
+        path = [endpoint]
+        net = self.predecessor.get(endpoint)
+        while net is not None:
+            path.append(net)
+            net = self.predecessor.get(net)
+
+        path.reverse()
+        return path
+
+    def get_critical_paths(self, num_paths: int = 1) -> List[Tuple[float, List[str]]]:
+        """
+        Returns the <num_paths> paths with the worst slack (one for each endpoint),
+        as (slack, path) tuples sorted from the worst slack.
+        """
+        endpoints = sorted(self.endpoints, key=self.get_slack)[:num_paths]
+        return [(self.get_slack(endpoint), self.get_path(endpoint)) for endpoint in endpoints]
+
+    def __str__(self) -> str:
+        """Printed string (the critical path with the arrival time and slack of each net)."""
+        text = "critical delay: {:.3f}\n".format(self.get_critical_delay())
+        text += "worst slack: {:.3f}\n".format(self.get_worst_slack())
+
+        for slack, path in self.get_critical_paths():
+            text += "{:<30} {:>10} {:>10}\n".format("NET", "ARRIVAL", "SLACK")
+            for net in path:
+                text += "{:<30} {:>10.3f} {:>10.3f}\n".format(net, self.arrival[net], self.get_slack(net))
+
+        for net in self.input_load_violations:
+            text += "input '{}' drives more than the maximum input load\n".format(net)
+
+        return text
+
+
+def analyze_timing(t_blif: Blif, delay_model: str = "unit", fanout_delay: float = 0.1) -> TimingReport:  # noqa: C901
+    """
+    Propagates the arrival times forward and the required times backward
+    along the topological order of the netlist (both passes are linear in the size of the netlist).
+
+    Delay models:
+    * "unit": each boolean function (or gate) has delay 1
+    * "fanout": each boolean function (or gate) has delay 1 + <fanout_delay> * load,
+      where the load of a net is the number of elements that read it
+      (plus the .default_output_load value for primary outputs);
+      the primary inputs arrive <.default_input_drive> * load later
+
+    The .default_input_arrival value is the arrival time of the primary inputs (0 if missing),
+    latch and sub-circuit outputs arrive at 0 and constant functions arrive at 0.
+    The .default_output_required value is the required time of the endpoints:
+    if it's missing the critical delay is used (so that the worst slack is 0).
+    Rise and fall values are not distinguished: the worst of the two is used
+    (the latest arrival time and the earliest required time).
+
+    :param Blif t_blif: parsed BLIF file
+    :param str delay_model: "unit" or "fanout"
+    :param float fanout_delay: delay added for each unit of load (only for the "fanout" model)
+    :return TimingReport report: arrival times, required times and slack of the nets
+    """
+    if delay_model not in DELAY_MODELS:
+        raise ValueError("'{}' is not a valid delay model (valid models: {})".format(delay_model, ", ".join(DELAY_MODELS)))
+
+    index = t_blif.get_index()
+    if index.loops:
+        raise ValueError("the timing can't be analyzed: the circuit has combinational loops")
+
+    output_load = t_blif.default_output_load.load if t_blif.default_output_load else 0.0
+    primary_outputs = set(index.primary_outputs)
+
+    def get_load(net: str) -> float:
+        load = float(len(index.sinks.get(net, [])))
+        if net in primary_outputs:
+            load += output_load
+        return load
+
+    report = TimingReport()
+    arrival = report.arrival
+
+    # start points
+    input_arrival = t_blif.default_input_arrival.get_max() if t_blif.default_input_arrival else 0.0
+    input_drive = t_blif.default_input_drive.get_max() if t_blif.default_input_drive else 0.0
+    max_input_load = t_blif.default_max_input_load.load if t_blif.default_max_input_load else None
+    for net in index.primary_inputs:
+        arrival[net] = input_arrival
+        if delay_model == "fanout":
+            arrival[net] += input_drive * get_load(net)
+
+        if max_input_load is not None and get_load(net) > max_input_load:
+            report.input_load_violations.append(net)
+
+    # forward pass: arrival times
+    for element_id in index.topological_order:
+        if not index.is_combinational(element_id):
+            for net in index.element_outputs[element_id]:
+                arrival.setdefault(net, 0.0)
+            continue
+
+        output = index.element_outputs[element_id][0]
+        latest = None
+        latest_arrival = 0.0
+        for net in index.element_inputs[element_id]:
+            net_arrival = arrival.setdefault(net, 0.0)
+            if latest is None or net_arrival > latest_arrival:
+                latest = net
+                latest_arrival = net_arrival
+
+        delay = 1.0
+        if delay_model == "fanout":
+            delay += fanout_delay * get_load(output)
+
+        report.delays[output] = delay
+        report.predecessor[output] = latest
+        arrival[output] = latest_arrival + delay if latest is not None else 0.0
+
+    # end points
+    endpoints = dict.fromkeys(index.primary_outputs)
+    for element_id in range(len(index.elements)):
+        if not index.is_combinational(element_id):
+            endpoints.update(dict.fromkeys(index.element_inputs[element_id]))
+
+    report.endpoints = list(endpoints)
+    for net in report.endpoints:
+        arrival.setdefault(net, 0.0)
+
+    if t_blif.default_output_required:
+        report.required_time = t_blif.default_output_required.get_min()
+    else:
+        report.required_time = report.get_critical_delay()
+
+    # backward pass: required times
+    required = report.required
+    for net in report.endpoints:
+        required[net] = report.required_time
+
+    for element_id in reversed(index.topological_order):
+        if not index.is_combinational(element_id):
+            continue
+
+        output = index.element_outputs[element_id][0]
+        if output not in required:
+            continue
+
+        input_required = required[output] - report.delays[output]
+        for net in index.element_inputs[element_id]:
+            if net not in required or input_required < required[net]:
+                required[net] = input_required
+
+    return report
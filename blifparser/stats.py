@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Statistics of a BLIF file computed in a single streaming pass:
+the file is read one line at a time and only counters and a compact net index are kept in memory
+(no keyword objects are created).
+
+    blifparser stats <input BLIF file> [--json]
+"""
+
+import json
+import sys
+from array import array
+from collections import Counter, deque
+from typing import Any, Deque, Dict, IO, Iterator, List
+
+
+class NetlistStats:
+    def __init__(self) -> None:
+        """
+        Statistics of a BLIF file (see compute_stats()).
+
+        Attributes:
+        * self.lines: number of lines of the file (the lines joined with "\\" count as one)
+        * self.models: names of the models (.model)
+        * self.gates: number of boolean functions (.names, the .exdc ones are not counted) and gates (.gate)
+        * self.cubes: number of rows of the truth tables
+        * self.literals: number of input literals of the rows (the "0" and "1" characters)
+        * self.latches: number of latches (.latch and .mlatch)
+        * self.latches_by_type: number of latches of each type ("none" if the type is not specified,
+          the cell name for the .mlatch keywords)
+        * self.latches_by_control: number of latches of each control ("none" if the control is not specified)
+        * self.fanin_histogram: number of boolean functions and gates with each number of inputs
+        * self.fanout_histogram: number of nets read by each number of elements
+        * self.depth: logic depth (number of boolean functions and gates on the longest path
+          between inputs/latches and outputs/latches)
+        * self.subckts_by_model: number of .subckt instances of each model
+        """
+        self.lines = 0
+        self.models: List[str] = []
+        self.gates = 0
+        self.cubes = 0
+        self.literals = 0
+        self.latches = 0
+        self.latches_by_type: "Counter[str]" = Counter()
+        self.latches_by_control: "Counter[str]" = Counter()
+        self.fanin_histogram: "Counter[int]" = Counter()
+        self.fanout_histogram: "Counter[int]" = Counter()
+        self.depth = 0
+        self.subckts_by_model: "Counter[str]" = Counter()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the statistics as a dictionary (can be saved as JSON).
+        """
+        return {
+            "lines": self.lines,
+            "models": self.models,
+            "gates": self.gates,
+            "cubes": self.cubes,
+            "literals": self.literals,
+            "latches": self.latches,
+            "latches_by_type": dict(self.latches_by_type),
+            "latches_by_control": dict(self.latches_by_control),
+            "fanin_histogram": {str(fanin): count for fanin, count in sorted(self.fanin_histogram.items())},
+            "fanout_histogram": {str(fanout): count for fanout, count in sorted(self.fanout_histogram.items())},
+            "depth": self.depth,
+            "subckts_by_model": dict(self.subckts_by_model),
+        }
+
+    def __str__(self) -> str:
+        """Printed string."""
+        text = "models: {}\n".format(", ".join(self.models))
+        text += "lines: {}\n".format(self.lines)
+        text += "gates: {}\n".format(self.gates)
+        text += "cubes: {}\n".format(self.cubes)
+        text += "literals: {}\n".format(self.literals)
+        text += "depth: {}\n".format(self.depth)
+        text += "latches: {}\n".format(self.latches)
+        for title, counter in (("latches by type", self.latches_by_type),
+                               ("latches by control", self.latches_by_control),
+                               ("sub-circuits by model", self.subckts_by_model)):
+            for key, count in sorted(counter.items()):
+                text += "{}: {:<20} {}\n".format(title, key, count)
+
+        for title, histogram in (("fanin", self.fanin_histogram), ("fanout", self.fanout_histogram)):
+            for num_elements, count in sorted(histogram.items()):
+                text += "{} {:<5} {}\n".format(title, num_elements, count)
+
+        return text
+
+
+def read_statements(fin: IO[str]) -> Iterator[str]:
+    """
+    Yields the lines of the <fin> file without comments,
+    the lines that end with "\\" are joined to the next one.
+    """
+    statement = ""
+    for line in fin:
+        line = line.split("#", 1)[0].strip()
+        if line.endswith("\\"):
+            statement += line[:-1] + " "
+            continue
+
+        yield statement + line
+        statement = ""
+
+    if statement:
+        yield statement
+
+
+class NetIndex:
+    def __init__(self) -> None:
+        """
+        Compact index of the connections between the boolean functions and gates,
+        used to compute the fanout and the logic depth after the pass over the file.
+
+        Each net has an integer id (the names are forgotten at each .model keyword).
+        """
+        self.ids: Dict[str, int] = {}
+        self.num_nets = 0
+        self.fanouts = array("I")
+        self.gate_inputs = array("I")
+        self.gate_offsets = array("I", [0])
+        self.gate_outputs = array("I")
+
+    def get_id(self, net: str) -> int:
+        net_id = self.ids.get(net)
+        if net_id is None:
+            net_id = self.num_nets
+            self.ids[net] = net_id
+            self.num_nets += 1
+            self.fanouts.append(0)
+
+        return net_id
+
+    def add_sinks(self, nets: List[str]) -> None:
+        for net in nets:
+            self.fanouts[self.get_id(net)] += 1
+
+    def add_gate(self, inputs: List[str], output: str) -> None:
+        self.add_sinks(inputs)
+        self.gate_inputs.extend(self.get_id(net) for net in inputs)
+        self.gate_offsets.append(len(self.gate_inputs))
+        self.gate_outputs.append(self.get_id(output))
+
+    def get_depth(self) -> int:  # noqa: C901
+        """
+        Returns the logic depth (Kahn's algorithm on the gates, combinational loops are skipped).
+        """
+        num_gates = len(self.gate_outputs)
+        drivers = array("i", [-1]) * self.num_nets
+        for gate, net_id in enumerate(self.gate_outputs):
+            drivers[net_id] = gate
+
+        # sinks of each gate (CSR)
+        pending = array("I", [0]) * num_gates
+        sink_counts = array("I", [0]) * (num_gates + 1)
+        for gate in range(num_gates):
+            for net_id in self.gate_inputs[self.gate_offsets[gate]:self.gate_offsets[gate + 1]]:
+                driver = drivers[net_id]
+                if driver >= 0:
+                    pending[gate] += 1
+                    sink_counts[driver + 1] += 1
+
+        for gate in range(num_gates):
+            sink_counts[gate + 1] += sink_counts[gate]
+
+        sinks = array("I", [0]) * sink_counts[num_gates]
+        positions = array("I", sink_counts[:num_gates])
+        for gate in range(num_gates):
+            for net_id in self.gate_inputs[self.gate_offsets[gate]:self.gate_offsets[gate + 1]]:
+                driver = drivers[net_id]
+                if driver >= 0:
+                    sinks[positions[driver]] = gate
+                    positions[driver] += 1
+
+        levels = array("I", [1]) * num_gates
+        queue: Deque[int] = deque(gate for gate in range(num_gates) if pending[gate] == 0)
+        depth = 0
+        while queue:
+            gate = queue.popleft()
+            depth = max(depth, levels[gate])
+            for sink in sinks[sink_counts[gate]:sink_counts[gate + 1]]:
+                levels[sink] = max(levels[sink], levels[gate] + 1)
+                pending[sink] -= 1
+                if pending[sink] == 0:
+                    queue.append(sink)
+
+        return depth
+
+
+def compute_stats(fin: IO[str]) -> NetlistStats:  # noqa: C901
+    """
+    Computes the statistics of the BLIF file read from <fin> in a single pass.
+
+    The last <formal>=<actual> parameter of the .gate keywords is considered the output
+    (like in the files written by SIS and ABC), all the nets of the .subckt keywords are counted as inputs.
+    The .exdc boolean functions and the FSM transition tables (.start_kiss) are skipped.
+    """
+    stats = NetlistStats()
+    index = NetIndex()
+    in_names = False
+    in_fsm = False
+    in_exdc = False
+
+    for statement in read_statements(fin):
+        stats.lines += 1
+        if statement == "":
+            continue
+
+        if not statement.startswith("."):
+            if in_names:
+                # truth table row: "<inputs> <output>" or "<output>" for constants
+                row = statement.split()
+                stats.cubes += 1
+                if len(row) > 1:
+                    stats.literals += len(row[0]) - row[0].count("-")
+            continue
+
+        params = statement.split()
+        keyword = params[0]
+        params = params[1:]
+        in_names = False
+
+        if in_fsm:
+            in_fsm = keyword != ".end_kiss"
+        elif keyword == ".model":
+            stats.models.append(" ".join(params))
+            index.ids = {}
+            in_exdc = False
+        elif keyword == ".inputs":
+            for net in params:
+                index.get_id(net)
+        elif keyword == ".outputs":
+            index.add_sinks(params)
+        elif keyword == ".exdc":
+            in_exdc = True
+        elif in_exdc:
+            continue
+        elif keyword == ".names":
+            in_names = True
+            stats.gates += 1
+            stats.fanin_histogram[len(params) - 1] += 1
+            if params:
+                index.add_gate(params[:-1], params[-1])
+        elif keyword == ".gate":
+            nets = [param.split("=", 1)[1] for param in params[1:] if "=" in param]
+            stats.gates += 1
+            stats.fanin_histogram[max(len(nets) - 1, 0)] += 1
+            if nets:
+                index.add_gate(nets[:-1], nets[-1])
+        elif keyword == ".latch":
+            # .latch <input> <output> [<type> <control>] [<init-val>]
+            stats.latches += 1
+            latch_type = params[2] if len(params) in (4, 5) else "none"
+            control = params[3] if len(params) in (4, 5) else "none"
+            stats.latches_by_type[latch_type] += 1
+            stats.latches_by_control[control] += 1
+            index.add_sinks(params[:1])
+            for net in params[1:2]:
+                index.get_id(net)
+        elif keyword == ".mlatch":
+            # .mlatch <latch-name> <formal>=<actual> ... <control> [<init-val>]
+            stats.latches += 1
+            nets = [param.split("=", 1)[1] for param in params[1:] if "=" in param]
+            others = [param for param in params[1:] if "=" not in param]
+            stats.latches_by_type[params[0] if params else "none"] += 1
+            stats.latches_by_control[others[0] if others else "none"] += 1
+            index.add_sinks(nets[:-1] + others[:1])
+            for net in nets[-1:]:
+                index.get_id(net)
+        elif keyword == ".subckt":
+            if params:
+                stats.subckts_by_model[params[0]] += 1
+                index.add_sinks([param.split("=", 1)[1] for param in params[1:] if "=" in param])
+        elif keyword == ".start_kiss":
+            in_fsm = True
+
+    stats.fanout_histogram = Counter(index.fanouts)
+    stats.depth = index.get_depth()
+    return stats
+
+
+def main(args: List[str]) -> None:
+    """
+    Prints the statistics of a file (args are the command line arguments after "stats").
+    """
+    as_json = "--json" in args
+    args = [arg for arg in args if arg != "--json"]
+    if len(args) != 1:
+        print("usage: blifparser stats <input BLIF file> [--json]", file=sys.stderr)
+        sys.exit(1)
+
+    with open(args[0]) as fin:
+        stats = compute_stats(fin)
+
+    if as_json:
+        print(json.dumps(stats.to_dict(), indent=4))
+    else:
+        print(stats, end="")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
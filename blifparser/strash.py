@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Structural hashing of the boolean functions of a parsed BLIF file:
+finds (and merges) the .names that compute the same cover on the same inputs
+and the .gate keywords that instantiate the same cell with the same input nets.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    from .keywords.generic import Blif, Names
+    from .keywords.mapped import Gate, get_bindings
+except (ImportError, ModuleNotFoundError):
+    from keywords.generic import Blif, Names        # type: ignore
+    from keywords.mapped import Gate, get_bindings  # type: ignore
+
+Signature = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def canonical_cover(inputs: Sequence[str], truthtable: Sequence[Sequence[str]]) -> Signature:
+    """
+    Returns the canonical form of a cover: (inputs, rows).
+
+    The inputs are sorted by name (the columns of the rows are moved accordingly),
+    the rows are joined into strings (like "1-0 1"), sorted and deduplicated.
+    Two covers with the same canonical form compute the same function.
+    """
+    order = sorted(range(len(inputs)), key=inputs.__getitem__)
+    sorted_inputs = tuple(inputs[pos] for pos in order)
+    rows = {"".join([row[pos] for pos in order]) + " " + row[-1] for row in truthtable}
+
+    return sorted_inputs, tuple(sorted(rows))
+
+
+def find_duplicates(t_blif: Blif) -> Dict[str, str]:
+    """
+    Finds the boolean functions and the gates that are identical to another one.
+
+    The elements are visited in topological order, so that an element that reads
+    the output of a duplicate is compared as if it read the output of the original one
+    (the duplicates of the duplicates are found in a single pass).
+    Two gates are identical if they instantiate the same cell with the same nets on the same input pins.
+    Elements that are part of a combinational loop and .exdc functions are skipped.
+
+    :param Blif t_blif: parsed BLIF file
+    :return dict duplicates: maps the output of each duplicate element to the output of the original one
+    """
+    duplicates: Dict[str, str] = {}
+    originals: Dict[Signature, str] = {}
+    gate_originals: Dict[Signature, str] = {}
+
+    for element in t_blif.get_topological_order():
+        if isinstance(element, Names):
+            inputs = [duplicates.get(net, net) for net in element.inputs]
+            signature = canonical_cover(inputs, element.truthtable)
+            output = element.output
+            known = originals
+        elif isinstance(element, Gate):
+            outputs = t_blif.get_mapped_nets(element)[1]
+            if len(outputs) != 1:
+                continue
+
+            output = outputs[0]
+            pins = [formal + "=" + duplicates.get(actual, actual)
+                    for formal, actual in element.bindings.items() if actual != output]
+            signature = ((element.name,), tuple(sorted(pins)))
+            known = gate_originals
+        else:
+            continue
+
+        original = known.get(signature)
+        if original is None:
+            known[signature] = output
+        else:
+            duplicates[output] = original
+
+    return duplicates
+
+
+def merge_duplicates(t_blif: Blif) -> Dict[str, str]:  # noqa: C901
+    """
+    Removes the duplicate boolean functions and gates (see find_duplicates()) from the <t_blif> object:
+    the nets driven by the duplicates are replaced by the nets driven by the original elements.
+
+    When the output of a duplicate is a primary output, the duplicate
+    becomes a buffer (.names) of the original element (the output name must not change).
+
+    :param Blif t_blif: parsed BLIF file (modified in place)
+    :return dict duplicates: maps the output of each merged function to the output of the original one
+    """
+    duplicates = find_duplicates(t_blif)
+    if len(duplicates) == 0:
+        return duplicates
+
+    primary_outputs = set(t_blif.outputs.outputs) if t_blif.outputs else set()
+
+    functions: List[Names] = []
+    for function in t_blif.booleanfunctions:
+        original = duplicates.get(function.output)
+        if function.is_dontcare:
+            # the .exdc network is separate from the care network
+            functions.append(function)
+            continue
+
+        if original is not None:
+            if function.output not in primary_outputs:
+                continue
+
+            function.inputs = [original]
+            function.truthtable = [["1", "1"]]
+        else:
+            function.inputs = [duplicates.get(net, net) for net in function.inputs]
+
+        functions.append(function)
+
+    gates: List[Gate] = []
+    for gate in t_blif.gates:
+        outputs = t_blif.get_mapped_nets(gate)[1]
+        original = duplicates.get(outputs[0]) if len(outputs) == 1 else None
+        if original is None:
+            gates.append(gate)
+        elif outputs[0] in primary_outputs:
+            # like the boolean functions: the gate becomes a buffer
+            function = Names(original + " " + outputs[0], False)
+            function.truthtable = [["1", "1"]]
+            functions.append(function)
+
+    t_blif.booleanfunctions = functions
+    t_blif.gates = gates
+
+    for latch in t_blif.latches:
+        latch.input = duplicates.get(latch.input, latch.input)
+        if latch.control is not None:
+            latch.control = duplicates.get(latch.control, latch.control)
+
+    for subckt in t_blif.subcircuits:
+        subckt.params = replace_actuals(subckt.params, duplicates)
+
+    for element in t_blif.gates + t_blif.mlatches:
+        element.params = replace_actuals(element.params, duplicates)
+        element.bindings = get_bindings(element.params)
+
+    for mlatch in t_blif.mlatches:
+        mlatch.control = duplicates.get(mlatch.control, mlatch.control)
+
+    t_blif.invalidate_index()
+    return duplicates
+
+
+def replace_actuals(params: List[str], nets: Dict[str, str]) -> List[str]:
+    """
+    Returns the <formal>=<actual> parameters of a .subckt, .gate or .mlatch keyword
+    with the actual nets replaced according to the <nets> dictionary.
+    """
+    replaced = []
+    for param in params:
+        formal, actual = param.split("=", 1)
+        replaced.append(formal + "=" + nets.get(actual, actual))
+
+    return replaced
@@ -0,0 +1,46 @@
+"""
+Helpers shared by the unit tests.
+"""
+import os
+import sys
+
+# import the modules from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.realpath(os.path.join(curr_dir, "..", "blifparser"))
+if blifparser_path not in sys.path:
+    sys.path.insert(1, blifparser_path)
+
+from keywords import fsm, generic  # noqa: E402
+
+
+def make_names(params, rows, dontcare=False):
+    """
+    Returns a Names() object with the <rows> truth table (rows are strings like "1- 1").
+    """
+    names = generic.Names(params, dontcare)
+    names.truthtable = [[char for char in row if char != " "] for row in rows]
+    return names
+
+
+def make_fsm(rows, num_inputs=2, num_outputs=1, reset=None):
+    """
+    Returns an Fsm() object with the <rows> transition table (rows are strings like "1- s0 s1 1").
+    """
+    t_fsm = fsm.Fsm()
+    t_fsm.ispresent = True
+    t_fsm.i = fsm.I(str(num_inputs))
+    t_fsm.o = fsm.O(str(num_outputs))
+    t_fsm.transtable = [row.split() for row in rows]
+    if reset is not None:
+        t_fsm.r = fsm.R(reset)
+
+    return t_fsm
+
+
+# small genlib library for the tests of the .gate keywords
+LIBRARY = """
+GATE inv 1 O=!a;
+PIN a INV 1 999 1 0.2 1 0.2
+GATE nand2 2 O=!(a*b);
+PIN * INV 1 999 1 0.2 1 0.2
+"""
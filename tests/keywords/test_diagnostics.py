@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+
+# import diagnostics.py from the ../../blifparser/keywords folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+keywords_path = os.path.join(curr_dir, "..", "..", "blifparser", "keywords")
+sys.path.insert(1, os.path.realpath(keywords_path))
+import diagnostics  # noqa: E402
+
+
+class TestDiagnostics(unittest.TestCase):
+
+    def test_diagnostic(self):
+        obj = object()
+        diagnostic = diagnostics.Diagnostic("invalid-keyword", "[ERROR][LINE ~ {line}] Invalid keyword: '{}'",
+                                            (".foo",), line=3, obj=obj)
+
+        self.assertEqual(diagnostic.text, "[ERROR][LINE ~ 3] Invalid keyword: '.foo'")
+        self.assertEqual(str(diagnostic), diagnostic.text)
+        self.assertEqual(diagnostic, "[ERROR][LINE ~ 3] Invalid keyword: '.foo'")
+        self.assertNotEqual(diagnostic, "[ERROR][LINE ~ 4] Invalid keyword: '.foo'")
+        self.assertIs(diagnostic.obj, obj)
+        self.assertEqual(diagnostic.severity, diagnostics.ERROR)
+
+        diagnostic.line = None
+        self.assertEqual(diagnostic.text, "[ERROR][LINE ~ unknown] Invalid keyword: '.foo'")
+
+    def test_diagnostics(self):
+        problems = diagnostics.Diagnostics(["first"])
+        problems.add("loop", "loop: {}", "a -> a")
+        problems.add("note", "just a note", severity=diagnostics.WARNING)
+
+        self.assertEqual(problems, ["first", "loop: a -> a", "just a note"])
+        self.assertEqual(problems.num_errors, 2)
+        self.assertEqual([problem.code for problem in problems.get_errors()], ["custom", "loop"])
+        self.assertEqual(problems.get_texts(), ["first", "loop: a -> a", "just a note"])
+
+    def test_limits(self):
+        problems = diagnostics.Diagnostics(max_errors=2)
+        problems.add("warning", "w", severity=diagnostics.WARNING)
+        problems.add("error", "e1")
+        with self.assertRaises(diagnostics.TooManyErrors) as e:
+            problems.add("error", "e2")
+
+        self.assertEqual(e.exception.num_errors, 2)
+        self.assertTrue(problems.stopped)
+        self.assertEqual(len(problems), 3)
+
+        problems = diagnostics.Diagnostics(fail_fast=True)
+        problems.add("warning", "w", severity=diagnostics.WARNING)
+        with self.assertRaises(diagnostics.TooManyErrors):
+            problems.append("e1")
+
+        # extend() and insert() count the errors like add()
+        problems = diagnostics.Diagnostics(max_errors=3)
+        problems.extend(["e1", diagnostics.Diagnostic("note", "n", severity=diagnostics.WARNING)])
+        problems.insert(0, "e2")
+        self.assertEqual(problems, ["e2", "e1", "n"])
+        self.assertEqual(problems.num_errors, 2)
+        with self.assertRaises(diagnostics.TooManyErrors):
+            problems.extend(["e3", "e4"])
+
+        self.assertEqual(problems.num_errors, 3)
+        self.assertEqual(len(problems), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -419,6 +419,73 @@ class TestFSM(unittest.TestCase):
             self.assertEqual(code.__repr__(), funcparam["repr"])
             self.assertEqual(code.__str__(), funcparam["str"])
 
+    def test_determinism(self):
+        """
+        Tests the detection of overlapping transitions with different behaviour.
+        """
+        testfsm = fsm.Fsm()
+        testfsm.i = fsm.I("2")
+        testfsm.o = fsm.O("1")
+        testfsm.transtable = [
+            ["0-", "a", "b", "1"],
+            ["1-", "a", "a", "0"],
+            ["-1", "b", "a", "1"],
+            ["11", "b", "a", "-"],  # overlaps the previous row but it is compatible
+        ]
+        self.assertTrue(testfsm.is_valid(), "Should be ok")
+
+        # "11" overlaps "-1" but goes to another state
+        testfsm.transtable[3] = ["11", "b", "b", "1"]
+        with self.assertRaises(ValueError) as e:
+            testfsm.is_valid()
+
+        self.assertEqual(e.exception.args[0], "'-1 b a 1' and '11 b b 1' rows (transition table) have the same "
+                                              "current state and overlapping inputs but different next states or "
+                                              "outputs: the FSM is not deterministic")
+
+        # "11" overlaps "-1" with a conflicting output
+        testfsm.transtable[3] = ["11", "b", "a", "0"]
+        with self.assertRaises(ValueError):
+            testfsm.is_valid()
+
+        # same inputs but different current states are fine
+        testfsm.transtable[3] = ["11", "c", "a", "0"]
+        self.assertTrue(testfsm.is_valid(), "Should be ok")
+
+        # big table: each input combination once, then a cube that overlaps four rows of the s1 state
+        testfsm.i = fsm.I("16")
+        testfsm.transtable = [[format(value, "016b"), "s" + str(value % 2), "s0", "0"] for value in range(1 << 16)]
+        self.assertTrue(testfsm.is_valid(), "Should be ok")
+
+        testfsm.transtable.append(["1111111111111---", "s1", "s1", "-"])
+        with self.assertRaises(ValueError) as e:
+            testfsm.is_valid()
+
+        self.assertTrue(e.exception.args[0].startswith("'1111111111111001 s1 s0 0' and '1111111111111--- s1 s1 -' rows"))
+
+    def test_columns(self):
+        """
+        Tests the columnar form of the transition table.
+        """
+        testfsm = fsm.Fsm()
+        testfsm.transtable = [
+            ["0-1", "a", "b", "1-"],
+            ["1--", "b", "a", "01"],
+        ]
+        table = testfsm.get_columns()
+
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.states, ["a", "b"])
+        self.assertEqual(table.state_ids, {"a": 0, "b": 1})
+        self.assertEqual(list(table.current), [0, 1])
+        self.assertEqual(list(table.next), [1, 0])
+        self.assertEqual(table.input_care, [0b101, 0b100])
+        self.assertEqual(table.input_value, [0b001, 0b100])
+        self.assertEqual(table.output_care, [0b10, 0b11])
+        self.assertEqual(table.output_value, [0b10, 0b01])
+        self.assertFalse(table.inputs_overlap(0, 1))
+        self.assertTrue(table.outputs_conflict(0, 1))
+
 
 if __name__ == "__main__":
     unittest.main()
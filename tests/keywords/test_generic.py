@@ -65,8 +65,6 @@ class TestGeneric(unittest.TestCase):
     def test_names(self):
         """
         Tests the Names() class which represents the .names keyword in BLIF files.
-
-        TODO: test truth tables
         """
         with self.assertRaises(TypeError):
             generic.Names(None, False)
@@ -92,6 +90,56 @@ class TestGeneric(unittest.TestCase):
         self.assertEqual(names2.output, "parameters")
         self.assertFalse(names2.is_dontcare)
 
+    def test_names_truthtable(self):
+        """
+        Tests the validation of the Names() truth table.
+        """
+        names = generic.Names("a b out", False)
+        self.assertTrue(names.is_valid(), "an empty truth table is valid")
+
+        names.truthtable = [["1", "-", "1"], ["0", "1", "1"]]
+        self.assertTrue(names.is_cover_well_formed())
+        self.assertTrue(names.is_valid())
+
+        # wrong number of elements
+        names.truthtable.append(["1", "1"])
+        self.assertFalse(names.is_cover_well_formed())
+        with self.assertRaises(ValueError) as e:
+            names.is_valid()
+        self.assertEqual(e.exception.args[0], "'1 1' row should have 2 inputs + 1 output: found 2 instead "
+                                              "(under '.names a b out\n1- 1\n01 1\n1 1\n')")
+
+        # unexpected input char
+        names.truthtable[-1] = ["1", "x", "1"]
+        self.assertFalse(names.is_cover_well_formed())
+        with self.assertRaises(ValueError) as e:
+            names.is_valid()
+        self.assertTrue(e.exception.args[0].startswith("Found unexpected char 'x' as input in row '1x 1'"))
+
+        # unexpected output char
+        names.truthtable[-1] = ["1", "1", "-"]
+        self.assertFalse(names.is_cover_well_formed())
+        with self.assertRaises(ValueError):
+            names.is_valid()
+
+        # elements with more than one char
+        names.truthtable[-1] = ["11", "", "1"]
+        self.assertFalse(names.is_cover_well_formed())
+        with self.assertRaises(ValueError):
+            names.is_valid()
+
+        # elements that are not strings
+        names.truthtable[-1] = ["1", 1, "1"]
+        self.assertFalse(names.is_cover_well_formed())
+        with self.assertRaises(TypeError):
+            names.is_valid()
+
+        # constant (no inputs)
+        constant = generic.Names("one", False)
+        constant.truthtable = [["1"]]
+        self.assertTrue(constant.is_cover_well_formed())
+        self.assertTrue(constant.is_valid())
+
     def test_latch(self):
         """
         Tests the Latch() class which represents the .latch keyword in BLIF files.
@@ -125,6 +173,14 @@ class TestGeneric(unittest.TestCase):
         self.assertEqual(latch1.control, "control")
         self.assertEqual(latch1.initval, "0")
 
+        # trusted parameters are checked only by is_valid()
+        latch2 = generic.Latch(" input output wrong_type control 0 ", trusted=True)
+        self.assertEqual(latch2.type, "wrong_type")
+        with self.assertRaises(ValueError):
+            latch2.is_valid()
+
+        self.assertTrue(latch1.is_valid())
+
     @unittest.skip("TODO: write Blif() tests")
     def test_blif(self):
         pass
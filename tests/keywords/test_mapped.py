@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+# import mapped.py from the ../../blifparser/keywords folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+keywords_path = os.path.join(curr_dir, "..", "..", "blifparser", "keywords")
+sys.path.insert(1, os.path.realpath(keywords_path))
+import mapped  # noqa: E402
+
+
+class TestMapped(unittest.TestCase):
+
+    def test_gate(self):
+        for param in [1, None, {}, [], ()]:
+            with self.assertRaises(TypeError) as e:
+                mapped.Gate(param)
+
+            self.assertEqual(e.exception.args[0], "'{}' is not a string".format(param))
+
+        for param in ["", "nand2"]:
+            with self.assertRaises(ValueError) as e:
+                mapped.Gate(param)
+
+            self.assertEqual(e.exception.args[0], ".gate expects at least two parameters")
+
+        with self.assertRaises(ValueError) as e:
+            mapped.Gate("nand2 A=a B O=o")
+
+        self.assertEqual(e.exception.args[0], "'B' parameter is incorrect (there needs to be an equal sign '=')")
+
+        gate = mapped.Gate("  nand2  A=a B=b   O=o ")
+        self.assertEqual(gate.name, "nand2")
+        self.assertEqual(gate.params, ["A=a", "B=b", "O=o"])
+        self.assertEqual(gate.bindings, {"A": "a", "B": "b", "O": "o"})
+        self.assertEqual(gate.__repr__(), "Gate('nand2 A=a B=b O=o')")
+        self.assertEqual(gate.__str__(), ".gate nand2 A=a B=b O=o")
+
+        # trusted gates are not checked
+        gate = mapped.Gate("nand2 A=a B O=o", trusted=True)
+        with self.assertRaises(ValueError):
+            gate.is_valid()
+
+    def test_mlatch(self):
+        for param in [1, None, {}, [], ()]:
+            with self.assertRaises(TypeError):
+                mapped.MLatch(param)
+
+        for param in ["", "dff", "dff D=d Q=q", "dff clk"]:
+            with self.assertRaises(ValueError) as e:
+                mapped.MLatch(param)
+
+            self.assertEqual(e.exception.args[0], ".mlatch expects a name, at least one assignment and the control")
+
+        with self.assertRaises(ValueError):
+            mapped.MLatch("dff D=d Q=q clk 0 1")
+
+        with self.assertRaises(ValueError) as e:
+            mapped.MLatch("dff D=d Q=q clk 5")
+
+        self.assertEqual(e.exception.args[0], "<init-val> should be one of these values: ['0', '1', '2', '3']")
+
+        mlatch = mapped.MLatch("dff D=d Q=q clk")
+        self.assertEqual(mlatch.bindings, {"D": "d", "Q": "q"})
+        self.assertEqual(mlatch.control, "clk")
+        self.assertIsNone(mlatch.initval)
+        self.assertEqual(mlatch.__str__(), ".mlatch dff D=d Q=q clk")
+
+        mlatch = mapped.MLatch("dff D=d Q=q NIL 1")
+        self.assertEqual(mlatch.control, "NIL")
+        self.assertEqual(mlatch.initval, "1")
+        self.assertEqual(mlatch.__repr__(), "MLatch('dff D=d Q=q NIL 1')")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -74,6 +74,12 @@ class TestSubfiles(unittest.TestCase):
         self.assertIn("a=b", subckt.params)
         self.assertEqual(subckt.__repr__(), "Subckt('circuit a=b')")
         self.assertEqual(subckt.__str__(), ".subckt circuit a=b")
+        self.assertTrue(subckt.is_valid())
+
+        # trusted parameters are checked only by is_valid()
+        subckt = subfiles.Subckt("circuit a", trusted=True)
+        with self.assertRaises(ValueError):
+            subckt.is_valid()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+
+# import timing.py from the ../../blifparser/keywords folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+keywords_path = os.path.join(curr_dir, "..", "..", "blifparser", "keywords")
+sys.path.insert(1, os.path.realpath(keywords_path))
+import timing  # noqa: E402
+
+
+class TestTiming(unittest.TestCase):
+
+    def test_rise_fall(self):
+        typeerrors_params = [1, None, {}, [], ()]
+        valueerrors_params = ["", "1", "1 2 3"]
+        nonnumeric_params = ["a 1", "1 b"]
+
+        for param in typeerrors_params:
+            with self.assertRaises(TypeError) as e:
+                timing.DefaultInputArrival(param)
+
+            self.assertEqual(e.exception.args[0], "'{}' is not a string".format(param))
+
+        for param in valueerrors_params:
+            with self.assertRaises(ValueError) as e:
+                timing.DefaultOutputRequired(param)
+
+            self.assertEqual(e.exception.args[0], ".default_output_required expects two parameters (<rise> <fall>)")
+
+        for param in nonnumeric_params:
+            with self.assertRaises(ValueError) as e:
+                timing.DefaultInputDrive(param)
+
+            self.assertEqual(e.exception.args[0], ".default_input_drive parameters need to be numbers")
+
+        arrival = timing.DefaultInputArrival("  1.5   2 ")
+        self.assertEqual(arrival.rise, 1.5)
+        self.assertEqual(arrival.fall, 2.0)
+        self.assertEqual(arrival.get_max(), 2.0)
+        self.assertEqual(arrival.get_min(), 1.5)
+        self.assertEqual(arrival.__repr__(), "DefaultInputArrival('1.5 2')")
+        self.assertEqual(arrival.__str__(), ".default_input_arrival 1.5 2")
+
+    def test_load(self):
+        for param in [1, None, {}, [], ()]:
+            with self.assertRaises(TypeError):
+                timing.DefaultOutputLoad(param)
+
+        for param in ["", "a", "1 2"]:
+            with self.assertRaises(ValueError) as e:
+                timing.DefaultOutputLoad(param)
+
+            self.assertEqual(e.exception.args[0], ".default_output_load expects one numeric parameter (<load>)")
+
+        with self.assertRaises(ValueError) as e:
+            timing.DefaultMaxInputLoad("-1")
+
+        self.assertEqual(e.exception.args[0], ".default_max_input_load <load> can't be negative")
+
+        load = timing.DefaultMaxInputLoad(" 4 ")
+        self.assertEqual(load.load, 4.0)
+        self.assertEqual(load.__repr__(), "DefaultMaxInputLoad('4')")
+        self.assertEqual(load.__str__(), ".default_max_input_load 4")
+
+
+if __name__ == '__main__':
+    unittest.main()
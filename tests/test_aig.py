@@ -0,0 +1,127 @@
+import io
+import os
+import random
+import sys
+import unittest
+
+# import aig.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import aig  # noqa: E402
+import genlib  # noqa: E402
+from helpers import LIBRARY, make_names  # noqa: E402
+from keywords import generic, mapped, subfiles  # noqa: E402
+
+
+def make_blif():
+    """
+    Returns a sequential netlist: y = (a xor b) or q, q <= y, z = not(a and q)
+    """
+    blif = generic.Blif()
+    blif.inputs = generic.Inputs("a b")
+    blif.outputs = generic.Outputs("y z")
+    blif.booleanfunctions = [
+        make_names("a b x", ["10 1", "01 1"]),
+        make_names("x q y", ["1- 1", "-1 1"]),
+        make_names("a q z", ["11 0"]),
+    ]
+    blif.latches = [generic.Latch("y q re clk 1")]
+
+    return blif
+
+
+class TestAig(unittest.TestCase):
+
+    def test_strash(self):
+        graph = aig.Aig()
+        a = graph.add_input("a")
+        b = graph.add_input("b")
+
+        self.assertEqual(graph.apply_and(a, b), graph.apply_and(b, a))
+        self.assertEqual(graph.num_ands(), 1)
+        self.assertEqual(graph.apply_and(a, a ^ 1), aig.FALSE)
+        self.assertEqual(graph.apply_and(a, aig.TRUE), a)
+        self.assertEqual(graph.apply_or(a, aig.TRUE), aig.TRUE)
+
+        with self.assertRaises(ValueError):
+            graph.add_input("c")
+
+    def test_from_blif(self):
+        graph = aig.from_blif(make_blif())
+
+        self.assertEqual(graph.inputs, ["a", "b"])
+        self.assertEqual(graph.latches, ["q"])
+        self.assertEqual(list(graph.latch_init), [aig.TRUE])
+        self.assertEqual(graph.outputs, ["y", "z"])
+
+        # exhaustive simulation: patterns are the 8 combinations of a, b, q
+        a_word, b_word, q_word = 0b11110000, 0b11001100, 0b10101010
+        values = graph.simulate([a_word, b_word], [q_word], width=8)
+        y = graph.get_lit_value(values, graph.output_lits[0], width=8)
+        z = graph.get_lit_value(values, graph.output_lits[1], width=8)
+
+        self.assertEqual(y, ((a_word ^ b_word) | q_word) & 0xff)
+        self.assertEqual(z, ~(a_word & q_word) & 0xff)
+        self.assertEqual(graph.latch_next[0], graph.output_lits[0])
+
+    def test_unsupported(self):
+        blif = make_blif()
+        blif.booleanfunctions[0] = make_names("a c x", ["10 1"])
+        with self.assertRaises(ValueError):
+            aig.from_blif(blif)
+
+        blif = make_blif()
+        blif.subcircuits.append(subfiles.Subckt("model A=a"))
+        with self.assertRaises(ValueError):
+            aig.from_blif(blif)
+
+        blif = make_blif()
+        blif.mlatches.append(mapped.MLatch("dff D=y Q=r clk 0"))
+        with self.assertRaises(ValueError):
+            aig.from_blif(blif)
+
+    def test_gates(self):
+        blif = generic.Blif()
+        blif.inputs = generic.Inputs("a b")
+        blif.outputs = generic.Outputs("y")
+        blif.gates = [mapped.Gate("nand2 a=a b=b O=n"), mapped.Gate("inv a=n O=y")]
+
+        # the gates need a cell library
+        with self.assertRaises(ValueError):
+            aig.from_blif(blif)
+
+        blif.library = genlib.parse_genlib(LIBRARY)
+        graph = aig.from_blif(blif)
+        values = graph.simulate([0b1100, 0b1010], [], width=4)
+        self.assertEqual(graph.get_lit_value(values, graph.output_lits[0], width=4), 0b1000)
+
+    def test_aiger(self):
+        graph = aig.from_blif(make_blif())
+
+        fout = io.BytesIO()
+        aig.write_aiger(graph, fout)
+        data = fout.getvalue()
+        self.assertTrue(data.startswith("aig {} 2 1 2 {}\n".format(graph.max_var(), graph.num_ands()).encode()))
+
+        copy = aig.read_aiger(io.BytesIO(data))
+        self.assertEqual(copy.inputs, graph.inputs)
+        self.assertEqual(copy.latches, graph.latches)
+        self.assertEqual(copy.outputs, graph.outputs)
+        self.assertEqual(list(copy.latch_next), list(graph.latch_next))
+        self.assertEqual(list(copy.latch_init), list(graph.latch_init))
+        self.assertEqual(list(copy.output_lits), list(graph.output_lits))
+        self.assertEqual(list(copy.and_fanins), list(graph.and_fanins))
+
+        with self.assertRaises(ValueError):
+            aig.read_aiger(io.BytesIO(b"aag 0 0 0 0 0\n"))
+
+    def test_numbers(self):
+        rng = random.Random(2)
+        for number in [0, 1, 127, 128, 16383, 16384] + [rng.randint(0, 2 ** 40) for _ in range(20)]:
+            encoded = aig.encode_number(number)
+            self.assertEqual(aig.decode_number(io.BytesIO(encoded)), number)
+
+
+if __name__ == "__main__":
+    unittest.main()
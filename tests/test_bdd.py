@@ -0,0 +1,131 @@
+import os
+import sys
+import unittest
+
+# import bdd.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import bdd  # noqa: E402
+import genlib  # noqa: E402
+from helpers import LIBRARY, make_names  # noqa: E402
+from keywords import generic, mapped  # noqa: E402
+
+
+class TestBDD(unittest.TestCase):
+
+    def test_operations(self):
+        manager = bdd.BDD(["a", "b", "c"])
+        a = manager.var("a")
+        b = manager.var("b")
+
+        self.assertEqual(manager.apply_and(a, b), manager.apply_and(b, a), "nodes should be unique")
+        self.assertEqual(manager.apply_or(a, manager.apply_not(a)), bdd.TRUE)
+        self.assertEqual(manager.apply_xor(a, a), bdd.FALSE)
+
+        # de Morgan
+        self.assertEqual(manager.apply_not(manager.apply_and(a, b)),
+                         manager.apply_or(manager.apply_not(a), manager.apply_not(b)))
+
+        with self.assertRaises(ValueError):
+            manager.var("d")
+
+    def test_counts(self):
+        manager = bdd.BDD(["a", "b", "c"])
+        a = manager.var("a")
+        c = manager.var("c")
+
+        # 8 assignments of a, b, c: 2 make "a and c" true
+        self.assertEqual(manager.sat_count(manager.apply_and(a, c)), 2)
+        self.assertEqual(manager.sat_count(manager.apply_or(a, c)), 6)
+        self.assertEqual(manager.sat_count(bdd.TRUE), 8)
+        self.assertEqual(manager.sat_count(bdd.FALSE), 0)
+
+        self.assertEqual(manager.pick_sat(manager.apply_and(a, manager.apply_not(c))), {"a": True, "c": False})
+        self.assertIsNone(manager.pick_sat(bdd.FALSE))
+        self.assertFalse(manager.is_satisfiable(manager.apply_and(a, manager.apply_not(a))))
+
+    def test_from_names(self):
+        manager = bdd.BDD()
+
+        # same function, different rows
+        f = manager.from_names(make_names("a b out", ["1- 1", "01 1"]))
+        g = manager.from_names(make_names("b a out", ["1- 1", "-1 1"]))
+        self.assertEqual(f, g)
+
+        # OFF-set cover of the same function
+        h = manager.from_names(make_names("a b out", ["00 0"]))
+        self.assertEqual(f, h)
+
+    def test_wide_covers(self):
+        # deeper than the recursion limit
+        num_inputs = sys.getrecursionlimit() + 200
+        inputs = " ".join("x{}".format(position) for position in range(num_inputs))
+        manager = bdd.BDD()
+
+        f = manager.from_names(make_names(inputs + " y", ["1" * num_inputs + " 1"]))
+        self.assertEqual(manager.sat_count(f), 1)
+        self.assertEqual(manager.num_nodes(), 2 * num_inputs + 1, "a node for each variable and each literal")
+
+        # OFF-set cover: the complement of the AND
+        g = manager.from_names(make_names(inputs + " y", ["1" * num_inputs + " 0"]))
+        self.assertEqual(g, manager.apply_not(f))
+        self.assertEqual(manager.sat_count(g), (1 << num_inputs) - 1)
+        self.assertEqual(manager.apply_xor(f, g), bdd.TRUE)
+
+    def test_cones(self):
+        blif = generic.Blif()
+        blif.inputs = generic.Inputs("a b")
+        blif.outputs = generic.Outputs("y1 y2")
+        blif.booleanfunctions = [
+            make_names("a b n", ["11 1"]),
+            make_names("n q y1", ["1- 1", "-1 1"]),
+            make_names("a q b y2", ["11- 1", "1-1 1", "-11 1"]),  # different structure, not equivalent
+        ]
+        blif.latches = [generic.Latch("y1 q 0")]
+
+        manager = bdd.BDD()
+        nodes = manager.build_cones(blif, ["y1", "y2"])
+
+        self.assertEqual(set(manager.var_names), {"a", "b", "q"})
+        self.assertNotEqual(nodes["y1"], nodes["y2"])
+        self.assertEqual(manager.sat_count(nodes["y1"]), 5)
+
+    def test_cones_gates(self):
+        blif = generic.Blif()
+        blif.inputs = generic.Inputs("a b")
+        blif.outputs = generic.Outputs("y")
+        blif.gates = [mapped.Gate("nand2 a=a b=b O=n"), mapped.Gate("inv a=n O=y")]
+
+        # the gates need a cell library, they are not variables
+        with self.assertRaises(ValueError):
+            bdd.BDD().build_cones(blif, ["y"])
+
+        blif.library = genlib.parse_genlib(LIBRARY)
+        manager = bdd.BDD()
+        nodes = manager.build_cones(blif, ["y"])
+        self.assertEqual(manager.var_names, ["a", "b"])
+        self.assertEqual(nodes["y"], manager.apply_and(manager.var("a"), manager.var("b")))
+
+    def test_collect(self):
+        manager = bdd.BDD(["a", "b", "c"])
+        a = manager.var("a")
+        b = manager.var("b")
+        c = manager.var("c")
+
+        kept = manager.ref(manager.apply_and(a, b))
+        manager.apply_or(manager.apply_and(b, c), a)
+        before = manager.num_nodes()
+
+        self.assertGreater(manager.collect(), 0)
+        self.assertLess(manager.num_nodes(), before)
+
+        # the referenced function is still there and nodes are reused
+        self.assertEqual(manager.apply_and(manager.var("a"), manager.var("b")), kept)
+        manager.deref(kept)
+        manager.collect()
+        self.assertEqual(manager.num_nodes(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# import blifparser.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import blifparser  # noqa: E402
+
+BROKEN = """.model broken
+.inputs a b
+.outputs y
+.foo
+.i 2
+hello
+.names a b y
+11 1
+.end
+"""
+
+
+class TestBlifParser(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.f_name = os.path.join(self.tmp_dir.name, "broken.blif")
+        with open(self.f_name, "w") as fout:
+            fout.write(BROKEN)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_diagnostics(self):
+        problems = blifparser.BlifParser(self.f_name).blif.problems
+
+        self.assertEqual(problems, [
+            "[ERROR][LINE ~ 4] Invalid keyword: '.foo'",
+            "[ERROR][LINE ~ 5] Unexpected .i keyword: needs to be between .start_kiss and .end_kiss keywords",
+            "[ERROR][LINE ~ 6] Unexpected text: 'hello'",
+        ])
+        self.assertEqual([problem.code for problem in problems],
+                         ["invalid-keyword", "unexpected-fsm-keyword", "unexpected-text"])
+        self.assertEqual([problem.line for problem in problems], [4, 5, 6])
+        self.assertFalse(problems.stopped)
+
+    def test_limits(self):
+        problems = blifparser.BlifParser(self.f_name, max_errors=2).blif.problems
+        self.assertEqual([problem.code for problem in problems], ["invalid-keyword", "unexpected-fsm-keyword"])
+        self.assertTrue(problems.stopped)
+
+        parser = blifparser.BlifParser(self.f_name, fail_fast=True)
+        self.assertEqual([problem.code for problem in parser.blif.problems], ["invalid-keyword"])
+        self.assertTrue(parser.blif.problems.stopped)
+        # the parsing stopped at the first error: the following lines were not read
+        self.assertEqual(parser.blif.booleanfunctions, [])
+
+    def test_trusted(self):
+        with open(self.f_name, "w") as fout:
+            fout.write(".model trusted\n.inputs a b\n.outputs y\n.latch y q xx clk 0\n"
+                       ".subckt sub a\n.names a q y\n1 1\n.end\n")
+
+        parser = blifparser.BlifParser(self.f_name, trusted=True)
+        self.assertEqual(parser.blif.problems, [])
+        self.assertEqual(parser.blif.latches[0].type, "xx")
+        self.assertEqual(parser.blif.subcircuits[0].params, ["a"])
+
+        problems = parser.validate()
+        self.assertIs(problems, parser.blif.problems)
+        self.assertEqual([problem.code for problem in problems], ["latch-problem", "subckt-problem", "names-problem"])
+        self.assertIs(problems[0].obj, parser.blif.latches[0])
+
+        # the same file is rejected while parsing without the trusted mode
+        problems = blifparser.BlifParser(self.f_name).blif.problems
+        self.assertEqual([problem.code for problem in problems], ["parsing-error", "parsing-error", "names-problem"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+# import cec.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import cec  # noqa: E402
+from helpers import make_names  # noqa: E402
+from keywords import generic, subfiles  # noqa: E402
+
+
+def make_blif(functions, inputs="a b c", outputs="y z", latches=()):
+    blif = generic.Blif()
+    blif.inputs = generic.Inputs(inputs)
+    blif.outputs = generic.Outputs(outputs)
+    blif.booleanfunctions = [make_names(params, rows) for params, rows in functions]
+    blif.latches = [generic.Latch(params) for params in latches]
+    return blif
+
+
+def make_golden():
+    """
+    y = (a AND b) OR c, z = a XOR b
+    """
+    return make_blif([
+        ("a b n1", ["11 1"]),
+        ("n1 c y", ["1- 1", "-1 1"]),
+        ("a b z", ["01 1", "10 1"]),
+    ])
+
+
+def evaluate(t_blif, values):
+    """
+    Returns the value of each net of the <t_blif> netlist given the <values> of the inputs.
+    """
+    values = dict(values)
+    for function in cec.get_functions(t_blif):
+        inputs = [values.get(net, 0) for net in function.inputs]
+        value = int(cec.simulate_cover(inputs, function.truthtable, 1))
+        values[function.output] = value
+
+    return values
+
+
+class TestCec(unittest.TestCase):
+
+    def test_simulate_cover(self):
+        self.assertEqual(cec.simulate_cover([0b1100, 0b1010], [["1", "1", "1"]], 0b1111), 0b1000)
+        self.assertEqual(cec.simulate_cover([0b1100, 0b1010], [["1", "1", "0"]], 0b1111), 0b0111)
+        self.assertEqual(cec.simulate_cover([0b1100, 0b1010], [["0", "-", "1"]], 0b1111), 0b0011)
+        self.assertEqual(cec.simulate_cover([], [], 0b1111), 0)
+
+    def test_equivalent(self):
+        # De Morgan, different internal nets and an AND-OR xor
+        revised = make_blif([
+            ("a b m1", ["0- 1", "-0 1"]),
+            ("m1 c y", ["10 0"]),
+            ("a b m2", ["1- 1", "-1 1"]),
+            ("a b m3", ["11 1"]),
+            ("m2 m3 z", ["10 1"]),
+        ])
+        result = cec.check_equivalence(make_golden(), revised)
+
+        self.assertTrue(result.equivalent)
+        self.assertEqual(result.outputs, ["y", "z"])
+        self.assertEqual(result.failing, [])
+        self.assertEqual(result.counterexample, {})
+        self.assertGreater(result.merged, 0)
+        self.assertEqual(str(result), "equivalent (2 outputs)\n")
+
+    def test_identical(self):
+        result = cec.check_equivalence(make_golden(), make_golden())
+        self.assertTrue(result.equivalent)
+        self.assertEqual(result.sat_calls, 0)
+
+    def test_not_equivalent(self):
+        # z is an OR instead of a XOR
+        revised = make_blif([
+            ("a b n1", ["11 1"]),
+            ("c n1 y", ["1- 1", "-1 1"]),
+            ("a b z", ["1- 1", "-1 1"]),
+        ])
+        for num_patterns in (256, 1):
+            result = cec.check_equivalence(make_golden(), revised, num_patterns=num_patterns, seed=3)
+
+            self.assertFalse(result.equivalent)
+            self.assertEqual(result.failing, ["z"])
+            self.assertIn("failing outputs: z\n", str(result))
+            golden_values = evaluate(make_golden(), result.counterexample)
+            revised_values = evaluate(revised, result.counterexample)
+            self.assertNotEqual(golden_values["z"], revised_values["z"])
+
+    def test_rare_difference(self):
+        # the outputs differ only when all the 12 inputs are 1 (random simulation hardly finds it)
+        inputs = " ".join("i{}".format(position) for position in range(12))
+        golden = make_blif([(inputs + " y", ["0" * 12 + " 1"])], inputs=inputs, outputs="y")
+        revised = make_blif([(inputs + " y", ["0" * 12 + " 1", "1" * 12 + " 1"])], inputs=inputs, outputs="y")
+        result = cec.check_equivalence(golden, revised, num_patterns=8)
+
+        self.assertFalse(result.equivalent)
+        self.assertEqual(result.counterexample, {"i{}".format(position): 1 for position in range(12)})
+        self.assertGreater(result.sat_calls, 0)
+
+    def test_latches(self):
+        golden = make_blif([("a b n1", ["11 1"]), ("n1 q y", ["11 1"])], outputs="y", latches=["n1 q 0"])
+        revised = make_blif([("b a m1", ["11 1"]), ("q m1 y", ["11 1"])], outputs="y", latches=["m1 q 0"])
+        result = cec.check_equivalence(golden, revised)
+        self.assertTrue(result.equivalent)
+        self.assertEqual(result.outputs, ["y", "latch q"])
+
+        revised = make_blif([("b a m1", ["1- 1"]), ("q m1 y", ["11 1"])], outputs="y", latches=["m1 q 0"])
+        result = cec.check_equivalence(golden, revised)
+        self.assertFalse(result.equivalent)
+        self.assertEqual(result.failing, ["y", "latch q"])
+
+        revised = make_blif([("b a m1", ["11 1"]), ("q m1 y", ["11 1"])], outputs="y", latches=["m1 r 0"])
+        result = cec.check_equivalence(golden, revised)
+        self.assertFalse(result.equivalent)
+        self.assertEqual(result.unmatched, ["latch q", "latch r"])
+
+    def test_unsupported(self):
+        golden = make_golden()
+        golden.subcircuits = [subfiles.Subckt("adder a=a")]
+        self.assertRaises(ValueError, cec.check_equivalence, golden, make_golden())
+
+        golden = make_blif([("a z y", ["11 1"]), ("y c z", ["11 1"])])
+        self.assertRaises(ValueError, cec.check_equivalence, golden, make_golden())
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            golden_path = os.path.join(tmp_dir, "golden.blif")
+            revised_path = os.path.join(tmp_dir, "revised.blif")
+            with open(golden_path, "w") as fout:
+                fout.write(".model top\n.inputs a b\n.outputs y\n.names a b y\n11 1\n.end\n")
+
+            with open(revised_path, "w") as fout:
+                fout.write(".model top\n.inputs a b\n.outputs y\n.names a b y\n0- 0\n-0 0\n.end\n")
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), self.assertRaises(SystemExit) as cm:
+                cec.main([golden_path, revised_path])
+            self.assertEqual(cm.exception.code, 0)
+            self.assertEqual(output.getvalue(), "equivalent (1 outputs)\n")
+
+            with open(revised_path, "w") as fout:
+                fout.write(".model top\n.inputs a b\n.outputs y\n.names a b y\n1- 1\n.end\n")
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), self.assertRaises(SystemExit) as cm:
+                cec.main([golden_path, revised_path])
+            self.assertEqual(cm.exception.code, 1)
+            self.assertIn("counterexample: a=1 b=0\n", output.getvalue())
+
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as cm:
+                cec.main([golden_path])
+            self.assertEqual(cm.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
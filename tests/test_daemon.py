@@ -0,0 +1,198 @@
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# import daemon.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import blifparser  # noqa: E402
+import daemon  # noqa: E402
+
+TOP = """.model top
+.search sub/adder.blif
+.inputs a b
+.outputs s
+.subckt adder x=a y=b z=s
+.end
+"""
+
+ADDER = """.model adder
+.inputs x y
+.outputs z
+.names x y z
+10 1
+01 1
+.end
+"""
+
+BROKEN = """.model broken
+.inputs a
+.outputs b
+.names a b
+1 1 1
+.end
+"""
+
+
+def write_file(filepath, text, delay=0):
+    """
+    Writes <text> in <filepath>, the modification time is moved <delay> seconds in the future.
+    """
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, "w") as fout:
+        fout.write(text)
+
+    if delay:
+        os.utime(filepath, (time.time() + delay, time.time() + delay))
+
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self.tmp_dir.name)
+        write_file(os.path.join(self.root, "top.blif"), TOP)
+        write_file(os.path.join(self.root, "sub", "adder.blif"), ADDER)
+        self.workspace = daemon.Workspace(self.root)
+        self.server = daemon.Server(self.workspace)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def call(self, method, params=None, request_id=1):
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            request["params"] = params
+
+        return json.loads(self.server.handle_line(json.dumps(request)))
+
+    def test_workspace(self):
+        changes = self.workspace.refresh()
+        self.assertEqual(sorted(changes["parsed"]),
+                         [os.path.join(self.root, "sub", "adder.blif"), os.path.join(self.root, "top.blif")])
+        self.assertEqual(self.workspace.num_parses, 2)
+
+        # unchanged files are not parsed again
+        parser = self.workspace.get("top.blif")
+        self.assertIsInstance(parser, blifparser.BlifParser)
+        self.assertEqual(self.workspace.refresh(), {"parsed": [], "removed": []})
+        self.assertIs(self.workspace.get(os.path.join(self.root, "top.blif")), parser)
+        self.assertEqual(self.workspace.num_parses, 2)
+
+        # only the changed file is parsed again
+        write_file(os.path.join(self.root, "top.blif"), TOP.replace("a b", "a b c"), delay=10)
+        self.assertEqual(self.workspace.refresh()["parsed"], [os.path.join(self.root, "top.blif")])
+        self.assertEqual(self.workspace.num_parses, 3)
+        self.assertEqual(self.workspace.get("top.blif").blif.inputs.inputs, ["a", "b", "c"])
+
+        # deleted files are forgotten
+        os.remove(os.path.join(self.root, "sub", "adder.blif"))
+        self.assertEqual(self.workspace.refresh()["removed"], [os.path.join(self.root, "sub", "adder.blif")])
+        with self.assertRaises(FileNotFoundError):
+            self.workspace.get("sub/adder.blif")
+
+    def test_lint(self):
+        write_file(os.path.join(self.root, "broken.blif"), BROKEN)
+
+        response = self.call("lint", {"path": "broken.blif"})
+        self.assertEqual(response["id"], 1)
+        problems = response["result"]["problems"]
+        self.assertEqual([problem["code"] for problem in problems], ["names-problem"])
+        self.assertFalse(response["result"]["stopped"])
+
+        response = self.call("lint_all", request_id="all")
+        self.assertEqual(response["id"], "all")
+        self.assertEqual(sorted(response["result"]), sorted(self.call("files")["result"]))
+        self.assertEqual(response["result"][os.path.join(self.root, "top.blif")]["problems"], [])
+
+    def test_graph_queries(self):
+        response = self.call("graph", ["top.blif"])
+        nodes = response["result"]["nodes"]
+        self.assertEqual([node["type"] for node in nodes], ["input", "input", "output", "subckt"])
+
+        # the .search-ed file is parsed once and used to find the outputs of the sub-circuit
+        self.assertEqual(nodes[3]["inputs"], ["a", "b"])
+        self.assertEqual(nodes[3]["outputs"], ["s"])
+        self.assertEqual(len(response["result"]["edges"]), 3)
+        num_parses = self.workspace.num_parses
+        self.call("graph", ["top.blif"])
+        self.assertEqual(self.workspace.num_parses, num_parses)
+
+        self.assertEqual(self.call("levels", {"path": "sub/adder.blif"})["result"], {"z": 1})
+        self.assertEqual(self.call("fanin_cone", {"path": "sub/adder.blif", "net": "z"})["result"], ["x", "y", "z"])
+        self.assertEqual(self.call("fanout_cone", ["sub/adder.blif", "x"])["result"], ["x", "z"])
+
+    def test_errors(self):
+        self.assertEqual(json.loads(self.server.handle_line("{"))["error"]["code"], daemon.PARSE_ERROR)
+        self.assertEqual(json.loads(self.server.handle_line("[]"))["error"]["code"], daemon.INVALID_REQUEST)
+        self.assertEqual(self.call("foo")["error"]["code"], daemon.METHOD_NOT_FOUND)
+        self.assertEqual(self.call("lint")["error"]["code"], daemon.INVALID_PARAMS)
+        self.assertEqual(self.call("lint", {"file": "top.blif"})["error"]["code"], daemon.INVALID_PARAMS)
+        self.assertEqual(self.call("lint", {"path": "missing.blif"})["error"]["code"], daemon.SERVER_ERROR)
+        self.assertEqual(self.call("fanin_cone", ["top.blif", "nothing"])["error"]["code"], daemon.SERVER_ERROR)
+
+        # notifications don't have a response
+        self.assertIsNone(self.server.handle_line(json.dumps({"jsonrpc": "2.0", "method": "refresh"})))
+        self.assertIsNone(self.server.handle_line("  \n"))
+
+    def test_stream(self):
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "refresh"},
+            {"jsonrpc": "2.0", "method": "refresh"},
+            {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+            {"jsonrpc": "2.0", "id": 3, "method": "files"},
+        ]
+        fin = io.StringIO("".join(json.dumps(request) + "\n" for request in requests))
+        fout = io.StringIO()
+        self.server.serve_stream(fin, fout)
+
+        responses = [json.loads(line) for line in fout.getvalue().splitlines()]
+        self.assertEqual([response["id"] for response in responses], [1, 2])
+        self.assertEqual(len(responses[0]["result"]["parsed"]), 2)
+        self.assertFalse(self.server.running)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+    def test_unix_socket(self):
+        socket_path = os.path.join(self.root, "server.sock")
+        thread = threading.Thread(target=self.server.serve_unix, args=(socket_path,))
+        thread.start()
+
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.01)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+            stream = client.makefile("rw")
+            stream.write(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "lint", "params": ["top.blif"]}) + "\n")
+            stream.write(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "shutdown"}) + "\n")
+            stream.flush()
+            self.assertEqual(json.loads(stream.readline())["result"]["problems"], [])
+            self.assertEqual(json.loads(stream.readline())["id"], 2)
+
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(socket_path))
+
+    def test_watch(self):
+        stop = threading.Event()
+        self.workspace.watch(0.01, stop)
+        for _ in range(200):
+            if self.workspace.num_parses == 2:
+                break
+            time.sleep(0.01)
+
+        stop.set()
+        self.assertEqual(len(self.workspace.files), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
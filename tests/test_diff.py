@@ -0,0 +1,210 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+# import diff.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import cec  # noqa: E402
+import diff  # noqa: E402
+from helpers import make_names  # noqa: E402
+from keywords import generic, subfiles  # noqa: E402
+
+
+def make_blif(renamed=False):
+    """
+    Returns a small sequential netlist:
+
+    a, b --> n1 --> n2 --> out (and latch q)
+    c -------------/
+
+    With <renamed> the internal nets have other names, the keywords, the inputs and the rows
+    are in a different order.
+    """
+    n1, n2 = ("t7", "t3") if renamed else ("n1", "n2")
+    blif = generic.Blif()
+    blif.inputs = generic.Inputs("a b c")
+    blif.outputs = generic.Outputs("out q")
+    blif.booleanfunctions = [
+        make_names("a b " + n1, ["11 1"]),
+        make_names("{} c {}".format(n1, n2), ["1- 1", "-1 1"]),
+        make_names(n2 + " out", ["0 1"]),
+    ]
+    blif.latches = [generic.Latch(n2 + " q re clk 0")]
+    if renamed:
+        blif.booleanfunctions = [
+            make_names(n2 + " out", ["0 1"]),
+            make_names("c {} {}".format(n1, n2), ["1- 1", "-1 1"]),
+            make_names("b a " + n1, ["11 1"]),
+        ]
+
+    return blif
+
+
+class TestDiff(unittest.TestCase):
+
+    def test_identical(self):
+        self.assertTrue(diff.diff_blifs(make_blif(), make_blif()).is_empty())
+        self.assertTrue(diff.diff_blifs(make_blif(), make_blif(renamed=True)).is_empty())
+        self.assertEqual(str(diff.diff_blifs(make_blif(), make_blif(renamed=True))), "")
+
+    def test_changed(self):
+        new = make_blif(renamed=True)
+        new.booleanfunctions[0].truthtable = [["1", "1"]]
+        result = diff.diff_blifs(make_blif(), new)
+
+        self.assertEqual(len(result.changed), 1)
+        self.assertEqual(result.changed[0][0].output, "out")
+        self.assertIs(result.changed[0][1], new.booleanfunctions[0])
+        self.assertEqual(result.added, [])
+        self.assertEqual(result.removed, [])
+        self.assertIn("changed:\n- .names n2 out\n- 0 1\n+ .names t3 out\n+ 1 1\n", str(result))
+
+    def test_changed_cone(self):
+        # n1 becomes an OR: only n1 is changed (its fanout reads the same nets)
+        new = make_blif()
+        new.booleanfunctions[0].truthtable = [["1", "-", "1"], ["-", "1", "1"]]
+        result = diff.diff_blifs(make_blif(), new)
+
+        self.assertEqual([(old.output, new.output) for old, new in result.changed], [("n1", "n1")])
+        self.assertEqual(result.added, [])
+        self.assertEqual(result.removed, [])
+
+        # a row of the first function of a chain is edited
+        chain = [("a b n1", ["11 1"]), ("n1 c n2", ["11 1"]), ("n2 n3", ["0 1"]), ("n3 a y", ["1- 1", "-1 1"])]
+        old = generic.Blif()
+        old.inputs = generic.Inputs("a b c")
+        old.outputs = generic.Outputs("y")
+        old.booleanfunctions = [make_names(params, rows) for params, rows in chain]
+        new = generic.Blif()
+        new.inputs = generic.Inputs("a b c")
+        new.outputs = generic.Outputs("y")
+        new.booleanfunctions = [make_names(params, rows) for params, rows in chain]
+        new.booleanfunctions[0].truthtable = [["1", "-", "1"]]
+        result = diff.diff_blifs(old, new)
+
+        self.assertEqual(len(result.changed), 1)
+        self.assertIs(result.changed[0][1], new.booleanfunctions[0])
+        self.assertEqual(str(result), "changed:\n- .names a b n1\n- 11 1\n+ .names a b n1\n+ 1- 1\n")
+
+    def test_added_removed(self):
+        new = make_blif()
+        new.booleanfunctions.append(make_names("a c n3", ["10 1"]))
+        new.latches = []
+        result = diff.diff_blifs(make_blif(), new)
+
+        self.assertEqual([element.output for element in result.added], ["n3"])
+        self.assertEqual([element.output for element in result.removed], ["q"])
+        self.assertEqual(result.changed, [])
+
+        result = diff.diff_blifs(new, make_blif())
+        self.assertEqual([element.output for element in result.removed], ["n3"])
+        self.assertEqual([element.output for element in result.added], ["q"])
+
+    def test_duplicates(self):
+        new = make_blif()
+        new.booleanfunctions.append(make_names("b a n4", ["11 1"]))
+        result = diff.diff_blifs(make_blif(), new)
+
+        self.assertEqual(len(result.added), 1)
+        self.assertEqual(result.removed, [])
+
+    def test_io(self):
+        new = make_blif()
+        new.inputs = generic.Inputs("a b c d")
+        new.outputs = generic.Outputs("out")
+        result = diff.diff_blifs(make_blif(), new)
+
+        self.assertEqual(result.added_inputs, ["d"])
+        self.assertEqual(result.removed_inputs, [])
+        self.assertEqual(result.added_outputs, [])
+        self.assertEqual(result.removed_outputs, ["q"])
+        self.assertFalse(result.is_empty())
+        self.assertIn("+ .inputs d\n", str(result))
+        self.assertIn("- .outputs q\n", str(result))
+
+    def test_subckt(self):
+        old = make_blif()
+        old.subcircuits = [subfiles.Subckt("adder x=a y=n1 s=s0")]
+        new = make_blif(renamed=True)
+        new.subcircuits = [subfiles.Subckt("adder y=t7 s=s0 x=a")]
+        self.assertTrue(diff.diff_blifs(old, new).is_empty())
+
+        new = make_blif(renamed=True)
+        new.subcircuits = [subfiles.Subckt("adder y=t3 s=s0 x=a")]
+        result = diff.diff_blifs(old, new)
+        self.assertEqual(result.added, new.subcircuits)
+        self.assertEqual(result.removed, old.subcircuits)
+
+    def test_swapped_outputs(self):
+        # the logic of the y and z primary outputs is swapped
+        old = generic.Blif()
+        old.inputs = generic.Inputs("a b")
+        old.outputs = generic.Outputs("y z")
+        old.booleanfunctions = [make_names("a b y", ["11 1"]), make_names("a b z", ["1- 1", "-1 1"])]
+        new = generic.Blif()
+        new.inputs = generic.Inputs("a b")
+        new.outputs = generic.Outputs("y z")
+        new.booleanfunctions = [make_names("a b y", ["1- 1", "-1 1"]), make_names("a b z", ["11 1"])]
+        result = diff.diff_blifs(old, new)
+
+        self.assertFalse(result.is_empty())
+        self.assertEqual(sorted(old_element.output for old_element, _ in result.changed), ["y", "z"])
+        self.assertEqual(cec.check_equivalence(old, new).failing, ["y", "z"])
+
+        # the swapped logic of two latch inputs is a difference of the latches
+        old = make_blif()
+        old.latches.append(generic.Latch("n1 p re clk 0"))
+        new = make_blif(renamed=True)
+        new.latches = [generic.Latch("t7 q re clk 0"), generic.Latch("t3 p re clk 0")]
+        result = diff.diff_blifs(old, new)
+        self.assertEqual(sorted(old_element.output for old_element, _ in result.changed), ["p", "q"])
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            old_path = os.path.join(tmp_dir, "old.blif")
+            new_path = os.path.join(tmp_dir, "new.blif")
+            with open(old_path, "w") as fout:
+                fout.write(".model top\n.inputs a b\n.outputs y\n.names a b n1\n11 1\n.names n1 y\n0 1\n.end\n")
+
+            with open(new_path, "w") as fout:
+                fout.write(".model top\n.inputs a b\n.outputs y\n.names b a x\n11 1\n.names x y\n0 1\n.end\n")
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), self.assertRaises(SystemExit) as cm:
+                diff.main([old_path, new_path])
+            self.assertEqual(cm.exception.code, 0)
+            self.assertEqual(output.getvalue(), "")
+
+            with open(new_path, "w") as fout:
+                fout.write(".model top\n.inputs a b\n.outputs y\n.names b a x\n11 1\n.names x y\n1 1\n.end\n")
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), self.assertRaises(SystemExit) as cm:
+                diff.main([old_path, new_path])
+            self.assertEqual(cm.exception.code, 1)
+            self.assertIn("changed:\n- .names n1 y\n", output.getvalue())
+
+            with open(old_path, "w") as fout:
+                fout.write(".model top\n.inputs a b\n.outputs y z\n.names a b y\n11 1\n.names a b z\n00 0\n.end\n")
+
+            with open(new_path, "w") as fout:
+                fout.write(".model top\n.inputs a b\n.outputs y z\n.names a b y\n00 0\n.names a b z\n11 1\n.end\n")
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), self.assertRaises(SystemExit) as cm:
+                diff.main([old_path, new_path])
+            self.assertEqual(cm.exception.code, 1)
+            self.assertIn("- .names a b y\n- 11 1\n+ .names a b y\n+ 00 0\n", output.getvalue())
+
+            with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as cm:
+                diff.main([old_path])
+            self.assertEqual(cm.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import io
+import itertools
+import os
+import sys
+import unittest
+
+# import export.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import export  # noqa: E402
+import sat  # noqa: E402
+from helpers import make_names  # noqa: E402
+from keywords import generic, subfiles  # noqa: E402
+
+
+def make_blif():
+    """
+    y = (a AND b) OR NOT c, z = NOT (a AND q), latch q <- y
+    """
+    blif = generic.Blif()
+    blif.model = generic.Model("top")
+    blif.inputs = generic.Inputs("a b c")
+    blif.outputs = generic.Outputs("y z")
+    blif.booleanfunctions = [
+        make_names("a b n1", ["11 1"]),
+        make_names("n1 c y", ["1- 1", "-0 1"]),
+        make_names("a q z", ["11 0"]),
+    ]
+    blif.latches = [generic.Latch("y q re clk 0")]
+    return blif
+
+
+def read_dimacs(text):
+    """
+    Returns the (variables of the comments, number of variables, clauses) of a DIMACS file.
+    """
+    variables = {}
+    clauses = []
+    header = None
+    for line in text.splitlines():
+        fields = line.split()
+        if fields[0] == "c":
+            if fields[1] != "model":
+                variables[(fields[1], fields[2])] = [int(field) for field in fields[3:]]
+        elif fields[0] == "p":
+            header = (int(fields[2]), int(fields[3]))
+        else:
+            clauses.append([int(field) for field in fields[:-1]])
+            assert fields[-1] == "0"
+
+    assert header[1] == len(clauses)
+    assert all(abs(lit) <= header[0] for clause in clauses for lit in clause)
+    return variables, header[0], clauses
+
+
+class TestExport(unittest.TestCase):
+
+    def test_dimacs(self):
+        fout = io.StringIO()
+        export.write_dimacs(make_blif(), fout)
+        text = fout.getvalue()
+        self.assertTrue(text.startswith("c model top\nc input a 1\nc input b 2\nc input c 3\n"))
+
+        variables, num_vars, clauses = read_dimacs(text)
+        self.assertEqual(variables[("input", "a")], [1])
+        self.assertEqual(variables[("latch", "q")], [4, variables[("output", "y")][0]])
+        self.assertGreater(num_vars, len(variables))
+
+        # each input assignment has exactly one solution, with the expected outputs
+        y = variables[("output", "y")][0]
+        z = variables[("output", "z")][0]
+        for a, b, c, q in itertools.product([0, 1], repeat=4):
+            solver = sat.Solver()
+            for clause in clauses:
+                solver.add_clause(clause)
+
+            assumptions = [1 if a else -1, 2 if b else -2, 3 if c else -3, 4 if q else -4]
+            self.assertTrue(solver.solve(assumptions))
+            self.assertEqual(solver.get_value(y), bool((a and b) or not c))
+            self.assertEqual(solver.get_value(z), not (a and q))
+
+    def test_dimacs_constants(self):
+        blif = generic.Blif()
+        blif.outputs = generic.Outputs("one zero")
+        blif.booleanfunctions = [make_names("one", ["1"]), make_names("zero", [])]
+        fout = io.StringIO()
+        export.write_dimacs(blif, fout)
+        self.assertEqual(fout.getvalue(), "c output one 1\nc output zero 2\np cnf 2 2\n1 0\n-2 0\n")
+
+    def test_dimacs_unsupported(self):
+        blif = make_blif()
+        blif.subcircuits = [subfiles.Subckt("adder x=a")]
+        self.assertRaises(ValueError, export.write_dimacs, blif, io.StringIO())
+
+    def test_identifiers(self):
+        self.assertEqual(export.get_identifier("n_1$"), "n_1$")
+        self.assertEqual(export.get_identifier("data[3]"), "\\data[3] ")
+        self.assertEqual(export.get_identifier("1a"), "\\1a ")
+        self.assertEqual(export.get_identifier("wire"), "\\wire ")
+
+    def test_expressions(self):
+        self.assertEqual(export.get_expression(["a", "b"], [["1", "1", "1"]]), "a & b")
+        self.assertEqual(export.get_expression(["a", "b"], [["1", "-", "1"], ["-", "0", "1"]]), "a | ~b")
+        self.assertEqual(export.get_expression(["a", "b"], [["1", "1", "0"], ["0", "0", "0"]]),
+                         "~((a & b) | (~a & ~b))")
+        self.assertEqual(export.get_expression(["a"], [["-", "1"]]), "1'b1")
+        self.assertEqual(export.get_expression([], []), "1'b0")
+
+    def test_verilog(self):
+        blif = make_blif()
+        blif.latches.append(generic.Latch("n1 r 1"))
+        blif.subcircuits = [subfiles.Subckt("adder x=a y=n1 s=s[0]")]
+        fout = io.StringIO()
+        export.write_verilog(blif, fout)
+
+        self.assertEqual(fout.getvalue(), (
+            "module top(\n"
+            "    a,\n"
+            "    b,\n"
+            "    c,\n"
+            "    clock,\n"
+            "    y,\n"
+            "    z\n"
+            ");\n"
+            "    input a;\n"
+            "    input b;\n"
+            "    input c;\n"
+            "    input clock;\n"
+            "    output y;\n"
+            "    output z;\n"
+            "    reg q;\n"
+            "    reg r;\n"
+            "    wire n1;\n"
+            "    wire clk;\n"
+            "    wire \\s[0] ;\n"
+            "\n"
+            "    assign n1 = a & b;\n"
+            "    assign y = n1 | ~c;\n"
+            "    assign z = ~(a & q);\n"
+            "    always @(posedge clk) q <= y;\n"
+            "    initial q = 1'b0;\n"
+            "    always @(posedge clock) r <= n1;\n"
+            "    initial r = 1'b1;\n"
+            "    adder s0 (.x(a), .y(n1), .s(\\s[0] ));\n"
+            "endmodule\n"
+        ))
+
+    def test_verilog_latch_types(self):
+        blif = generic.Blif()
+        blif.inputs = generic.Inputs("d clock en")
+        blif.outputs = generic.Outputs("q1 q2 q3 q4")
+        blif.latches = [generic.Latch("d q1 fe clock"), generic.Latch("d q2 ah en"),
+                        generic.Latch("d q3 al en"), generic.Latch("d q4 as NIL 3")]
+        fout = io.StringIO()
+        export.write_verilog(blif, fout, clock="clock")
+        text = fout.getvalue()
+
+        self.assertTrue(text.startswith("module top(\n    d,\n    clock,\n    en,\n"))
+        self.assertIn("    always @(negedge clock) q1 <= d;\n", text)
+        self.assertIn("    always @(*) if (en) q2 <= d;\n", text)
+        self.assertIn("    always @(*) if (!en) q3 <= d;\n", text)
+        self.assertIn("    always @(*) q4 <= d;\n", text)
+        self.assertNotIn("initial", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import itertools
+import os
+import sys
+import unittest
+
+# import fsmencode.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import fsmencode  # noqa: E402
+import fsmsim  # noqa: E402
+from keywords import fsm, generic  # noqa: E402
+
+
+# detects two consecutive ones on the first input, the second input resets the FSM
+DETECTOR = [
+    "-1 a a 0",
+    "00 a a 0",
+    "10 a b 0",
+    "-1 b a 0",
+    "00 b a 0",
+    "10 b c 1",
+    "-1 c a 0",
+    "00 c a 0",
+    "10 c c 1",
+]
+
+
+def make_blif(rows, reset=None, codes=()):
+    """
+    Returns a Blif() object with an FSM (2 inputs, 1 output) with the <rows> transition table.
+    """
+    blif = generic.Blif()
+    blif.model = generic.Model("detector")
+    blif.inputs = generic.Inputs("x r")
+    blif.outputs = generic.Outputs("z")
+    blif.fsm.ispresent = True
+    blif.fsm.i = fsm.I("2")
+    blif.fsm.o = fsm.O("1")
+    blif.fsm.transtable = [row.split() for row in rows]
+    if reset is not None:
+        blif.fsm.r = fsm.R(reset)
+
+    blif.fsm.statecodes = [fsm.Code(code) for code in codes]
+    return blif
+
+
+def evaluate(function, values):
+    """
+    Returns the value of the <function> boolean function (ON-set rows only) given the <values> of its inputs.
+    """
+    for row in function.truthtable:
+        if all(char == "-" or char == values[net] for char, net in zip(row[:-1], function.inputs)):
+            return "1"
+
+    return "0"
+
+
+def simulate_logic(blif, stream):
+    """
+    Simulates the latches and boolean functions of the <blif> object, returns the outputs of each cycle.
+    """
+    state = {latch.output: latch.initval for latch in blif.latches}
+    drivers = {function.output: function for function in blif.booleanfunctions}
+    results = []
+    for vector in stream:
+        values = dict(state)
+        values.update(zip(blif.inputs.inputs, vector))
+        results.append(evaluate(drivers["z"], values))
+        state = {latch.output: evaluate(drivers[latch.input], values) for latch in blif.latches}
+
+    return results
+
+
+class TestFsmEncode(unittest.TestCase):
+
+    def test_encodings(self):
+        t_fsm = make_blif(DETECTOR, reset="b", codes=["a 11", "b 01", "c 10"]).fsm
+
+        self.assertEqual(fsmencode.get_encoding(t_fsm), {"b": "01", "a": "11", "c": "10"})
+        self.assertEqual(fsmencode.get_encoding(t_fsm, "binary"), {"b": "00", "a": "01", "c": "10"})
+        self.assertEqual(fsmencode.get_encoding(t_fsm, "onehot"), {"b": "100", "a": "010", "c": "001"})
+
+        with self.assertRaises(ValueError):
+            fsmencode.get_encoding(t_fsm, "gray")
+
+        t_fsm.statecodes.pop()
+        with self.assertRaises(ValueError):
+            fsmencode.get_encoding(t_fsm, "code")
+
+        t_fsm.statecodes.append(fsm.Code("c 01"))
+        with self.assertRaises(ValueError):
+            fsmencode.get_encoding(t_fsm, "code")
+
+    def test_encode_fsm(self):
+        stream = [vector for vector in itertools.product("01", repeat=2)] * 3
+        stream += [("1", "0"), ("1", "0"), ("1", "0"), ("1", "1"), ("1", "0")]
+
+        for encoding in ["binary", "onehot", "code"]:
+            blif = make_blif(DETECTOR, codes=["a 10", "b 11", "c 01"])
+            _, expected = fsmsim.simulate(blif.fsm, ["".join(vector) for vector in stream])
+
+            codes = fsmencode.encode_fsm(blif, encoding, clock="clk")
+            self.assertFalse(blif.fsm.ispresent)
+            self.assertEqual(len(blif.latches), len(codes["a"]))
+            self.assertEqual(blif.latches[0].control, "clk")
+            self.assertEqual(simulate_logic(blif, stream), expected, encoding)
+
+        # the latches are initialized with the code of the reset state
+        self.assertEqual([latch.initval for latch in blif.latches], ["1", "0"])
+        self.assertEqual(str(blif.booleanfunctions[-1]), ".names x r state0 state1 z\n1011 1\n1001 1\n")
+
+    def test_names(self):
+        blif = make_blif(DETECTOR)
+        blif.booleanfunctions.append(generic.Names("x state0", False))
+        fsmencode.encode_fsm(blif)
+
+        self.assertEqual([latch.output for latch in blif.latches], ["state0_", "state1"])
+        self.assertEqual([latch.input for latch in blif.latches], ["state0_next", "state1_next"])
+
+        with self.assertRaises(ValueError):
+            fsmencode.encode_fsm(blif)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import random
+import sys
+import unittest
+
+# import fsmmin.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import fsmmin  # noqa: E402
+import fsmsim  # noqa: E402
+from helpers import make_fsm  # noqa: E402
+from keywords import fsm  # noqa: E402
+
+
+# detects two consecutive ones on the first input (b, c and d are equivalent, e is not reachable)
+DETECTOR = [
+    "-1 a a 0",
+    "00 a a 0",
+    "10 a b 0",
+    "-1 b a 0",
+    "00 b a 0",
+    "10 b c 1",
+    "-1 c a 0",
+    "00 c a 0",
+    "10 c d 1",
+    "0- d a 0",
+    "11 d a 0",
+    "10 d c 1",
+    "-- e c 1",
+]
+
+
+class TestFsmMin(unittest.TestCase):
+
+    def test_letters(self):
+        cubes = [(0b100, 0b100), (0b011, 0b001), (0b110, 0b010)]
+        letters = fsmmin.get_letters(cubes)
+
+        # the letters are disjoint and each cube contains them or doesn't intersect them
+        minterms = []
+        for letter in letters:
+            letter_minterms = [minterm for minterm in range(8) if minterm & letter[0] == letter[1]]
+            minterms.extend(letter_minterms)
+            for cube in cubes:
+                inside = [minterm & cube[0] == cube[1] for minterm in letter_minterms]
+                self.assertIn(set(inside), [{True}, {False}])
+
+        # all the minterms of the cubes are in a letter
+        self.assertEqual(sorted(minterms), [minterm for minterm in range(8)
+                                            if any(minterm & cube[0] == cube[1] for cube in cubes)])
+
+        self.assertEqual(sorted(fsmmin.get_letters([(0, 0), (0b10, 0b10)])), [(0b10, 0), (0b10, 0b10)])
+
+    def test_complete(self):
+        t_fsm = make_fsm(DETECTOR, reset="a")
+        t_fsm.s = fsm.S("5")
+        t_fsm.p = fsm.P(str(len(DETECTOR)))
+        t_fsm.statecodes = [fsm.Code("{} {:03b}".format(state, pos)) for pos, state in enumerate("abcde")]
+
+        stream = [random.Random(1).choice(["00", "01", "10", "11"]) for _ in range(200)]
+        expected = fsmsim.simulate(t_fsm, stream)[1]
+
+        names = fsmmin.minimize_fsm(t_fsm)
+        self.assertEqual(names, {"a": "a", "b": "b", "c": "b", "d": "b"})
+        self.assertEqual(t_fsm.s.num, "2")
+        self.assertEqual(t_fsm.p.num, str(len(t_fsm.transtable)))
+        self.assertEqual([code.state_name for code in t_fsm.statecodes], ["a", "b"])
+        self.assertEqual(fsmsim.simulate(t_fsm, stream)[1], expected)
+        self.assertTrue(t_fsm.is_valid())
+        self.assertEqual(sorted(t_fsm.get_state_names()), ["a", "b"])
+
+        # already minimal
+        self.assertEqual(fsmmin.minimize_fsm(t_fsm), {"a": "a", "b": "b"})
+
+    def test_dontcares(self):
+        t_fsm = make_fsm([
+            "0 s0 s1 0",
+            "1 s0 s2 -",
+            "0 s1 s1 -",
+            "1 s1 s2 1",
+            "0 s2 s0 1",
+        ], num_inputs=1)
+
+        names = fsmmin.minimize_fsm(t_fsm)
+        self.assertEqual(names, {"s0": "s0", "s1": "s0", "s2": "s2"})
+        self.assertTrue(t_fsm.is_valid())
+        self.assertEqual(fsmsim.simulate(t_fsm, "0101")[1], ["0", "1", "1", "1"])
+
+    def test_random(self):
+        rng = random.Random(4)
+        for _ in range(20):
+            rows = []
+            for state in range(12):
+                for inputs in ["00", "01", "1-"]:
+                    rows.append("{} s{} s{} {}".format(inputs, state, rng.randrange(12), rng.choice("01")))
+
+            t_fsm = make_fsm(rows, reset="s0")
+            stream = [rng.choice(["00", "01", "10", "11"]) for _ in range(300)]
+            expected = fsmsim.simulate(t_fsm, stream)[1]
+
+            fsmmin.minimize_fsm(t_fsm)
+            self.assertEqual(fsmsim.simulate(t_fsm, stream)[1], expected)
+
+    def test_random_dontcares(self):
+        # overlapping rows with don't care outputs: the minimized FSM has the outputs required by the original one
+        rng = random.Random(5)
+        vectors = ["{:03b}".format(vector) for vector in range(8)]
+        num_merged = 0
+        for _ in range(40):
+            # most of the states have the same next states: they can be merged when their outputs are compatible
+            common = [rng.randrange(6), rng.randrange(6)]
+            rows = []
+            for state in range(6):
+                for first in "01":
+                    next_state = common[int(first)] if rng.random() < 0.8 else rng.randrange(6)
+                    outputs = "".join(rng.choice("01--") for _ in range(2))
+                    rows.append("{}-- s{} s{} {}".format(first, state, next_state, outputs))
+                    inputs = first + "".join(rng.choice("01-") for _ in range(2))
+                    extra = "".join(char if char != "-" else rng.choice("01-") for char in outputs)
+                    rows.append("{} s{} s{} {}".format(inputs, state, next_state, extra))
+
+            original = make_fsm(rows, num_inputs=3, num_outputs=2, reset="s0")
+            minimized = make_fsm(rows, num_inputs=3, num_outputs=2, reset="s0")
+            names = fsmmin.minimize_fsm(minimized)
+            num_merged += len(names) - len(set(names.values()))
+            self.assertTrue(minimized.is_valid())
+
+            stream = [rng.choice(vectors) for _ in range(200)]
+            states = ["s0"] + fsmsim.simulate(original, stream)[0]
+            for state, inputs, outputs in zip(states, stream, fsmsim.simulate(minimized, stream)[1]):
+                for row in original.transtable:
+                    if row[1] == state and all(char in ("-", value) for char, value in zip(row[0], inputs)):
+                        self.assertTrue(all(char in ("-", value) for char, value in zip(row[3], outputs)),
+                                        "{} {}: {} instead of {}".format(state, inputs, outputs, row[3]))
+
+        self.assertGreater(num_merged, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
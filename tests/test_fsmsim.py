@@ -0,0 +1,78 @@
+import os
+import sys
+import unittest
+
+# import fsmsim.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import fsmsim  # noqa: E402
+from helpers import make_fsm  # noqa: E402
+
+
+# detects two consecutive ones on the first input, the second input resets the FSM
+DETECTOR = [
+    "-1 a a 0",
+    "00 a a 0",
+    "10 a b 0",
+    "-1 b a 0",
+    "00 b a 0",
+    "10 b c 1",
+    "-1 c a 0",
+    "00 c a 0",
+    "10 c c 1",
+]
+
+
+class TestFsmSim(unittest.TestCase):
+
+    def test_simulate(self):
+        t_fsm = make_fsm(DETECTOR)
+
+        states, outputs = fsmsim.simulate(t_fsm, ["10", "10", "10", "00", "10", "11"])
+        self.assertEqual(states, ["b", "c", "c", "a", "b", "a"])
+        self.assertEqual(outputs, ["0", "1", "1", "0", "0", "0"])
+
+        # same stream as integers and as rows of 0/1 values
+        self.assertEqual(fsmsim.simulate(t_fsm, [2, 2, 2, 0, 2, 3]), (states, outputs))
+        rows = [[1, 0], [1, 0], [1, 0], [0, 0], [1, 0], [1, 1]]
+        self.assertEqual(fsmsim.simulate(t_fsm, iter(rows)), (states, outputs))
+
+    def test_reset_state(self):
+        t_fsm = make_fsm(DETECTOR, reset="c")
+        simulator = fsmsim.FsmSimulator(t_fsm)
+        self.assertEqual(simulator.get_state_name(), "c")
+        self.assertEqual(simulator.step("10"), ("c", "1"))
+
+        simulator.state = simulator.table.state_ids["a"]
+        self.assertEqual(list(simulator.run(["10", "01"])), [("b", "0"), ("a", "0")])
+        self.assertEqual(simulator.get_state_name(), "a")
+
+        simulator.reset()
+        self.assertEqual(simulator.get_state_name(), "c")
+
+        with self.assertRaises(ValueError):
+            fsmsim.FsmSimulator(make_fsm(DETECTOR, reset="d"))
+
+    def test_cache(self):
+        simulator = fsmsim.FsmSimulator(make_fsm(DETECTOR))
+        list(simulator.run(["11"] * 1000))
+        self.assertEqual(len(simulator.cache), 1)
+
+    def test_errors(self):
+        simulator = fsmsim.FsmSimulator(make_fsm(["1- a b 1", "-- b a 0"]))
+
+        with self.assertRaises(ValueError) as e:
+            simulator.step("01")
+        self.assertEqual(e.exception.args[0], "no transition of the 'a' state matches the '01' inputs")
+
+        for inputs in ["1", "1a", 4, [1, 0, 1]]:
+            with self.assertRaises(ValueError):
+                simulator.step(inputs)
+
+        with self.assertRaises(ValueError):
+            fsmsim.FsmSimulator(make_fsm([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
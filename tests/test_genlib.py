@@ -0,0 +1,191 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# import genlib.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import blifparser  # noqa: E402
+import genlib  # noqa: E402
+import sta  # noqa: E402
+from keywords import mapped  # noqa: E402
+
+LIBRARY = """
+# a small library
+GATE zero 0 O=CONST0;
+GATE inv 1 O=!a;
+PIN a INV 1 999 0.9 0.3 0.9 0.3
+GATE nand2 2 O=!(a*b);
+PIN * INV 1 999 1.0 0.2 1.2 0.2
+GATE "aoi21" 3 O = !(a b + c);
+PIN a INV 1 999 1 0.5 1 0.5
+PIN b INV 1 999 1 0.5 1 0.5
+PIN c INV 1 999 1.5 0.5 1.5 0.5
+GATE xor2 5 O=a*b'+a'*b;
+PIN * UNKNOWN 2 999 1.9 0.5 1.9 0.5
+LATCH dff 8 Q=D;
+PIN D NONINV 1 999 1 0.2 1 0.2
+SEQ Q ANY RISING_EDGE
+CONTROL clk 1 999 1 0.2 1 0.2
+CONSTRAINT D 0.2 0.2
+"""
+
+MAPPED = """.model mapped
+.inputs a b c clk
+.outputs y
+.gate nand2 a=a b=b O=n1
+.gate aoi21 a=n1 b=c c=a O=n2
+.gate inv a=n2 O=y
+.mlatch dff D=n2 Q=q clk 0
+.end
+"""
+
+
+def write_file(tmp_dir, name, text):
+    filepath = os.path.join(tmp_dir, name)
+    with open(filepath, "w") as fout:
+        fout.write(text)
+
+    return filepath
+
+
+class TestGenlib(unittest.TestCase):
+
+    def test_parse(self):
+        library = genlib.parse_genlib(LIBRARY)
+        self.assertEqual(len(library), 6)
+        self.assertIn("aoi21", library)
+        self.assertNotIn("nor2", library)
+        self.assertIsNone(library.get("nor2"))
+
+        aoi = library["aoi21"]
+        self.assertEqual(aoi.area, 3)
+        self.assertEqual(aoi.output, "O")
+        self.assertEqual(aoi.inputs, ["a", "b", "c"])
+        self.assertEqual(aoi.pins["c"].rise_block_delay, 1.5)
+        self.assertEqual(aoi.get_delay(), 1.5)
+        self.assertEqual(aoi.get_delay(2), 2.5)
+
+        # the "*" pin sets all the inputs
+        nand = library["nand2"]
+        self.assertEqual([pin.fall_block_delay for pin in nand.pins.values()], [1.2, 1.2])
+
+        dff = library["dff"]
+        self.assertTrue(dff.is_latch)
+        self.assertEqual(dff.seq, ("Q", "ANY", "RISING_EDGE"))
+        self.assertEqual(dff.control.name, "clk")
+        self.assertEqual(dff.constraints, {"D": (0.2, 0.2)})
+
+    def test_functions(self):
+        library = genlib.parse_genlib(LIBRARY)
+
+        self.assertEqual(library["zero"].get_cover(), [])
+        self.assertEqual(library["inv"].get_cover(), [["0", "1"]])
+        self.assertEqual(library["nand2"].get_truthtable(), 0b0111)
+        self.assertEqual(library["xor2"].get_truthtable(), 0b0110)
+
+        # !(a b + c): true when c is 0 and a, b are not both 1
+        cover = ["".join(row) for row in library["aoi21"].get_cover()]
+        self.assertEqual(cover, ["0001", "0101", "1001"])
+
+        one = genlib.Cell("one", 0, "O=CONST1")
+        self.assertEqual(one.get_cover(), [["1"]])
+
+        for function in ["O", "O=a*", "O=(a+b", "O=a)"]:
+            with self.assertRaises(ValueError):
+                genlib.Cell("bad", 0, function)
+
+    def test_errors(self):
+        for text in ["PIN a INV 1 999 1 1 1 1", "GATE inv 1 O=!a", "GATE inv x O=!a;",
+                     "GATE inv 1 O=!a; PIN a INV 1", "GATE inv 1 O=!a; PIN b INV 1 999 1 1 1 1",
+                     "GATE inv 1 O=!a; GATE inv 1 O=!a;", "GATE inv 1 O=!a; FOO"]:
+            with self.assertRaises(ValueError, msg=text):
+                genlib.parse_genlib(text)
+
+    def test_get_nets(self):
+        library = genlib.parse_genlib(LIBRARY)
+        gate = mapped.Gate("nand2 b=y O=z a=x")
+        self.assertEqual(library["nand2"].get_nets(gate), (["x", "y"], ["z"]))
+
+        mlatch = mapped.MLatch("dff Q=q D=d clk 1")
+        self.assertEqual(library["dff"].get_nets(mlatch), (["d", "clk"], ["q"]))
+
+        with self.assertRaises(ValueError):
+            library["nand2"].get_nets(mapped.Gate("nand2 a=x O=z"))
+
+        with self.assertRaises(ValueError):
+            library["nand2"].get_nets(mapped.Gate("nand2 a=x b=y c=w O=z"))
+
+        names = genlib.gate_to_names(gate, library)
+        self.assertEqual(names.inputs, ["x", "y"])
+        self.assertEqual(names.output, "z")
+        self.assertEqual(names.truthtable, [["0", "0", "1"], ["0", "1", "1"], ["1", "0", "1"]])
+
+    def test_cache(self):
+        genlib.clear_cache()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = write_file(tmp_dir, "lib.genlib", LIBRARY)
+            library = genlib.load_library(filepath)
+            self.assertIs(genlib.load_library(filepath), library)
+
+            # the library is parsed again when the file changes
+            with open(filepath, "a") as fout:
+                fout.write("GATE buf 1 O=a;\n")
+            os.utime(filepath, (time.time() + 10, time.time() + 10))
+
+            changed = genlib.load_library(filepath)
+            self.assertIsNot(changed, library)
+            self.assertIn("buf", changed)
+
+    def test_parser(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            library_path = write_file(tmp_dir, "lib.genlib", LIBRARY)
+            blif_path = write_file(tmp_dir, "mapped.blif", MAPPED)
+
+            # without a library the gates are parsed, the last parameter is the output
+            parser = blifparser.BlifParser(blif_path)
+            blif = parser.blif
+            self.assertEqual(blif.problems, [])
+            self.assertEqual(len(blif.gates), 3)
+            self.assertEqual(blif.nkeywords[".gate"], 3)
+            self.assertEqual(blif.mlatches[0].control, "clk")
+            self.assertEqual(blif.get_mapped_nets(blif.gates[1]), (["n1", "c", "a"], ["n2"]))
+            self.assertIn(".gate inv a=n2 O=y\n", str(blif))
+            self.assertIn(".mlatch dff D=n2 Q=q clk 0\n", str(blif))
+
+            # the library can be passed as a path or as a Library() object
+            parser = blifparser.BlifParser(blif_path, library=library_path)
+            self.assertEqual(parser.blif.problems, [])
+            self.assertIs(parser.blif.library, genlib.load_library(library_path))
+
+            bad = MAPPED.replace("O=n1", "Z=n1").replace(".gate inv", ".gate buf").replace(".mlatch dff", ".mlatch nand2")
+            bad_path = write_file(tmp_dir, "bad.blif", bad)
+            parser = blifparser.BlifParser(bad_path, library=parser.blif.library)
+
+        self.assertEqual([problem.code for problem in parser.blif.problems],
+                         ["gate-problem", "unknown-cell", "mlatch-problem"])
+        self.assertEqual(parser.blif.problems[0].text, "[GATE PROBLEM] 'Z' is not a pin of the 'nand2' cell")
+
+    def test_netlist(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            library_path = write_file(tmp_dir, "lib.genlib", LIBRARY)
+            blif_path = write_file(tmp_dir, "mapped.blif", MAPPED)
+            blif = blifparser.BlifParser(blif_path, library=library_path).blif
+
+        self.assertEqual(blif.get_levels(), {"n1": 1, "n2": 2, "y": 3, "q": 0})
+        self.assertEqual(blif.get_fanin_cone("y"), frozenset(["y", "n2", "n1", "a", "b", "c"]))
+
+        report = sta.analyze_timing(blif)
+        self.assertEqual(report.arrival["y"], 3)
+        self.assertEqual(report.get_path("y"), ["a", "n1", "n2", "y"])
+        self.assertIn("n2", report.endpoints)
+
+        graph_data = blifparser.graph.parse_blif(blif)
+        self.assertEqual([node.type for node in graph_data.nodes][-4:], ["gate", "gate", "gate", "mlatch"])
+
+
+if __name__ == '__main__':
+    unittest.main()
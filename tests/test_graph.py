@@ -0,0 +1,148 @@
+import os
+import io
+import sys
+import unittest
+import xml.etree.ElementTree as ET
+
+# import graph.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import blifparser  # noqa: E402, F401
+import graph  # noqa: E402
+from keywords import generic, subfiles  # noqa: E402
+
+try:
+    import networkx  # noqa: F401
+    HAS_NETWORKX = True
+except ImportError:
+    HAS_NETWORKX = False
+
+
+def make_blif():
+    """
+    Returns a small netlist: a, b --> n1 --> out (and a latch n1 --> q)
+    """
+    blif = generic.Blif()
+    blif.inputs = generic.Inputs("a b")
+    blif.outputs = generic.Outputs("out")
+    blif.booleanfunctions = [generic.Names("a b n1", False), generic.Names("n1 out", False)]
+    blif.latches = [generic.Latch("n1 q 0")]
+
+    return blif
+
+
+class TestGraph(unittest.TestCase):
+
+    def test_parse_blif(self):
+        graph_data = graph.parse_blif(make_blif())
+
+        # 2 inputs, 1 output, 2 boolean functions, 1 latch
+        self.assertEqual(len(graph_data.nodes), 6)
+        self.assertEqual([node.type for node in graph_data.nodes],
+                         ["input", "input", "output", "boolean_function", "boolean_function", "latch"])
+        self.assertEqual(len(graph_data.offsets), 7)
+        self.assertEqual(graph_data.num_edges(), 5)
+
+        # n1 drives the second boolean function and the latch
+        self.assertEqual(list(graph_data.successors(3)), [4, 5])
+
+        edges = [(n1.type, n2.type, label) for n1, n2, label in graph_data.edges()]
+        self.assertIn(("input", "boolean_function", "a"), edges)
+        self.assertIn(("boolean_function", "output", "out"), edges)
+        self.assertIn(("boolean_function", "latch", "n1"), edges)
+
+        self.assertEqual(graph_data.longest_label, 3)
+        self.assertEqual(graph_data.max_inputs, 2)
+
+    def test_node_ids(self):
+        blif = make_blif()
+        first = graph.parse_blif(blif)
+        second = graph.parse_blif(blif)
+
+        # the ids don't depend on the graphs built before
+        self.assertEqual([node.id for node in first.nodes], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([node.id for node in second.nodes], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([node.key for node in first.nodes],
+                         ["input:a", "input:b", "output:out", "names:n1", "names:out", "latch:q"])
+
+        # each group of nodes can be created on its own with the same ids
+        first_ids = graph.get_first_ids(blif)
+        self.assertEqual(first_ids, {"input": 1, "output": 3, "boolean_function": 4, "latch": 6, "subckt": 7,
+                                     "gate": 7, "mlatch": 7})
+        latches = graph.make_latch_nodes(blif, first_ids["latch"])
+        self.assertEqual([(node.id, node.key) for node in latches], [(6, "latch:q")])
+
+        # a node created without an id is not part of a graph yet
+        node = graph.Node()
+        self.assertEqual((node.id, node.name), (-1, None))
+
+    def test_levels(self):
+        graph_data = graph.parse_blif(make_blif())
+
+        # inputs, output, n1, out, latch
+        self.assertEqual(graph.get_levels(graph_data), [0, 0, 3, 1, 2, 0])
+
+    def test_cluster_level(self):
+        graph_data = graph.cluster(graph.parse_blif(make_blif()), "level")
+
+        # level 0 (3 nodes), level 3, level 1, level 2
+        self.assertEqual(len(graph_data.nodes), 4)
+        self.assertEqual(graph_data.nodes[0].type, "cluster")
+        self.assertEqual(graph_data.nodes[0].size, 3)
+        self.assertEqual(graph_data.nodes[0].name, "level 0 (3 nodes)")
+
+        edges = [(n1.name, n2.type, label) for n1, n2, label in graph_data.edges()]
+        self.assertIn(("level 0 (3 nodes)", "boolean_function", "2 nets"), edges)
+
+    def test_cluster_ffr(self):
+        blif = make_blif()
+        blif.latches = []
+        graph_data = graph.cluster(graph.parse_blif(blif), "ffr")
+
+        # the two boolean functions are a single fanout-free region
+        types = sorted(node.type for node in graph_data.nodes)
+        self.assertEqual(types, ["cluster", "input", "input", "output"])
+        self.assertEqual(graph_data.num_edges(), 3)
+
+    def test_cluster_subckt(self):
+        blif = make_blif()
+        blif.subcircuits = [subfiles.Subckt("adder A=a"), subfiles.Subckt("adder A=b")]
+        graph_data = graph.cluster(graph.parse_blif(blif), "subckt")
+
+        self.assertEqual(len(graph_data.nodes), 7)
+        self.assertEqual(graph_data.nodes[-1].name, "adder (2 instances)")
+
+        with self.assertRaises(ValueError):
+            graph.cluster(graph_data, "wrong")
+
+    def test_writers(self):
+        graph_data = graph.parse_blif(make_blif())
+
+        dot = io.StringIO()
+        graph.write_dot(graph_data, dot)
+        lines = dot.getvalue().splitlines()
+        self.assertEqual(lines[0], "digraph blif {")
+        self.assertEqual(lines[-1], "}")
+        self.assertEqual(len(lines), 2 + 6 + 5)
+        self.assertIn('  n0 -> n3 [label="a"];', lines)
+
+        graphml = io.StringIO()
+        graph.write_graphml(graph_data, graphml)
+        root = ET.fromstring(graphml.getvalue())
+        ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+        self.assertEqual(len(root.findall("g:graph/g:node", ns)), 6)
+        self.assertEqual(len(root.findall("g:graph/g:edge", ns)), 5)
+
+    @unittest.skipUnless(HAS_NETWORKX, "networkx is not installed")
+    def test_nx_graph(self):
+        graph_data = graph.parse_blif(make_blif())
+        nx_graph = graph_data.nx_graph
+
+        self.assertIs(nx_graph, graph_data.nx_graph, "the networkx graph should be cached")
+        self.assertEqual(nx_graph.number_of_nodes(), 6)
+        self.assertEqual(nx_graph.number_of_edges(), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import random
+import sys
+import unittest
+
+# import lutmap.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import cec  # noqa: E402
+import lutmap  # noqa: E402
+from helpers import make_names  # noqa: E402
+from keywords import generic, subfiles  # noqa: E402
+
+
+def make_adder(num_bits):
+    """
+    Returns a ripple-carry adder with <num_bits> bits (sum s<i>, carry out cout).
+    """
+    blif = generic.Blif()
+    blif.model = generic.Model("adder")
+    blif.inputs = generic.Inputs(" ".join("a{0} b{0}".format(bit) for bit in range(num_bits)) + " cin")
+    blif.outputs = generic.Outputs(" ".join("s{}".format(bit) for bit in range(num_bits)) + " cout")
+    carry = "cin"
+    for bit in range(num_bits):
+        blif.booleanfunctions.append(make_names("a{0} b{0} {1} s{0}".format(bit, carry),
+                                                ["100 1", "010 1", "001 1", "111 1"]))
+        blif.booleanfunctions.append(make_names("a{0} b{0} {1} c{0}".format(bit, carry), ["11- 1", "1-1 1", "-11 1"]))
+        carry = "c{}".format(bit)
+
+    blif.booleanfunctions.append(make_names(carry + " cout", ["1 1"]))
+    return blif
+
+
+def make_random(seed, num_inputs=8, num_functions=30):
+    """
+    Returns a random netlist with wide functions, inverted outputs and a latch.
+    """
+    rng = random.Random(seed)
+    blif = generic.Blif()
+    nets = ["i{}".format(position) for position in range(num_inputs)] + ["q"]
+    blif.inputs = generic.Inputs(" ".join(nets[:-1]))
+    for position in range(num_functions):
+        inputs = rng.sample(nets, rng.randint(1, min(7, len(nets))))
+        rows = []
+        for _ in range(rng.randint(1, 4)):
+            rows.append("".join(rng.choice("01--") for _ in inputs) + " 1")
+
+        output = "n{}".format(position)
+        if rng.random() < 0.3:
+            rows = [row[:-1] + "0" for row in rows]
+
+        blif.booleanfunctions.append(make_names(" ".join(inputs + [output]), rows))
+        nets.append(output)
+
+    blif.outputs = generic.Outputs(" ".join(nets[-4:] + [nets[0]]))
+    blif.latches = [generic.Latch(nets[-5] + " q 0")]
+    return blif
+
+
+class TestLutmap(unittest.TestCase):
+
+    def test_isop(self):
+        for num_vars in range(4):
+            mask = (1 << (1 << num_vars)) - 1
+            for truthtable in range(mask + 1):
+                cubes, result = lutmap.get_isop(truthtable, truthtable, num_vars)
+                self.assertEqual(result, truthtable)
+
+                # the rows compute the function
+                rows = lutmap.get_cover(truthtable, num_vars)
+                computed = 0
+                for minterm in range(1 << num_vars):
+                    matches = any(all(char == "-" or int(char) == (minterm >> position & 1)
+                                      for position, char in enumerate(row[:-1])) for row in rows)
+                    output = rows[0][-1] == "1" if rows else True
+                    if matches == output:
+                        computed |= 1 << minterm
+
+                self.assertEqual(computed, truthtable)
+
+        self.assertEqual(lutmap.get_cover(0b1000, 2), [["1", "1", "1"]])
+        self.assertEqual(lutmap.get_cover(0b0111, 2), [["1", "1", "0"]])
+        self.assertEqual(lutmap.get_cover(0, 2), [])
+
+    def test_adder(self):
+        for k in (2, 3, 4, 6):
+            mapped = lutmap.map_luts(make_adder(8), k)
+
+            self.assertEqual(mapped.model.name, "adder")
+            self.assertEqual(mapped.outputs.outputs, make_adder(8).outputs.outputs)
+            self.assertTrue(all(len(function.inputs) <= k for function in mapped.booleanfunctions))
+            self.assertTrue(cec.check_equivalence(make_adder(8), mapped).equivalent)
+
+        # the sums and the carries are LUTs with 3 inputs
+        mapped = lutmap.map_luts(make_adder(8), 3)
+        self.assertEqual(max(mapped.get_levels().values()), 8)
+        self.assertIn("c3", [function.output for function in mapped.booleanfunctions])
+
+    def test_random(self):
+        for seed in range(10):
+            for k in (3, 5):
+                mapped = lutmap.map_luts(make_random(seed), k, num_cuts=4)
+
+                self.assertTrue(all(len(function.inputs) <= k for function in mapped.booleanfunctions))
+                self.assertEqual([latch.input for latch in mapped.latches], [make_random(seed).latches[0].input])
+                result = cec.check_equivalence(make_random(seed), mapped)
+                self.assertTrue(result.equivalent, "seed {}, k {}: {}".format(seed, k, result))
+
+    def test_outputs(self):
+        # complemented, duplicated, constant and primary input outputs
+        blif = generic.Blif()
+        blif.inputs = generic.Inputs("a b")
+        blif.outputs = generic.Outputs("y1 y2 y3 one a")
+        blif.booleanfunctions = [
+            make_names("a b y1", ["11 0"]),
+            make_names("a b y2", ["11 1"]),
+            make_names("y2 y3", ["1 1"]),
+            make_names("one", ["1"]),
+        ]
+        mapped = lutmap.map_luts(blif)
+
+        self.assertTrue(cec.check_equivalence(blif, mapped).equivalent)
+        outputs = {function.output: function for function in mapped.booleanfunctions}
+        self.assertEqual(sorted(outputs), ["one", "y1", "y2", "y3"])
+        self.assertEqual(outputs["one"].truthtable, [["1"]])
+
+    def test_latches(self):
+        # the latches are copied from their attributes (e.g. after strash renamed a net)
+        blif = make_adder(2)
+        blif.latches = [generic.Latch("s0 q re clk 1")]
+        blif.latches[0].input = "s1"
+        mapped = lutmap.map_luts(blif)
+
+        self.assertEqual(str(mapped.latches[0]), ".latch s1 q re clk 1")
+        self.assertIsNot(mapped.latches[0], blif.latches[0])
+
+    def test_unsupported(self):
+        self.assertRaises(ValueError, lutmap.map_luts, make_adder(2), 1)
+
+        blif = make_adder(2)
+        blif.subcircuits = [subfiles.Subckt("adder a=a0")]
+        self.assertRaises(ValueError, lutmap.map_luts, blif)
+
+
+if __name__ == "__main__":
+    unittest.main()
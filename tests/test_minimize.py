@@ -0,0 +1,101 @@
+import os
+import random
+import sys
+import unittest
+
+# import minimize.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import minimize  # noqa: E402
+from helpers import make_names  # noqa: E402
+from keywords import generic  # noqa: E402
+
+
+def minterms(rows, num_inputs):
+    """
+    Returns the set of minterms covered by the <rows> truth table.
+    """
+    cubes = [minimize.cube_from_string("".join(row[:-1])) for row in rows]
+    return {m for m in range(2 ** num_inputs) if any(minimize.contains(cube, (2 ** num_inputs - 1, m)) for cube in cubes)}
+
+
+class TestMinimize(unittest.TestCase):
+
+    def test_cubes(self):
+        self.assertEqual(minimize.cube_from_string("1-0"), (0b101, 0b100))
+        self.assertEqual(minimize.cube_to_string((0b101, 0b100), 3), "1-0")
+        self.assertTrue(minimize.intersects((0b100, 0b100), (0b001, 0b000)))
+        self.assertFalse(minimize.intersects((0b100, 0b100), (0b100, 0b000)))
+        self.assertTrue(minimize.contains((0b100, 0b100), (0b101, 0b101)))
+        self.assertFalse(minimize.contains((0b101, 0b101), (0b100, 0b100)))
+
+    def test_tautology_complement(self):
+        # a + a' is a tautology
+        self.assertTrue(minimize.is_tautology([(0b10, 0b10), (0b10, 0b00)]))
+        self.assertFalse(minimize.is_tautology([(0b10, 0b10), (0b01, 0b00)]))
+
+        # complement of a + b is a'b'
+        self.assertEqual(minimize.complement([(0b10, 0b10), (0b01, 0b01)]), [(0b11, 0b00)])
+        self.assertEqual(minimize.complement([]), [(0, 0)])
+
+    def test_minimize_names(self):
+        # a'b + ab + ab' = a + b
+        function = make_names("a b out", ["01 1", "11 1", "10 1"])
+        self.assertEqual(minimize.minimize_names(function), [["-", "1", "1"], ["1", "-", "1"]])
+
+        # with the don't care set ab' the function a'b + ab becomes b
+        function = make_names("a b out", ["01 1", "11 1"])
+        dontcare = make_names("a b out", ["10 1"], True)
+        self.assertEqual(minimize.minimize_names(function, dontcare), [["-", "1", "1"]])
+
+        # the .exdc function can read a subset of the inputs (don't care when a is 1)
+        function = make_names("a b out", ["01 1", "10 1"])
+        dontcare = make_names("a out", ["1 1"], True)
+        self.assertEqual(minimize.minimize_names(function, dontcare), [["-", "1", "1"]])
+
+        # OFF-set covers keep their polarity
+        function = make_names("a b out", ["00 0", "01 0"])
+        self.assertEqual(minimize.minimize_names(function), [["0", "-", "0"]])
+
+        # an OFF-set in the don't care set is the constant 1 (an empty cover is the constant 0)
+        function = make_names("a b y", ["11 0"])
+        dontcare = make_names("a b y", ["11 1"], True)
+        self.assertEqual(minimize.minimize_names(function, dontcare), [["-", "-", "1"]])
+
+    def test_random_covers(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            num_inputs = rng.randint(2, 6)
+            rows = []
+            for _ in range(rng.randint(1, 12)):
+                rows.append("".join(rng.choice("01--") for _ in range(num_inputs)) + " 1")
+
+            function = make_names(" ".join("i{}".format(pos) for pos in range(num_inputs)) + " out", rows)
+            result = minimize.minimize_names(function)
+
+            self.assertEqual(minterms(result, num_inputs), minterms(function.truthtable, num_inputs))
+            self.assertLessEqual(len(result), len(set(rows)))
+
+    def test_minimize_blif(self):
+        blif = generic.Blif()
+        blif.booleanfunctions = [
+            make_names("a b x", ["01 1", "11 1", "10 1"]),
+            make_names("a b y", ["11 1"]),
+            make_names("a b y", ["00 1"], True),
+            make_names("x y z", ["1- 1", "11 1"]),
+        ]
+
+        self.assertEqual(minimize.minimize_blif(blif, processes=1), 2)
+        self.assertEqual(blif.booleanfunctions[0].truthtable, [["-", "1", "1"], ["1", "-", "1"]])
+        self.assertEqual(blif.booleanfunctions[1].truthtable, [["1", "1", "1"]])
+        self.assertEqual(blif.booleanfunctions[3].truthtable, [["1", "-", "1"]])
+
+        # same result using worker processes
+        blif.booleanfunctions[0].truthtable = [["0", "1", "1"], ["1", "1", "1"], ["1", "0", "1"]]
+        self.assertEqual(minimize.minimize_blif(blif, processes=2), 1)
+        self.assertEqual(blif.booleanfunctions[0].truthtable, [["-", "1", "1"], ["1", "-", "1"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# import netlist.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import netlist  # noqa: E402
+import blifparser  # noqa: E402
+from keywords import generic, subfiles  # noqa: E402
+
+
+def make_blif():
+    """
+    Returns a small sequential netlist:
+
+    a, b --> n1 --> n2 --> out
+             q ----/
+    n2 --> latch --> q
+    """
+    blif = generic.Blif()
+    blif.inputs = generic.Inputs("a b")
+    blif.outputs = generic.Outputs("out")
+
+    # declared out of order on purpose
+    n2 = generic.Names("n1 q n2", False)
+    n2.truthtable = [["1", "1", "1"]]
+    out = generic.Names("n2 out", False)
+    out.truthtable = [["0", "1"]]
+    n1 = generic.Names("a b n1", False)
+    n1.truthtable = [["1", "-", "1"], ["-", "1", "1"]]
+    blif.booleanfunctions = [out, n2, n1]
+    blif.latches = [generic.Latch("n2 q re clk 0")]
+
+    return blif
+
+
+class TestNetlist(unittest.TestCase):
+
+    def test_index(self):
+        blif = make_blif()
+        index = blif.get_index()
+
+        self.assertIsInstance(index, netlist.NetlistIndex)
+        self.assertIs(index, blif.get_index(), "the index should be cached")
+        self.assertEqual(index.drivers["n1"], 2)
+        self.assertEqual(index.sinks["n2"], [0, 3])
+        self.assertIs(index.get_driver("q"), blif.latches[0])
+        self.assertIsNone(index.get_driver("a"))
+        self.assertEqual(index.loops, [])
+
+        blif.invalidate_index()
+        self.assertIsNot(index, blif.get_index())
+
+    def test_levels(self):
+        blif = make_blif()
+
+        self.assertEqual(blif.get_levels(), {"out": 3, "n2": 2, "n1": 1, "q": 0})
+
+        order = blif.get_topological_order()
+        self.assertEqual(len(order), 4)
+        self.assertIs(order[0], blif.latches[0])
+        self.assertEqual([element.output for element in order[1:]], ["n1", "n2", "out"])
+
+    def test_loops(self):
+        blif = make_blif()
+
+        # n1 now depends on n2: n1 -> n2 -> n1 is a loop (and out depends on it)
+        blif.booleanfunctions[2] = generic.Names("a n2 n1", False)
+        index = blif.get_index()
+
+        self.assertEqual(index.loops, [["n1", "n2", "n1"]])
+        self.assertEqual(blif.get_levels(), {"out": -1, "n2": -1, "n1": -1, "q": 0})
+        self.assertEqual(len(blif.get_topological_order()), 1)
+
+    def test_subckt(self):
+        blif = make_blif()
+        blif.subcircuits.append(subfiles.Subckt("adder A=a B=n1 S=sum"))
+        index = blif.get_index()
+
+        self.assertEqual(index.element_inputs[-1], ["a", "n1"])
+        self.assertEqual(index.element_outputs[-1], ["sum"])
+        self.assertEqual(index.get_level("sum"), 0)
+
+    def test_fanin_cone(self):
+        blif = make_blif()
+
+        self.assertEqual(blif.get_fanin_cone("out"), {"out", "n2", "n1", "q", "a", "b"})
+        self.assertEqual(blif.get_fanin_cone("n1"), {"n1", "a", "b"})
+        self.assertEqual(blif.get_fanin_cone("a"), {"a"})
+
+        # through the latch: q <-- n2
+        self.assertEqual(blif.get_fanin_cone("q"), {"q"})
+        self.assertEqual(blif.get_fanin_cone("q", stop_at_latches=False), {"q", "n2", "n1", "a", "b"})
+
+        # repeated queries are answered by the cache
+        cone = blif.get_fanin_cone("out")
+        self.assertIs(cone, blif.get_fanin_cone("out"))
+
+        with self.assertRaises(ValueError):
+            blif.get_fanin_cone("not_a_net")
+
+    def test_fanout_cone(self):
+        blif = make_blif()
+
+        self.assertEqual(blif.get_fanout_cone("a"), {"a", "n1", "n2", "out"})
+        self.assertEqual(blif.get_fanout_cone("q"), {"q", "n2", "out"})
+        self.assertEqual(blif.get_fanout_cone("out"), {"out"})
+
+        # n2 feeds the latch
+        self.assertEqual(blif.get_fanout_cone("n2", stop_at_latches=False), {"n2", "out", "q"})
+
+        # out is a primary output that also feeds another function
+        blif.booleanfunctions.append(generic.Names("out extra", False))
+        blif.invalidate_index()
+        self.assertEqual(blif.get_fanout_cone("n2"), {"n2", "out", "extra"})
+        self.assertEqual(blif.get_fanout_cone("n2", stop_at_io=True), {"n2", "out"})
+        self.assertEqual(blif.get_fanout_cone("out", stop_at_io=True), {"out", "extra"})
+
+    def test_parser(self):
+        with tempfile.TemporaryDirectory() as td:
+            f_name = os.path.join(td, "loop.blif")
+            with open(f_name, "w") as fout:
+                fout.write(".model loop\n.inputs a\n.outputs y\n"
+                           ".names a y x\n11 1\n.names x y\n1 1\n.end\n")
+
+            blif = blifparser.BlifParser(f_name).blif
+            self.assertEqual(blif.problems, ["[NETLIST PROBLEM] Combinational loop: y -> x -> y"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+# import profiling.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import profiling  # noqa: E402
+import blifparser  # noqa: E402
+
+BLIF = """.model test
+.inputs a b
+# comment
+.outputs y \\
+z
+.names a b y
+11 1
+.names a z
+0 1
+.end
+"""
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_phase(self):
+        stats = profiling.ParseStats()
+        stats.start()
+        with stats.phase("build") as phase:
+            data = [str(i) for i in range(10000)]
+            phase.lines = len(data)
+        stats.stop()
+
+        self.assertEqual([phase.name for phase in stats.phases], ["build"])
+        self.assertEqual(stats.get("build").lines, 10000)
+        self.assertGreater(stats.get("build").peak_memory, 0)
+        self.assertIsNone(stats.get("other"))
+        self.assertAlmostEqual(stats.get_total_seconds(), stats.get("build").seconds)
+        self.assertIn("build", str(stats))
+
+    def test_parser(self):
+        with tempfile.TemporaryDirectory() as td:
+            f_name = os.path.join(td, "test.blif")
+            with open(f_name, "w") as fout:
+                fout.write(BLIF)
+
+            parser = blifparser.BlifParser(f_name)
+            self.assertIsNone(parser.stats)
+
+            parser = blifparser.BlifParser(f_name, profile=True)
+            self.assertEqual(parser.blif.problems, [])
+
+            names = [phase.name for phase in parser.stats.phases]
+            self.assertEqual(names, ["copy", "add_metadata", "remove_comments", "remove_params_newline",
+                                     "tokenize", "names_validation", "netlist"])
+            lines = [phase.lines for phase in parser.stats.phases]
+            self.assertEqual(lines, [10, 10, 10, 10, 9, 2, 2])
+
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                argv = sys.argv
+                sys.argv = ["blifparser", "--stats", f_name]
+                try:
+                    blifparser.main()
+                finally:
+                    sys.argv = argv
+
+            self.assertIn("PHASES:", out.getvalue())
+            self.assertIn("tokenize", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import itertools
+import os
+import random
+import sys
+import unittest
+
+# import sat.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import sat  # noqa: E402
+
+
+def is_satisfied(clauses, values):
+    """
+    Returns True if the <values> assignment (variable -> bool) satisfies all the <clauses>.
+    """
+    return all(any(values[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+
+def brute_force(clauses, num_vars):
+    """
+    Returns True if the <clauses> are satisfiable (tries every assignment).
+    """
+    for bits in itertools.product([False, True], repeat=num_vars):
+        if is_satisfied(clauses, dict(enumerate(bits, 1))):
+            return True
+
+    return False
+
+
+def pigeonhole(solver, pigeons, holes):
+    """
+    Adds the clauses of the (unsatisfiable when pigeons > holes) pigeonhole problem.
+    """
+    def var(pigeon, hole):
+        return pigeon * holes + hole + 1
+
+    for pigeon in range(pigeons):
+        solver.add_clause([var(pigeon, hole) for hole in range(holes)])
+
+    for hole in range(holes):
+        for a, b in itertools.combinations(range(pigeons), 2):
+            solver.add_clause([-var(a, hole), -var(b, hole)])
+
+
+class TestSat(unittest.TestCase):
+
+    def test_luby(self):
+        self.assertEqual([sat.luby(position) for position in range(15)], [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+
+    def test_simple(self):
+        solver = sat.Solver()
+        self.assertTrue(solver.add_clause([1, 2]))
+        self.assertTrue(solver.add_clause([-1, 2]))
+        self.assertTrue(solver.solve())
+        self.assertTrue(solver.get_value(2))
+
+        self.assertFalse(solver.solve([-2]))
+        self.assertTrue(solver.solve([1]))
+        self.assertTrue(solver.get_value(1))
+
+        self.assertFalse(solver.add_clause([-2]))
+        self.assertFalse(solver.ok)
+        self.assertFalse(solver.solve())
+
+        solver = sat.Solver()
+        self.assertTrue(solver.add_clause([1, -1]))
+        self.assertFalse(solver.add_clause([]))
+        self.assertRaises(ValueError, sat.Solver().add_clause, [0])
+
+    def test_random(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            num_vars = rng.randint(1, 8)
+            clauses = [[rng.choice([1, -1]) * rng.randint(1, num_vars) for _ in range(rng.randint(1, 3))]
+                       for _ in range(rng.randint(1, 40))]
+            assumptions = [rng.choice([1, -1]) * rng.randint(1, num_vars) for _ in range(rng.randint(0, 2))]
+
+            solver = sat.Solver()
+            for clause in clauses:
+                solver.add_clause(clause)
+
+            constrained = clauses + [[lit] for lit in assumptions]
+            result = solver.solve(assumptions)
+            self.assertEqual(result, brute_force(constrained, num_vars))
+            if result:
+                self.assertTrue(is_satisfied(constrained, dict(enumerate(solver.model))))
+
+            # the assumptions are forgotten after each call
+            self.assertEqual(solver.solve(), brute_force(clauses, num_vars))
+
+    def test_pigeonhole(self):
+        solver = sat.Solver()
+        pigeonhole(solver, 6, 5)
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.num_conflicts, 0)
+
+        solver = sat.Solver()
+        pigeonhole(solver, 5, 5)
+        self.assertTrue(solver.solve())
+
+    def test_conflict_limit(self):
+        solver = sat.Solver()
+        pigeonhole(solver, 8, 7)
+        self.assertIsNone(solver.solve(conflict_limit=10))
+        self.assertTrue(solver.ok)
+
+    def test_encode_cover(self):
+        truthtables = [
+            [["1", "1", "1"]],                        # and
+            [["1", "-", "1"], ["-", "1", "1"]],       # or
+            [["1", "1", "0"]],                        # nand (off-set)
+            [["0", "1", "1"], ["1", "0", "1"]],       # xor
+            [["-", "-", "1"]],                        # constant 1
+            [],                                       # constant 0
+        ]
+        for truthtable in truthtables:
+            for a, b in itertools.product([False, True], repeat=2):
+                solver = sat.Solver()
+                for _ in range(3):
+                    solver.new_var()
+
+                for clause in sat.encode_cover([1, 2], truthtable, 3, solver.new_var):
+                    solver.add_clause(clause)
+
+                on_set = any(all(char == "-" or (char == "1") == value for char, value in zip(row[:-1], (a, b)))
+                             for row in truthtable)
+                expected = on_set != (len(truthtable) > 0 and truthtable[0][-1] == "0")
+                self.assertTrue(solver.solve([1 if a else -1, 2 if b else -2]))
+                self.assertEqual(solver.get_value(3), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import math
+import os
+import sys
+import tempfile
+import unittest
+
+# import sta.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import blifparser  # noqa: E402
+import sta  # noqa: E402
+from keywords import generic, timing  # noqa: E402
+
+
+def make_blif():
+    """
+    Returns a small netlist with a long and a short path:
+
+    a, b --> n1 --> n2 --> out1
+    c -------------/
+    c --> out2
+    """
+    blif = generic.Blif()
+    blif.inputs = generic.Inputs("a b c")
+    blif.outputs = generic.Outputs("out1 out2")
+
+    n1 = generic.Names("a b n1", False)
+    n1.truthtable = [["1", "1", "1"]]
+    n2 = generic.Names("n1 c n2", False)
+    n2.truthtable = [["1", "-", "1"], ["-", "1", "1"]]
+    out1 = generic.Names("n2 out1", False)
+    out1.truthtable = [["0", "1"]]
+    out2 = generic.Names("c out2", False)
+    out2.truthtable = [["1", "1"]]
+    blif.booleanfunctions = [out2, out1, n2, n1]
+
+    return blif
+
+
+class TestSta(unittest.TestCase):
+
+    def test_unit_delay(self):
+        report = sta.analyze_timing(make_blif())
+
+        self.assertEqual(report.arrival["a"], 0)
+        self.assertEqual(report.arrival["n1"], 1)
+        self.assertEqual(report.arrival["n2"], 2)
+        self.assertEqual(report.arrival["out1"], 3)
+        self.assertEqual(report.arrival["out2"], 1)
+        self.assertEqual(report.get_critical_delay(), 3)
+
+        # without a required time, the critical path has zero slack
+        self.assertEqual(report.required_time, 3)
+        self.assertEqual(report.get_worst_slack(), 0)
+        self.assertEqual(report.get_slack("out2"), 2)
+        self.assertEqual(report.get_slack("c"), 1)
+        self.assertEqual(report.get_slack("a"), 0)
+
+        slack, path = report.get_critical_paths()[0]
+        self.assertEqual(slack, 0)
+        self.assertEqual(path, ["a", "n1", "n2", "out1"])
+
+        paths = report.get_critical_paths(5)
+        self.assertEqual([slack for slack, path in paths], [0, 2])
+        self.assertEqual(paths[1][1], ["c", "out2"])
+        self.assertIn("worst slack: 0.000", str(report))
+
+    def test_default_keywords(self):
+        blif = make_blif()
+        blif.default_input_arrival = timing.DefaultInputArrival("0.5 1")
+        blif.default_output_required = timing.DefaultOutputRequired("3 3")
+        report = sta.analyze_timing(blif)
+
+        self.assertEqual(report.arrival["out1"], 4)
+        self.assertEqual(report.get_worst_slack(), -1)
+        self.assertEqual(report.get_slack("out2"), 1)
+
+    def test_fanout_delay(self):
+        blif = make_blif()
+        blif.default_input_drive = timing.DefaultInputDrive("0.5 0.5")
+        blif.default_output_load = timing.DefaultOutputLoad("2")
+        blif.default_max_input_load = timing.DefaultMaxInputLoad("1")
+        report = sta.analyze_timing(blif, "fanout", 0.25)
+
+        # c drives n2 and out2
+        self.assertEqual(report.arrival["c"], 1)
+        self.assertEqual(report.delays["n1"], 1.25)
+        self.assertEqual(report.delays["out1"], 1.5)
+        self.assertEqual(report.arrival["out1"], 0.5 + 1.25 + 1.25 + 1.5)
+        self.assertEqual(report.input_load_violations, ["c"])
+
+        with self.assertRaises(ValueError):
+            sta.analyze_timing(blif, "wire")
+
+    def test_latches(self):
+        blif = make_blif()
+        blif.latches = [generic.Latch("n2 q re clk 0")]
+        feedback = generic.Names("q a n3", False)
+        feedback.truthtable = [["1", "1", "1"]]
+        blif.booleanfunctions.append(feedback)
+        blif.outputs = generic.Outputs("out1 out2 n3")
+        report = sta.analyze_timing(blif)
+
+        # latch outputs are start points, latch inputs are endpoints
+        self.assertEqual(report.arrival["q"], 0)
+        self.assertIn("n2", report.endpoints)
+        self.assertEqual(report.get_path("n3"), ["q", "n3"])
+        self.assertEqual(report.get_slack("n3"), 2)
+
+        # nets that don't reach an endpoint have infinite slack
+        unused = generic.Names("a unused", False)
+        unused.truthtable = [["1", "1"]]
+        blif.booleanfunctions.append(unused)
+        blif.invalidate_index()
+        self.assertEqual(sta.analyze_timing(blif).get_slack("unused"), math.inf)
+
+    def test_loops(self):
+        blif = generic.Blif()
+        blif.inputs = generic.Inputs("a")
+        blif.outputs = generic.Outputs("x")
+        x = generic.Names("a y x", False)
+        x.truthtable = [["1", "1", "1"]]
+        y = generic.Names("x y", False)
+        y.truthtable = [["1", "1"]]
+        blif.booleanfunctions = [x, y]
+
+        with self.assertRaises(ValueError):
+            sta.analyze_timing(blif)
+
+    def test_parsed_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "timing.blif")
+            with open(filepath, "w") as fout:
+                fout.write(".model timing\n.inputs a b\n.outputs c\n"
+                           ".default_input_arrival 1 2\n.default_output_required 5 4\n"
+                           ".default_input_drive 0.1 0.2\n.default_output_load 3\n.default_max_input_load 10\n"
+                           ".names a b c\n11 1\n.end\n")
+
+            parser = blifparser.BlifParser(filepath)
+
+        blif = parser.blif
+        self.assertEqual(blif.problems, [])
+        self.assertEqual(blif.default_input_arrival.get_max(), 2)
+        self.assertEqual(blif.default_output_required.rise, 5)
+        self.assertEqual(blif.default_input_drive.fall, 0.2)
+        self.assertEqual(blif.default_output_load.load, 3)
+        self.assertEqual(blif.default_max_input_load.load, 10)
+        self.assertEqual(blif.nkeywords[".default_output_load"], 1)
+        self.assertIn(".default_input_arrival 1 2\n", str(blif))
+
+        report = sta.analyze_timing(blif)
+        self.assertEqual(report.arrival["c"], 3)
+        self.assertEqual(report.get_slack("c"), 1)
+
+    def test_invalid_keyword(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, "timing.blif")
+            with open(filepath, "w") as fout:
+                fout.write(".model timing\n.inputs a\n.outputs b\n.default_output_load x\n.names a b\n1 1\n.end\n")
+
+            parser = blifparser.BlifParser(filepath)
+
+        self.assertEqual(len(parser.blif.problems), 1)
+        self.assertEqual(parser.blif.problems[0].code, "parsing-error")
+        self.assertIsNone(parser.blif.default_output_load)
+
+
+if __name__ == '__main__':
+    unittest.main()
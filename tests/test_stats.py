@@ -0,0 +1,89 @@
+import io
+import os
+import sys
+import unittest
+
+# import stats.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import stats  # noqa: E402
+
+BLIF = """# comment
+.model top
+.inputs a b c \\
+        clk
+.outputs y z
+.names a b n1   # and
+11 1
+.names n1 c n2
+1- 1
+-1 1
+.names n2 y
+0 1
+.names one
+1
+.gate nand2 A=n2 B=a O=z
+.latch n2 q re clk 0
+.latch z r 1
+.mlatch dff D=n1 Q=s clk 0
+.subckt adder x=a y=b s=t
+.subckt adder x=q y=r s=u
+.subckt counter c=clk
+.start_kiss
+.i 1
+.o 1
+0 s0 s0 0
+.end_kiss
+.exdc
+.names a b y
+11 1
+.end
+"""
+
+
+class TestStats(unittest.TestCase):
+
+    def test_counts(self):
+        result = stats.compute_stats(io.StringIO(BLIF))
+
+        self.assertEqual(result.models, ["top"])
+        self.assertEqual(result.lines, len(BLIF.splitlines()) - 1)
+        self.assertEqual(result.gates, 5)
+        self.assertEqual(result.cubes, 5)
+        self.assertEqual(result.literals, 5)
+        self.assertEqual(result.latches, 3)
+        self.assertEqual(result.latches_by_type, {"re": 1, "none": 1, "dff": 1})
+        self.assertEqual(result.latches_by_control, {"clk": 2, "none": 1})
+        self.assertEqual(result.fanin_histogram, {0: 1, 1: 1, 2: 3})
+        self.assertEqual(result.subckts_by_model, {"adder": 2, "counter": 1})
+
+        # a --> n1 --> n2 --> y/z
+        self.assertEqual(result.depth, 3)
+
+        # a: n1, z, adder; n2: y, z, latch; b: n1, adder; clk: mlatch, counter; n1: n2, mlatch; z: output, latch
+        self.assertEqual(result.fanout_histogram[3], 2)
+        self.assertEqual(result.fanout_histogram[2], 4)
+        self.assertEqual(result.fanout_histogram[0], 2)
+
+        data = result.to_dict()
+        self.assertEqual(data["fanin_histogram"], {"0": 1, "1": 1, "2": 3})
+        self.assertIn("latches by type: dff", str(result))
+
+    def test_models_and_loops(self):
+        text = (".model first\n.inputs a\n.outputs b\n.names a x b\n11 1\n.names b x\n1 1\n.end\n"
+                ".model second\n.inputs b\n.outputs a\n.names b a\n0 1\n.end\n")
+        result = stats.compute_stats(io.StringIO(text))
+
+        # the nets of the models are independent, the loop of the first model is skipped
+        self.assertEqual(result.models, ["first", "second"])
+        self.assertEqual(result.depth, 1)
+        self.assertEqual(result.gates, 3)
+
+    def test_read_statements(self):
+        lines = list(stats.read_statements(io.StringIO("a \\\nb # c\n# d\ne \\\n")))
+        self.assertEqual(lines, ["a  b", "", "e  "])
+
+
+if __name__ == '__main__':
+    unittest.main()
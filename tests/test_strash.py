@@ -0,0 +1,107 @@
+import os
+import sys
+import unittest
+
+# import strash.py from the ../blifparser folder
+curr_dir = os.path.realpath(os.path.dirname(__file__))
+blifparser_path = os.path.join(curr_dir, "..", "blifparser")
+sys.path.insert(1, os.path.realpath(blifparser_path))
+import strash  # noqa: E402
+from helpers import make_names  # noqa: E402
+from keywords import generic, mapped  # noqa: E402
+
+
+def make_blif():
+    """
+    Returns a netlist with redundant logic:
+    * x1 and x2 are the same AND gate (with inputs and rows in a different order)
+    * y1 and y2 read x1 and x2: they become identical once x2 is merged
+    * out2 is a primary output identical to out1
+    """
+    blif = generic.Blif()
+    blif.inputs = generic.Inputs("a b c")
+    blif.outputs = generic.Outputs("out1 out2")
+    blif.booleanfunctions = [
+        make_names("a b x1", ["11 1"]),
+        make_names("b a x2", ["11 1", "11 1"]),
+        make_names("x1 c y1", ["1- 1", "-1 1"]),
+        make_names("c x2 y2", ["-1 1", "1- 1"]),
+        make_names("y1 out1", ["0 1"]),
+        make_names("y2 out2", ["0 1"]),
+    ]
+    blif.latches = [generic.Latch("y2 q 0")]
+
+    return blif
+
+
+class TestStrash(unittest.TestCase):
+
+    def test_canonical_cover(self):
+        self.assertEqual(strash.canonical_cover(["b", "a"], [["1", "0", "1"], ["-", "1", "1"]]),
+                         (("a", "b"), ("01 1", "1- 1")))
+        self.assertEqual(strash.canonical_cover([], [["1"]]), ((), (" 1",)))
+
+    def test_find_duplicates(self):
+        blif = make_blif()
+        self.assertEqual(strash.find_duplicates(blif), {"x2": "x1", "y2": "y1", "out2": "out1"})
+
+        # different polarity: not a duplicate
+        blif.booleanfunctions[1].truthtable = [["1", "1", "0"]]
+        blif.invalidate_index()
+        self.assertEqual(strash.find_duplicates(blif), {})
+
+    def test_merge_duplicates(self):
+        blif = make_blif()
+        strash.merge_duplicates(blif)
+
+        # x2 and y2 are gone, out2 is a buffer of out1
+        self.assertEqual([function.output for function in blif.booleanfunctions], ["x1", "y1", "out1", "out2"])
+        self.assertEqual(blif.booleanfunctions[-1].inputs, ["out1"])
+        self.assertEqual(blif.booleanfunctions[-1].truthtable, [["1", "1"]])
+        self.assertEqual(blif.latches[0].input, "y1")
+
+        # nothing left to merge
+        self.assertEqual(strash.merge_duplicates(blif), {})
+
+    def test_merge_gates(self):
+        blif = generic.Blif()
+        blif.inputs = generic.Inputs("a b")
+        blif.outputs = generic.Outputs("y1 y2")
+        blif.gates = [
+            mapped.Gate("nand2 a=a b=b O=n1"),
+            mapped.Gate("nand2 b=b a=a O=n2"),  # same pins, different order
+            mapped.Gate("nand2 a=b b=a O=n3"),  # different pins
+            mapped.Gate("inv a=n1 O=y1"),
+            mapped.Gate("inv a=n2 O=y2"),
+        ]
+        self.assertEqual(strash.find_duplicates(blif), {"n2": "n1", "y2": "y1"})
+
+        # y2 is a primary output: it becomes a buffer
+        strash.merge_duplicates(blif)
+        self.assertEqual([str(gate) for gate in blif.gates],
+                         [".gate nand2 a=a b=b O=n1", ".gate nand2 a=b b=a O=n3", ".gate inv a=n1 O=y1"])
+        self.assertEqual([(function.inputs, function.output) for function in blif.booleanfunctions], [(["y1"], "y2")])
+
+    def test_merge_duplicates_mapped(self):
+        # the merged nets are also replaced in the gates, in the mlatches and in the latch controls
+        blif = make_blif()
+        blif.gates = [mapped.Gate("and2 A=x2 B=c O=g")]
+        blif.mlatches = [mapped.MLatch("dff D=y2 Q=r x2 0")]
+        blif.latches.append(generic.Latch("g p re y2 0"))
+        strash.merge_duplicates(blif)
+
+        self.assertEqual(blif.gates[0].params, ["A=x1", "B=c", "O=g"])
+        self.assertEqual(blif.gates[0].bindings, {"A": "x1", "B": "c", "O": "g"})
+        self.assertEqual(str(blif.mlatches[0]), ".mlatch dff D=y1 Q=r x1 0")
+        self.assertEqual(str(blif.latches[1]), ".latch g p re y1 0")
+
+        # no dangling nets: the gate and the mlatch read x1
+        index = blif.get_index()
+        readers = [index.elements[element_id] for element_id in index.sinks["x1"]]
+        self.assertIn(blif.gates[0], readers)
+        self.assertIn(blif.mlatches[0], readers)
+        self.assertNotIn("x2", index.sinks)
+
+
+if __name__ == "__main__":
+    unittest.main()